@@ -1,11 +1,18 @@
 import streamlit as st
 from components.ui_components import custom_css, navigation_bar
-from components.file_handling import load_pickles, load_watchlist_from_csv
-from components.user_management import load_users
+from components.file_handling import load_watchlist_from_csv
+from components.model_registry import get_model_registry
+from components.user_management import get_all_users
 from components.auth_manager import restore_auth_session
-from pages import home, discover, mood, watchlist, history, signin
+from components.instrumentation import instrument
+from components.metrics import start_metrics_server
+from pages import home, discover, mood, watchlist, history, signin, admin
 
-movies, similarity, svd_model = load_pickles()
+registry = get_model_registry()
+registry.start_watcher()
+start_metrics_server()
+# Pin one artifact version for this whole run so a hot reload never mixes versions
+artifacts = registry.snapshot()
 custom_css()
 
 # Initialize session state variables with proper defaults
@@ -20,7 +27,7 @@ if "recommendation_type" not in st.session_state:
 if "genre_movies" not in st.session_state:
     st.session_state.genre_movies = []
 if "users" not in st.session_state:
-    st.session_state.users = load_users()
+    st.session_state.users = get_all_users()
 if "current_user" not in st.session_state:
     st.session_state.current_user = None
 if "current_username" not in st.session_state:
@@ -55,11 +62,20 @@ PAGES = {
     "watchlist": watchlist.render_watchlist_page,
     "history": history.render_history_page,
     "signin": signin.render_signin_page,
+    "admin": admin.render_admin_page,
 }
+# Time every page render as a page.<name> span
+PAGES = {name: instrument(f"page.{name}")(render) for name, render in PAGES.items()}
 
-page_function = PAGES.get(st.session_state.page)
+# Every page renders against the pinned artifact set; PAGE_ARTIFACTS lists what a
+# page needs loaded up front. Anything else is loaded on first use or by the
+# background warm-up, so pages like Sign-in never wait for the models.
+PAGE_ARTIFACTS = {
+    "discover": ("movies", "similarity", "svd_model"),
+}
+
+page = st.session_state.page if st.session_state.page in PAGES else "home"
+PAGES[page](artifacts=artifacts, **{name: artifacts.get(name) for name in PAGE_ARTIFACTS.get(page, ())})
 
-if page_function:
-    page_function(movies=movies, similarity=similarity, svd_model=svd_model)
-else:
-    home.render_home_page(movies=movies, similarity=similarity, svd_model=svd_model)
+# Warm the remaining artifacts after the first paint
+registry.warm()
@@ -0,0 +1,95 @@
+"""
+Shared helpers for the MovieMind benchmark scripts.
+Run any benchmark from the project root, e.g. `python benchmarks/bench_user_index.py`.
+"""
+
+import contextlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Make `components` importable when a script is run directly
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@contextlib.contextmanager
+def temp_workdir():
+    """Run the block inside a scratch directory, since data files use relative paths."""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="moviemind_bench_") as tmp:
+        os.chdir(tmp)
+        try:
+            yield Path(tmp)
+        finally:
+            os.chdir(previous)
+
+
+def measure(fn, repeat=5):
+    """Call fn `repeat` times and return (best, mean) wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), sum(timings) / len(timings)
+
+
+def report(label, seconds, ops=1):
+    """Print one aligned benchmark line."""
+    per_op = seconds / ops
+    if per_op >= 1e-3:
+        unit = f"{per_op * 1e3:10.3f} ms/op"
+    else:
+        unit = f"{per_op * 1e6:10.3f} us/op"
+    print(f"  {label:<44}{unit}")
+
+
+GENRE_NAMES = ["Action", "Adventure", "Animation", "Comedy", "Crime", "Documentary", "Drama", "Family",
+               "Fantasy", "History", "Horror", "Music", "Mystery", "Romance", "Science Fiction",
+               "TV Movie", "Thriller", "War", "Western"]
+
+
+def synthetic_catalog(n_movies, n_topics=300, vocabulary=20000, seed=0):
+    """Movies whose genres and overviews mix overlapping topics, for realistic item embeddings.
+
+    Every overview draws its words from two to four topics plus a shared
+    background topic, each ranking the vocabulary differently with Zipf
+    frequencies, so neighbourhoods overlap the way real plots do instead of
+    forming cleanly separated clusters. Feed it to build_item_embeddings().
+    """
+    rng = np.random.default_rng(seed)
+    # Topic n_topics is the background shared by every overview
+    rankings = np.stack([rng.permutation(vocabulary) for _ in range(n_topics + 1)])
+    zipf = np.cumsum(1 / np.arange(1, vocabulary + 1) ** 1.1)
+    zipf /= zipf[-1]
+    topic_genres = rng.integers(0, len(GENRE_NAMES), n_topics)
+
+    lengths = rng.integers(15, 60, n_movies)
+    n_mixed = rng.integers(2, 5, n_movies)
+    movie_topics = rng.integers(0, n_topics, (n_movies, 4))
+    owner = np.repeat(np.arange(n_movies), lengths)
+    # A third of the words are background; the rest come from one of the movie's topics
+    slot = (rng.random(len(owner)) * n_mixed[owner]).astype(np.int64)
+    topics = np.where(rng.random(len(owner)) < 0.33, n_topics, movie_topics[owner, slot])
+    ranks = np.minimum(np.searchsorted(zipf, rng.random(len(owner))), vocabulary - 1)
+    words = np.char.add("w", rankings[topics, ranks].astype(str))
+    overviews = [" ".join(chunk) for chunk in np.split(words, np.cumsum(lengths)[:-1])]
+
+    genres = [
+        " ".join(dict.fromkeys(GENRE_NAMES[g] for g in topic_genres[movie_topics[i, :n_mixed[i]]]))
+        for i in range(n_movies)
+    ]
+    return pd.DataFrame({
+        "id": np.arange(1, n_movies + 1),
+        "title": [f"Movie {i}" for i in range(n_movies)],
+        "genres": genres,
+        "overview": overviews,
+        "vote_average": rng.uniform(1, 10, n_movies).round(1),
+    })
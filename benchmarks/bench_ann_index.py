@@ -0,0 +1,68 @@
+"""
+Benchmark the IVF item-embedding index against exact search: recall@10 and
+query latency for a range of probe counts, and the smallest probe count that
+reaches the target recall.
+
+Vectors come from build_item_embeddings() over a movies CSV (--movies) or
+over a synthetic catalog whose overviews mix overlapping topics, so the
+recall/latency trade-off resembles real items rather than separated clusters.
+
+    python benchmarks/bench_ann_index.py [--items 100000] [--queries 200] [--target-recall 0.95]
+    python benchmarks/bench_ann_index.py --movies movies.csv
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from _common import measure, report, synthetic_catalog
+
+from components.ann_index import IVFIndex, build_item_embeddings, exact_search
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100000, help="synthetic catalog size")
+    parser.add_argument("--movies", help="embed this movies CSV instead of a synthetic catalog")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64, 128])
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    args = parser.parse_args()
+
+    movies = pd.read_csv(args.movies) if args.movies else synthetic_catalog(args.items)
+    start = time.perf_counter()
+    vectors = build_item_embeddings(movies)
+    embedded = time.perf_counter() - start
+    start = time.perf_counter()
+    index = IVFIndex.build(vectors)
+    print(
+        f"{len(vectors):,} items x {vectors.shape[1]} dims from {args.movies or 'a synthetic catalog'}, "
+        f"embedded in {embedded:.2f}s; {index.n_lists} lists, built in {time.perf_counter() - start:.2f}s"
+    )
+
+    queries = np.random.default_rng(1).choice(len(vectors), min(args.queries, len(vectors)), replace=False)
+    truth = [set(exact_search(vectors, vectors[q], args.k)[0]) for q in queries]
+
+    print("Results:")
+    best, _ = measure(lambda: [exact_search(vectors, vectors[q], args.k) for q in queries], repeat=3)
+    report("exact search", best, len(queries))
+    needed = None
+    for nprobe in args.nprobe:
+        found = [set(index.search(vectors[q], args.k, nprobe=nprobe)[0]) for q in queries]
+        recall = np.mean([len(f & t) / len(t) for f, t in zip(found, truth)])
+        best, _ = measure(
+            lambda: [index.search(vectors[q], args.k, nprobe=nprobe) for q in queries], repeat=3
+        )
+        report(f"ivf nprobe={nprobe:<3} recall@{args.k}={recall:.3f}", best, len(queries))
+        if needed is None and recall >= args.target_recall:
+            needed = nprobe
+    if needed is None:
+        print(f"No nprobe up to {max(args.nprobe)} reaches recall@{args.k} >= {args.target_recall}")
+    else:
+        print(f"nprobe={needed} is the smallest tested setting with recall@{args.k} >= {args.target_recall}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark per-rerun cost of serving model artifacts through st.cache_data
+(pickle + copy on every hit) vs the shared model registry (by reference).
+
+    python benchmarks/bench_artifact_cache.py [--movies 5000]
+"""
+
+import argparse
+import logging
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from _common import measure, report
+
+from components.file_handling import FallbackPredictor
+from components.model_registry import ModelRegistry
+
+
+def make_artifacts(n_movies, seed=0):
+    rng = np.random.default_rng(seed)
+    movies = pd.DataFrame({
+        "id": np.arange(1, n_movies + 1),
+        "title": [f"Movie {i}" for i in range(n_movies)],
+        "genres": rng.choice(["Action", "Drama", "Comedy"], n_movies),
+        "overview": ["A story about something happening somewhere."] * n_movies,
+    })
+    similarity = rng.random((n_movies, n_movies), dtype=np.float32)
+    return movies, similarity, FallbackPredictor(ratings_csv="missing.csv")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--movies", type=int, default=5000)
+    args = parser.parse_args()
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    movies, similarity, svd_model = make_artifacts(args.movies)
+    print(f"{args.movies:,} movies, similarity matrix {similarity.nbytes / 1e6:.0f} MB")
+
+    @st.cache_data
+    def cached_load_pickles():
+        return movies, similarity, svd_model
+
+    cached_load_pickles()  # populate the cache
+    print("Results:")
+    best, _ = measure(cached_load_pickles, repeat=5)
+    report("st.cache_data hit (old load_pickles)", best)
+
+    registry = ModelRegistry(artifact_dir="missing")
+    registry.register("movies", lambda artifacts: movies)
+    registry.register("similarity", lambda artifacts: similarity)
+    registry.register("svd_model", lambda artifacts: svd_model)
+    artifacts = registry.snapshot()
+    for name in ("movies", "similarity", "svd_model"):
+        artifacts.get(name)
+
+    def registry_hit():
+        snapshot = registry.snapshot()
+        return snapshot.get("movies"), snapshot.get("similarity"), snapshot.get("svd_model")
+
+    best, _ = measure(registry_hit, repeat=5)
+    report("model registry hit (by reference)", best)
+    assert registry_hit()[1] is similarity and not similarity.flags.writeable
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark the nightly per-user recommendation batch at several pool sizes,
+and serving one user from the precomputed store vs scoring them live.
+
+    python benchmarks/bench_batch_recommendations.py [--movies 2000] [--users 400]
+"""
+
+import argparse
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+from _common import measure, report, temp_workdir
+
+from components.batch_recommendations import precompute_recommendations
+from components.recommendations import RecommendationEngine, get_precomputed_recommendations
+from components.model_registry import get_model_registry
+from components.seen_items import get_seen_index
+
+
+def write_dataset(n_movies, n_users, ratings_per_user=20, seed=0):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        "id": np.arange(1, n_movies + 1),
+        "title": [f"Movie {i}" for i in range(n_movies)],
+        "genres": rng.choice(["Action", "Drama", "Comedy"], n_movies),
+        "overview": ["A story about something happening somewhere."] * n_movies,
+    }).to_csv("movies.csv", index=False)
+    users = np.repeat(np.arange(1, n_users + 1), ratings_per_user)
+    pd.DataFrame({
+        "user": users,
+        "movie_id": rng.integers(1, n_movies + 1, len(users)),
+        "title": "",
+        "rating": rng.integers(1, 6, len(users)),
+        "review": "",
+    }).to_csv("user_reviews.csv", index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--movies", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=400)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    with temp_workdir():
+        write_dataset(args.movies, args.users)
+        print(f"{args.movies:,} movies, {args.users:,} users, {os.cpu_count()} cores")
+        print("Batch throughput:")
+        for processes in args.processes:
+            stats = precompute_recommendations(processes=processes)
+            print(f"  {processes} process(es){'':<30}{stats['users_per_second']:10.1f} users/sec")
+
+        registry = get_model_registry()
+        registry.reload(["precomputed_recommendations"])  # pick up the freshly written store
+        artifacts = registry.snapshot()
+        engine = RecommendationEngine(
+            artifacts.get("movies"),
+            svd_model=artifacts.get("svd_model"),
+            precomputed=get_precomputed_recommendations(),
+        )
+        seen_ids = get_seen_index().seen_ids(1)
+        exclude = engine._seen_mask(1)
+
+        print("Serving one user's top 5:")
+        best, _ = measure(lambda: engine._get_precomputed_predictions(1, seen_ids, 5), repeat=20)
+        report("precomputed store lookup", best)
+        best, _ = measure(lambda: engine.collaborative_scores(1, exclude, 5), repeat=3)
+        report("live scoring", best)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark catalog cold start: pd.read_csv(movies.csv) vs the columnar catalog.
+
+    python benchmarks/bench_catalog_load.py [--rows 1000000]
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from _common import measure, report, temp_workdir
+
+from components import catalog
+from components.file_handling import load_movies
+
+WORDS = "love war space crime family dream city night ghost robot king island".split()
+
+
+def write_movies(n_rows, seed=0):
+    """Write a synthetic movies.csv with the columns the app reads."""
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS)
+    movies = pd.DataFrame({
+        "id": np.arange(1, n_rows + 1),
+        "title": [f"{a.title()} of the {b.title()} {i}" for i, (a, b) in
+                  enumerate(zip(rng.choice(words, n_rows), rng.choice(words, n_rows)))],
+        "genres": rng.choice(["Action", "Drama", "Comedy", "Horror", "Romance"], n_rows),
+        "overview": [" ".join(rng.choice(words, 12)) for _ in range(n_rows)],
+        "vote_average": rng.uniform(0, 10, n_rows).round(1),
+        "popularity": rng.exponential(20, n_rows),
+    })
+    movies.to_csv("movies.csv", index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with temp_workdir():
+        print(f"Writing {args.rows:,} movies...")
+        write_movies(args.rows)
+
+        print("Results:")
+        best, _ = measure(lambda: pd.read_csv("movies.csv"), repeat=3)
+        report("pd.read_csv (current cold start)", best)
+
+        formats = ["numpy"] + (["parquet"] if catalog.pq is not None else [])
+        for fmt in formats:
+            out = f"catalog_{fmt}"
+            best, _ = measure(lambda: catalog.build_catalog("movies.csv", out, fmt), repeat=1)
+            report(f"[{fmt}] build (one-off)", best)
+            best, _ = measure(lambda: catalog.load_catalog("movies.csv", out), repeat=3)
+            report(f"[{fmt}] open (lazy, manifest only)", best)
+            best, _ = measure(lambda: catalog.load_catalog("movies.csv", out).column("vote_average"), repeat=3)
+            report(f"[{fmt}] open + one numeric column", best)
+            best, _ = measure(lambda: catalog.load_catalog("movies.csv", out).to_frame(), repeat=3)
+            report(f"[{fmt}] open + full DataFrame", best)
+            best, _ = measure(lambda: load_movies(catalog.load_catalog("movies.csv", out)), repeat=3)
+            report(f"[{fmt}] load_movies (overview left in the catalog)", best)
+            opened = catalog.load_catalog("movies.csv", out)
+            best, _ = measure(lambda: [opened.value("overview", row) for row in range(0, args.rows, args.rows // 6)], repeat=3)
+            report(f"[{fmt}] decode a page of overviews", best)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Benchmark the RecommendationEngine methods on synthetic catalogs and rating
+logs at several scales, and flag regressions against a stored baseline.
+
+Each method is called directly on the engine, so the recommendation result
+cache is bypassed, and TMDB is replaced by deterministic in-process stubs.
+Content and hybrid methods run against both the dense similarity matrix and
+the IVF index, built from build_item_embeddings() over a synthetic catalog
+whose overviews mix overlapping topics. Above DENSE_SIMILARITY_MAX_MOVIES (the
+"xlarge" scale, larger than the production catalog) an n x n matrix no longer
+fits comfortably in memory, so only the IVF index is measured, as in the app. Every method records latency
+(p50/p95/mean per call), throughput (calls/sec) and peak Python-heap
+allocation for one call, as traced by tracemalloc; NumPy buffers are included.
+
+    python benchmarks/bench_engine.py [--scales small medium] [--calls 20]
+    python benchmarks/bench_engine.py --save-baseline     # record the baseline
+    python benchmarks/bench_engine.py                     # compare; exit 1 on regression
+    python benchmarks/bench_engine.py --scales xlarge     # scaling check, ANN only
+
+Spans are off by default so the numbers are the engine's own; --instrumented
+turns them on (without the log file) to measure what instrumentation costs.
+The mode is recorded in the results, and a baseline taken in the other mode
+is reported rather than compared silently.
+
+Results go to --out as JSON; the baseline is benchmarks/baselines/engine.json.
+The committed baseline is a reference recording (see its "meta"); baselines are
+machine-specific, so re-record one on the machine you compare on. Without a
+baseline the run exits 2 rather than passing silently.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from _common import ROOT, report, synthetic_catalog, temp_workdir
+
+import components.recommendations as recommendations
+from components.ann_index import IVFIndex, build_item_embeddings
+from components.file_handling import FallbackPredictor
+from components.ratings_matrix import invalidate_ratings_matrix
+from components.recommendations import RecommendationEngine
+from components.seen_items import invalidate_seen_items
+from config import INSTRUMENTATION_CONFIG
+
+SCALES = {
+    # name: (movies, users, ratings per user)
+    "small": (1000, 500, 20),
+    "medium": (4000, 2000, 30),
+    "large": (8000, 5000, 40),
+    "xlarge": (60000, 20000, 40),
+}
+# Largest catalog benchmarked with a dense n x n similarity matrix
+DENSE_SIMILARITY_MAX_MOVIES = 10000
+GENRES = {28: "Action", 35: "Comedy", 18: "Drama", 27: "Horror", 10749: "Romance",
+          878: "Science Fiction", 16: "Animation", 10751: "Family", 99: "Documentary", 53: "Thriller"}
+MOODS = ["happy", "sad", "excited", "relaxed", "scared", "romantic", "adventurous", "thoughtful"]
+BASELINE_FILE = Path(__file__).resolve().parent / "baselines" / "engine.json"
+# Differences below these are timer or allocator noise, whatever the ratio
+MIN_LATENCY_DELTA_MS = 0.5
+MIN_MEMORY_DELTA_KIB = 64
+
+
+def write_dataset(n_movies, n_users, ratings_per_user, seed=0):
+    """Write movies.csv and user_reviews.csv; return the movies DataFrame."""
+    rng = np.random.default_rng(seed)
+    movies = synthetic_catalog(n_movies, seed=seed)
+    movies.to_csv("movies.csv", index=False)
+    users = np.repeat(np.arange(1, n_users + 1), ratings_per_user)
+    movie_ids = rng.integers(1, n_movies + 1, len(users))
+    pd.DataFrame({
+        "user": users,
+        "movie_id": movie_ids,
+        "title": movies["title"].to_numpy()[movie_ids - 1],
+        "rating": rng.integers(1, 6, len(users)),
+        "review": "",
+    }).to_csv("user_reviews.csv", index=False)
+    return movies
+
+
+def stub_tmdb(movies):
+    """Swap the TMDB fetches the engine uses for deterministic in-process stubs."""
+    genre_ids = np.array(list(GENRES))
+    titles = movies["title"].tolist()
+
+    def fetch_movie_metadata(movie_id):
+        movie_id = int(movie_id)
+        return {"genres": genre_ids[[movie_id % 10, movie_id * 7 % 10]].tolist(), "runtime": 80 + movie_id % 100}
+
+    def fetch_poster(movie_id):
+        return f"https://image.tmdb.org/t/p/w500/{movie_id}.jpg"
+
+    def fetch_movies_by_genre(genre_id, limit=20):
+        start = genre_id * 31 % len(titles)
+        return [
+            {
+                "id": start + i,
+                "title": titles[(start + i) % len(titles)],
+                "poster": fetch_poster(start + i),
+                "rating": 7.0,
+                "overview": "A synthetic movie.",
+                "runtime": 60 + (start + i) * 13 % 140,
+                "release_date": "2020-01-01",
+                "genres": [genre_id],
+            }
+            for i in range(limit)
+        ]
+
+    recommendations.fetch_movie_metadata = fetch_movie_metadata
+    recommendations.fetch_poster = fetch_poster
+    recommendations.fetch_movies_by_genre = fetch_movies_by_genre
+    recommendations.fetch_genres = lambda: dict(GENRES)
+    recommendations.fetch_popular_movies = lambda limit=20: fetch_movies_by_genre(0, limit)
+
+
+def workloads(movies, n_users, matrix_engine, ann_engine, rng):
+    """(name, fn(i)) for every measured method; i varies the input between calls.
+
+    matrix_engine is None when the catalog is too large for a dense matrix.
+    """
+    titles = movies["title"].to_numpy()[rng.permutation(len(movies))]
+    users = rng.integers(1, n_users + 1, 1024)
+    moods = [
+        {"mood": MOODS[i % len(MOODS)], "time_available": ["short", "medium", "long"][i % 3],
+         "watching_with": ["alone", "family", "kids"][i % 3], "energy": "medium", "avoid_content": []}
+        for i in range(len(MOODS) * 3)
+    ]
+    jobs = []
+    backends = [("matrix", matrix_engine), ("ann", ann_engine)] if matrix_engine else [("ann", ann_engine)]
+    # The remaining methods never read the neighbour structure
+    engine = matrix_engine or ann_engine
+    for backend, backend_engine in backends:
+        jobs.append((f"content_based_similarity[{backend}]",
+                     lambda i, e=backend_engine: e.content_based_similarity(titles[i % len(titles)], user_id=users[i % len(users)])))
+        jobs.append((f"hybrid_recommendations[{backend}]",
+                     lambda i, e=backend_engine: e.hybrid_recommendations(titles[i % len(titles)], users[i % len(users)])))
+    jobs.append(("content_based_tmdb",
+                 lambda i: engine.content_based_tmdb(titles[i % len(titles)])))
+    jobs.append(("collaborative_filtering",
+                 lambda i: engine.collaborative_filtering(users[i % len(users)])))
+    jobs.append(("mood_based_recommendations",
+                 lambda i: engine.mood_based_recommendations(moods[i % len(moods)])))
+    return jobs
+
+
+def run_workload(fn, calls):
+    """Latency percentiles, throughput and one call's peak traced allocation."""
+    fn(0)  # warm lazily built indexes so they are not billed to the first call
+    timings = []
+    start = time.perf_counter()
+    for i in range(1, calls + 1):
+        call_start = time.perf_counter()
+        fn(i)
+        timings.append(time.perf_counter() - call_start)
+    total = time.perf_counter() - start
+    # Traced separately: tracemalloc itself slows allocation-heavy code down
+    tracemalloc.start()
+    fn(calls + 1)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    timings = np.array(timings) * 1e3
+    return {
+        "calls": calls,
+        "p50_ms": round(float(np.percentile(timings, 50)), 3),
+        "p95_ms": round(float(np.percentile(timings, 95)), 3),
+        "mean_ms": round(float(timings.mean()), 3),
+        "calls_per_sec": round(calls / total, 2),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_scale(name, calls):
+    n_movies, n_users, ratings_per_user = SCALES[name]
+    rng = np.random.default_rng(1)
+    with temp_workdir():
+        movies = write_dataset(n_movies, n_users, ratings_per_user)
+        # The shared indexes would otherwise still describe the previous scale
+        invalidate_seen_items()
+        invalidate_ratings_matrix()
+        stub_tmdb(movies)
+        vectors = build_item_embeddings(movies)
+        svd_model = FallbackPredictor()
+        matrix_engine = None
+        if n_movies <= DENSE_SIMILARITY_MAX_MOVIES:
+            matrix_engine = RecommendationEngine(movies, vectors @ vectors.T, svd_model)
+        ann_engine = RecommendationEngine(movies, svd_model=svd_model, ann_index=IVFIndex.build(vectors))
+
+        print(f"{name}: {n_movies:,} movies, {n_users:,} users, {n_users * ratings_per_user:,} ratings")
+        results = {}
+        for method, fn in workloads(movies, n_users, matrix_engine, ann_engine, rng):
+            stats = results[method] = run_workload(fn, calls)
+            report(f"{method}", stats["p50_ms"] / 1e3)
+            print(f"  {'':<44}{stats['calls_per_sec']:10.1f} calls/s  peak {stats['peak_kib']:,.0f} KiB")
+        return results
+
+
+def compare(results, baseline, tolerance):
+    """Return one message per method whose latency or peak memory regressed."""
+    regressions = []
+    for scale, methods in results.items():
+        for method, stats in methods.items():
+            base = baseline.get("results", {}).get(scale, {}).get(method)
+            if base is None:
+                continue
+            checks = (("p50_ms", "ms", MIN_LATENCY_DELTA_MS), ("peak_kib", "KiB", MIN_MEMORY_DELTA_KIB))
+            for field, unit, min_delta in checks:
+                now, then = stats[field], base[field]
+                if now > then * (1 + tolerance) and now - then > min_delta:
+                    regressions.append(
+                        f"{scale} {method}: {field} {then:,.2f} -> {now:,.2f} {unit} ({now / then - 1:+.0%})"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    parser.add_argument("--calls", type=int, default=20, help="timed calls per method")
+    parser.add_argument("--out", type=Path, default=Path("bench_engine_results.json"))
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown/growth, e.g. 0.25 = 25%%")
+    parser.add_argument("--instrumented", action="store_true", help="record spans while measuring")
+    args = parser.parse_args()
+    INSTRUMENTATION_CONFIG["enabled"] = args.instrumented
+    # Never write the span log: it would land in the scratch directories and its I/O is not engine time
+    INSTRUMENTATION_CONFIG["log_file"] = ""
+    # Streamlit loggers set their own levels, and st.cache_data warns on every call outside a runtime
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+    out, baseline_path = args.out.resolve(), args.baseline.resolve()
+
+    results = {scale: run_scale(scale, args.calls) for scale in args.scales}
+    document = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "calls": args.calls,
+            "instrumented": args.instrumented,
+        },
+        "results": results,
+    }
+    out.write_text(json.dumps(document, indent=2))
+    print(f"Wrote {out.relative_to(ROOT) if out.is_relative_to(ROOT) else out}")
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(document, indent=2))
+        print(f"Saved baseline {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; record one with --save-baseline")
+        return 2
+    baseline = json.loads(baseline_path.read_text())
+    if baseline["meta"].get("instrumented", False) != args.instrumented:
+        print(f"{baseline_path.name} was recorded with instrumented={baseline['meta'].get('instrumented', False)}; "
+              f"not comparing against a run with instrumented={args.instrumented}")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print(f"No regressions beyond {args.tolerance:.0%} against {baseline_path.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Benchmark get_user_profile: filtering the full reviews DataFrame per call
+(the old implementation) vs reading the streaming per-user aggregates.
+
+    python benchmarks/bench_profile.py [--reviews 1000000]
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from _common import measure, report, temp_workdir
+
+from components.profile_aggregates import ProfileAggregates
+
+
+def old_profile(user_id):
+    reviews_df = pd.read_csv("user_reviews.csv")
+    user_reviews = reviews_df[reviews_df["user"].astype(str) == str(user_id)]
+    return {
+        "total_reviews": len(user_reviews),
+        "average_rating": user_reviews["rating"].mean(),
+        "top_rated_movies": user_reviews.nlargest(5, "rating")["title"].tolist(),
+        "rating_distribution": user_reviews["rating"].value_counts().to_dict(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reviews", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=20000)
+    args = parser.parse_args()
+
+    with temp_workdir():
+        rng = np.random.default_rng(0)
+        pd.DataFrame({
+            "user": rng.integers(1, args.users + 1, args.reviews),
+            "movie_id": rng.integers(1, 50001, args.reviews),
+            "title": [f"Movie {i}" for i in rng.integers(0, 50000, args.reviews)],
+            "rating": rng.integers(1, 6, args.reviews),
+            "review": "",
+        }).to_csv("user_reviews.csv", index=False)
+        print(f"{args.reviews:,} reviews, {args.users:,} users")
+
+        best, _ = measure(lambda: old_profile(7), repeat=3)
+        report("read_csv + nlargest per call", best)
+
+        best, _ = measure(lambda: ProfileAggregates.load(snapshot_path=None), repeat=1)
+        report("cold build from the full file", best)
+        aggregates = ProfileAggregates.load()
+        aggregates.save_snapshot()
+        best, _ = measure(lambda: ProfileAggregates.load(), repeat=3)
+        report("restart from snapshot", best)
+        best, _ = measure(lambda: aggregates.profile(7), repeat=100)
+        report("aggregate profile read", best)
+        assert aggregates.profile(7)["total_reviews"] == old_profile(7)["total_reviews"]
+        print(f"  snapshot size {os.path.getsize('profile_aggregates.pkl') / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark one user's ratings lookup: re-reading user_reviews.csv per call
+(the old `_get_user_rated_movies`) vs the shared CSR ratings matrix.
+
+    python benchmarks/bench_ratings_matrix.py [--reviews 100000 1000000]
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from _common import measure, report, temp_workdir
+
+from components.ratings_matrix import RatingsMatrix
+
+
+def write_reviews(n_reviews, n_users, n_movies=50000, seed=0):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        "user": rng.integers(1, n_users + 1, n_reviews),
+        "movie_id": rng.integers(1, n_movies + 1, n_reviews),
+        "title": "Some Movie",
+        "rating": rng.integers(1, 6, n_reviews),
+        "review": "",
+    }).to_csv("user_reviews.csv", index=False)
+
+
+def read_csv_lookup(user_id):
+    reviews_df = pd.read_csv("user_reviews.csv")
+    user_reviews = reviews_df[reviews_df["user"].astype(str) == str(user_id)]
+    return set(user_reviews["movie_id"].astype(int))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reviews", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--users", type=int, default=20000)
+    args = parser.parse_args()
+
+    for n_reviews in args.reviews:
+        with temp_workdir():
+            write_reviews(n_reviews, args.users)
+            print(f"{n_reviews:,} reviews, {args.users:,} users")
+            best, _ = measure(lambda: RatingsMatrix.from_csv(), repeat=1)
+            report("build CSR matrix (once)", best)
+            ratings = RatingsMatrix.from_csv()
+            best, _ = measure(lambda: read_csv_lookup(7), repeat=3)
+            report("read_csv + filter per call", best)
+            best, _ = measure(lambda: ratings.user_ratings(7), repeat=20)
+            report("CSR row lookup", best)
+            ratings.add(7, 123, 4)
+            best, _ = measure(lambda: ratings.user_ratings(7), repeat=20)
+            report("CSR row lookup + pending overlay", best)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark keyword search over overviews: a substring scan per keyword vs the
+BM25 index, and the size of its varint-compressed postings vs plain int32
+doc ids.
+
+    python benchmarks/bench_text_search.py [--movies 10000 100000]
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from _common import measure, report, temp_workdir
+
+from components.text_search import BM25Index
+
+QUERIES = ["heist thieves", "w12 w300", "w5 drama"]
+
+
+def make_movies(n_movies, seed=0):
+    rng = np.random.default_rng(seed)
+    # Zipf-distributed words give a realistic mix of rare and very common terms
+    vocab = np.array([f"w{i}" for i in range(30000)], dtype=object)
+    overviews = [" ".join(vocab[rng.zipf(1.3, 30) % len(vocab)]) for _ in range(n_movies)]
+    overviews[0] = "A crew of thieves plans a daring heist"
+    return pd.DataFrame({
+        "overview": overviews,
+        "genres": rng.choice(["Action", "Crime Drama", "Comedy Romance"], n_movies),
+    })
+
+
+def scan(movies, query):
+    text = movies["overview"] + " " + movies["genres"]
+    hits = sum(text.str.contains(word, case=False, regex=False).astype(int) for word in query.split())
+    return hits.nlargest(10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--movies", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    for n_movies in args.movies:
+        with temp_workdir():
+            movies = make_movies(n_movies)
+            print(f"{n_movies:,} movies")
+            best, _ = measure(lambda: [scan(movies, q) for q in QUERIES], repeat=3)
+            report("str.contains scan per keyword", best, len(QUERIES))
+            best, _ = measure(lambda: BM25Index.build(movies), repeat=1)
+            report("build index (offline)", best)
+            BM25Index.build(movies).save("text_index.npz")
+            best, _ = measure(lambda: BM25Index.load("text_index.npz"), repeat=5)
+            report("memory-map index", best)
+            index = BM25Index.load("text_index.npz")
+            best, _ = measure(lambda: [index.search(q) for q in QUERIES], repeat=20)
+            report("BM25 search", best, len(QUERIES))
+            assert index.search("heist thieves")[0][0] == 0
+            print(
+                f"  postings {len(index.postings) / 1e6:.1f} MB varint vs "
+                f"{len(index.frequencies) * 4 / 1e6:.1f} MB int32; "
+                f"file {os.path.getsize('text_index.npz') / 1e6:.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
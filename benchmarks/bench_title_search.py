@@ -0,0 +1,77 @@
+"""
+Benchmark title search: a case-insensitive substring scan over every title
+(the old Search tab) vs the prefix + trigram TitleSearchIndex, and the
+selector's per-rerun dropna().unique() vs a TitleAutocomplete lookup.
+
+    python benchmarks/bench_title_search.py [--titles 10000 100000]
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from _common import measure, report, temp_workdir
+
+from components.catalog import StringColumn, _write_string_column
+from components.title_search import TitleAutocomplete, TitleSearchIndex, sorted_title_keys
+
+QUERIES = ["the godfather", "godfahter", "amelie", "godz"]
+
+
+def make_titles(n_titles, seed=0):
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    words = np.array(
+        ["".join(letters[rng.integers(0, 26, rng.integers(3, 9))]) for _ in range(20000)],
+        dtype=object,
+    )
+    picks = rng.integers(0, len(words), (n_titles, 4))
+    lengths = rng.integers(1, 5, n_titles)
+    titles = [" ".join(words[picks[i, :lengths[i]]]).title() for i in range(n_titles)]
+    titles[:3] = ["The Godfather", "The Godfather Part II", "Amélie"]
+    return pd.Series(titles)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--titles", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    for n_titles in args.titles:
+        titles = make_titles(n_titles)
+        print(f"{n_titles:,} titles")
+        best, _ = measure(lambda: [titles.str.contains(q, case=False, na=False) for q in QUERIES], repeat=3)
+        report("str.contains scan", best, len(QUERIES))
+        best, _ = measure(lambda: TitleSearchIndex(titles.tolist()), repeat=1)
+        report("build index (once per catalog)", best)
+        index = TitleSearchIndex(titles.tolist())
+        best, _ = measure(lambda: [index.search(q) for q in QUERIES], repeat=20)
+        report("indexed prefix + fuzzy search", best, len(QUERIES))
+        assert titles[index.search("godfahter")[0]] == "The Godfather"
+
+        best, _ = measure(lambda: titles.dropna().unique(), repeat=3)
+        report("selector: dropna().unique() per rerun", best)
+        completer = TitleAutocomplete.build(titles.tolist())
+        best, _ = measure(lambda: [completer.complete(q, 20) for q in ("the g", "am", "x")], repeat=20)
+        report("selector: sorted-array prefix lookup", best, 3)
+        assert completer.complete("the godf", 20) == ["The Godfather", "The Godfather Part II"]
+        with temp_workdir():
+            # The copy the catalog build writes, bisected memory-mapped
+            for name, values in zip(("keys", "titles"), sorted_title_keys(titles.tolist())):
+                _write_string_column(".", name, np.array(values, dtype=object))
+            best, _ = measure(lambda: TitleAutocomplete(*(
+                StringColumn(*(np.load(f"{name}.{part}.npy", mmap_mode="r") for part in ("heap", "offsets", "nulls")))
+                for name in ("keys", "titles")
+            )), repeat=3)
+            report("selector: open the catalog's sorted titles", best)
+            mapped = TitleAutocomplete(*(
+                StringColumn(*(np.load(f"{name}.{part}.npy", mmap_mode="r") for part in ("heap", "offsets", "nulls")))
+                for name in ("keys", "titles")
+            ))
+            best, _ = measure(lambda: [mapped.complete(q, 20) for q in ("the g", "am", "x")], repeat=20)
+            report("selector: memory-mapped prefix lookup", best, 3)
+            assert mapped.complete("the godf", 20) == ["The Godfather", "The Godfather Part II"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark per-card markup cost: the old per-rerun md5 key + f-string card
+vs the memoized key and pre-compiled card template (reused per card slot),
+plus the size of the stylesheet sent on every rerun before and after
+minification.
+
+    python benchmarks/bench_ui_render.py [--cards 60]
+"""
+
+import argparse
+import hashlib
+
+from _common import measure, report
+
+from components.ui_components import APP_CSS, APP_STYLESHEET, _card_key, clear_card_html, render_card_html
+
+
+def old_card(movie, card_type):
+    title = movie.get('title', 'Unknown Title')
+    poster_url = movie.get('poster', 'https://via.placeholder.com/300x450?text=No+Poster')
+    rating = movie.get('rating', 0.0)
+    description = movie.get('description', 'No description available')
+    movie_id = movie.get('id', 0)
+    key_string = f"{card_type}_{movie_id}_{title}"
+    unique_key = hashlib.md5(key_string.encode()).hexdigest()[:8]
+    if len(description) > 150:
+        description = description[:150] + "..."
+    card_html = f"""
+    <div class="movie-card fade-in">
+        <img src="{poster_url}" alt="{title}" onerror="this.src='https://via.placeholder.com/300x450?text=No+Poster'">
+        <h3>{title}</h3>
+        <p class="movie-rating">⭐ {rating:.1f}/10</p>
+        <p>{description}</p>
+    </div>
+    """
+    return unique_key, card_html
+
+
+def new_card(movie, card_type):
+    movie_id = movie.get('id', 0)
+    title = movie.get('title', 'Unknown Title')
+    return (
+        _card_key(card_type, movie_id, title),
+        render_card_html(movie_id, card_type, title, movie['poster'], movie['rating'], movie['description']),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cards", type=int, default=60)
+    args = parser.parse_args()
+
+    movies = [
+        {
+            "id": i,
+            "title": f"Movie {i} & Friends",
+            "poster": f"https://image.tmdb.org/t/p/w500/{i}.jpg",
+            "rating": 7.5,
+            "description": "A long overview of the plot. " * 10,
+        }
+        for i in range(args.cards)
+    ]
+    print(f"{args.cards} cards per rerun")
+    best, _ = measure(lambda: [old_card(m, "grid") for m in movies], repeat=50)
+    report("f-string card + md5 key", best, args.cards)
+    clear_card_html()
+    _card_key.cache_clear()
+    best, _ = measure(lambda: [new_card(m, "grid") for m in movies], repeat=1)
+    report("template card, first render (cache miss)", best, args.cards)
+    best, _ = measure(lambda: [new_card(m, "grid") for m in movies], repeat=50)
+    report("template card, rerun (same slots)", best, args.cards)
+    print(f"  stylesheet per rerun: {len(APP_CSS.encode()):,} bytes -> {len(APP_STYLESHEET.encode()):,} bytes")
+
+
+if __name__ == "__main__":
+    main()
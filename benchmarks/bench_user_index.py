@@ -0,0 +1,65 @@
+"""
+Benchmark user lookup: linear scan over users.csv vs the shared hash index.
+
+    python benchmarks/bench_user_index.py [--users 1000000]
+"""
+
+import argparse
+import csv
+import random
+
+from _common import measure, report, temp_workdir
+
+from components import user_management
+
+
+def write_users(n_users):
+    """Write a synthetic users.csv with n_users rows."""
+    with open("users.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "username", "password", "email", "created_at"])
+        for i in range(1, n_users + 1):
+            writer.writerow([i, f"user{i}", f"pw{i}", f"user{i}@example.com", "2024-01-01"])
+
+
+def linear_lookup(username):
+    """The previous get_user_by_username: reload the file and scan it."""
+    for user in user_management.load_users():
+        if user.get("username") == username:
+            return user
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with temp_workdir():
+        print(f"Writing {args.users:,} users...")
+        write_users(args.users)
+        names = [f"user{random.randint(1, args.users)}" for _ in range(args.lookups)]
+
+        print("Results:")
+        best, _ = measure(lambda: linear_lookup(names[0]), repeat=3)
+        report("linear scan (load + scan), per lookup", best)
+
+        user_management.invalidate_user_index()
+        best, _ = measure(user_management.get_user_index, repeat=1)
+        report("index build (one-off, first lookup)", best)
+
+        def indexed():
+            for name in names:
+                user_management.get_user_by_username(name)
+
+        best, _ = measure(indexed, repeat=3)
+        report("indexed get_user_by_username", best, ops=len(names))
+
+        ids = list(range(1, args.lookups + 1))
+        best, _ = measure(lambda: [user_management.get_user_by_id(i) for i in ids], repeat=3)
+        report("indexed get_user_by_id", best, ops=len(ids))
+
+
+if __name__ == "__main__":
+    main()
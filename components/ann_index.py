@@ -0,0 +1,187 @@
+"""
+Approximate nearest-neighbour search over item embeddings, in pure NumPy.
+
+Each movie is embedded as a unit vector (TF-IDF over genres and overview,
+reduced with truncated SVD), so cosine similarity is a dot product. The IVF
+index clusters the vectors with spherical k-means; a query scores the
+centroids, then scans only the `nprobe` closest inverted lists. Raising
+`nprobe` trades latency for recall, up to exact search when every list is
+probed. Row positions in the index match the rows of the movies DataFrame.
+
+    python -m components.ann_index --out ann_index.npz --nprobe 8
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from config import RECOMMENDATION_CONFIG
+
+ANN_INDEX_FILE = "ann_index.npz"
+EMBEDDING_DIM = 64
+KMEANS_ITERATIONS = 20
+KMEANS_SAMPLE_SIZE = 50000
+ASSIGN_BATCH_SIZE = 65536
+
+
+def build_item_embeddings(movies, dim=EMBEDDING_DIM, seed=0):
+    """Embed every movie as a unit float32 vector from its genres and overview."""
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    text = (movies["genres"].fillna("").astype(str) + " " + movies["overview"].fillna("").astype(str)).tolist()
+    tfidf = TfidfVectorizer(stop_words="english", max_features=50000, sublinear_tf=True).fit_transform(text)
+    dim = max(1, min(dim, tfidf.shape[1] - 1, len(movies) - 1))
+    vectors = TruncatedSVD(n_components=dim, random_state=seed).fit_transform(tfidf)
+    return normalize_rows(vectors.astype(np.float32))
+
+
+def normalize_rows(vectors):
+    """Scale rows to unit length; all-zero rows are left as zeros."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+def _assign(vectors, centroids):
+    """Index of the closest centroid for every vector, in memory-bounded batches."""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BATCH_SIZE):
+        batch = vectors[start:start + ASSIGN_BATCH_SIZE]
+        labels[start:start + len(batch)] = np.argmax(batch @ centroids.T, axis=1)
+    return labels
+
+
+def spherical_kmeans(vectors, n_clusters, iterations=KMEANS_ITERATIONS, seed=0):
+    """Cluster unit vectors by cosine similarity; returns unit centroids."""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > KMEANS_SAMPLE_SIZE:
+        vectors = vectors[rng.choice(len(vectors), KMEANS_SAMPLE_SIZE, replace=False)]
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = _assign(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        counts = np.bincount(labels, minlength=n_clusters)
+        # Re-seed empty clusters from random points instead of dropping them
+        empty = counts == 0
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class IVFIndex:
+    """Inverted-file index: k-means centroids plus one list of rows per centroid."""
+
+    def __init__(self, vectors, centroids, list_offsets, list_items, nprobe=None):
+        self.vectors = vectors
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_items = list_items
+        self.nprobe = nprobe or RECOMMENDATION_CONFIG["ann_nprobe"]
+
+    def __len__(self):
+        return len(self.vectors)
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, vectors, n_lists=None, nprobe=None, seed=0):
+        """Cluster the vectors into about 4*sqrt(n) lists."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if n_lists is None:
+            n_lists = int(4 * np.sqrt(len(vectors)))
+        n_lists = max(1, min(n_lists, len(vectors)))
+        centroids = spherical_kmeans(vectors, n_lists, seed=seed)
+        labels = _assign(vectors, centroids)
+        list_items = np.argsort(labels, kind="stable").astype(np.int32)
+        list_offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=n_lists), out=list_offsets[1:])
+        return cls(vectors, centroids, list_offsets, list_items, nprobe)
+
+    def search(self, query, k=10, nprobe=None, exclude=None):
+        """Return (rows, scores) of the k most similar items, best first.
+
+        `exclude` is an optional boolean mask over rows that must not be returned.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        nprobe = min(nprobe or self.nprobe, self.n_lists)
+        centroid_scores = self.centroids @ query
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        candidates = np.concatenate(
+            [self.list_items[self.list_offsets[c]:self.list_offsets[c + 1]] for c in probe]
+        )
+        if exclude is not None:
+            candidates = candidates[~exclude[candidates]]
+        return top_k(candidates, self.vectors[candidates] @ query, k)
+
+    def save(self, path=ANN_INDEX_FILE):
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                vectors=self.vectors,
+                centroids=self.centroids,
+                list_offsets=self.list_offsets,
+                list_items=self.list_items,
+                nprobe=self.nprobe,
+            )
+
+    @classmethod
+    def load(cls, path=ANN_INDEX_FILE):
+        with np.load(path) as data:
+            return cls(
+                data["vectors"],
+                data["centroids"],
+                data["list_offsets"],
+                data["list_items"],
+                int(data["nprobe"]),
+            )
+
+
+def exact_search(vectors, query, k=10, exclude=None):
+    """Brute-force cosine search, the reference the IVF index is measured against."""
+    scores = vectors @ np.asarray(query, dtype=np.float32)
+    rows = np.arange(len(vectors))
+    if exclude is not None:
+        rows = rows[~exclude]
+        scores = scores[rows]
+    return top_k(rows, scores, k)
+
+
+def top_k(rows, scores, k):
+    """Return the k best (rows, scores) pairs, best first."""
+    k = min(k, len(rows))
+    if k == 0:
+        return rows[:0], scores[:0]
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return rows[top], scores[top]
+
+
+def main():
+    from components.file_handling import load_movies
+
+    parser = argparse.ArgumentParser(description="Build the item-embedding ANN index.")
+    parser.add_argument("--out", default=ANN_INDEX_FILE)
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIM)
+    parser.add_argument("--lists", type=int, default=None)
+    parser.add_argument("--nprobe", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    movies = load_movies(include_text=True)
+    if movies.empty:
+        parser.error("no movies to index")
+    index = IVFIndex.build(build_item_embeddings(movies, args.dim), args.lists, args.nprobe)
+    index.save(args.out)
+    print(
+        f"Indexed {len(index)} movies into {index.n_lists} lists in {args.out} "
+        f"({time.perf_counter() - start:.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
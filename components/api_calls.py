@@ -3,7 +3,14 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import os
+import re
+import unicodedata
 from typing import List, Dict, Optional
+from urllib.parse import urlsplit
+from config import CACHE_TTL
+from components.result_cache import ResultCache, SingleFlight
+from components.instrumentation import instrument, cache_miss
+from components.metrics import TMDB_REQUESTS, TMDB_REQUEST_SECONDS
 
 # Get API key from environment variable for security
 TMDB_API_KEY = os.getenv("TMDB_API_KEY", "9ef5ae6fc8b8f484e9295dc97d8d32ea")
@@ -12,9 +19,30 @@ if not TMDB_API_KEY:
     TMDB_API_KEY = "demo_key"  # Fallback for demo purposes
 
 
+def tmdb_endpoint(url):
+    """Metrics label for a TMDB URL: its path with ids collapsed, never the query string (API key)."""
+    # (?<!^) keeps the API version, e.g. /3/movie/550 -> /3/movie/{id}
+    return re.sub(r"(?<!^)/\d+(?=/|$)", "/{id}", urlsplit(url).path)
+
+
+class MeteredSession(requests.Session):
+    """Session that counts and times every request by TMDB endpoint and HTTP status."""
+
+    def request(self, method, url, *args, **kwargs):
+        endpoint = tmdb_endpoint(url)
+        status = "error"  # timeouts, connection errors, exhausted retries
+        try:
+            with TMDB_REQUEST_SECONDS.time(endpoint=endpoint):
+                response = super().request(method, url, *args, **kwargs)
+            status = str(response.status_code)
+            return response
+        finally:
+            TMDB_REQUESTS.inc(endpoint=endpoint, status=status)
+
+
 def create_session():
     """Create a requests session with retry logic."""
-    session = requests.Session()
+    session = MeteredSession()
     retries = Retry(
         total=3,
         backoff_factor=1,
@@ -25,7 +53,9 @@ def create_session():
     return session
 
 
+@instrument("tmdb.fetch_popular_movies", cached=True)
 @st.cache_data(ttl=3600)  # Cache for 1 hour
+@cache_miss
 def fetch_popular_movies(limit: int = 20) -> List[Dict]:
     """Fetch popular movies from TMDB API with improved error handling."""
     if TMDB_API_KEY == "demo_key":
@@ -108,7 +138,9 @@ def get_demo_movies(limit: int = 20) -> List[Dict]:
     return demo_movies[:limit]
 
 
+@instrument("tmdb.fetch_genres", cached=True)
 @st.cache_data(ttl=3600)
+@cache_miss
 def fetch_genres() -> Dict[int, str]:
     """Fetch movie genres from TMDB API."""
     if TMDB_API_KEY == "demo_key":
@@ -161,7 +193,9 @@ def get_demo_genres() -> Dict[int, str]:
     }
 
 
+@instrument("tmdb.fetch_movies_by_genre", cached=True)
 @st.cache_data(ttl=1800)  # Cache for 30 minutes
+@cache_miss
 def fetch_movies_by_genre(genre_id: int, limit: int = 20) -> List[Dict]:
     """Fetch movies by genre from TMDB API."""
     if TMDB_API_KEY == "demo_key":
@@ -204,9 +238,34 @@ def fetch_movies_by_genre(genre_id: int, limit: int = 20) -> List[Dict]:
         return get_demo_movies(limit)
 
 
+# Posters and trailers fetched ahead of the next grid page. Prefetch threads
+# outlive the script run that started them, so they fill this cache through the
+# plain request helpers below and never call the st.cache_data fetchers.
+prefetch_cache = ResultCache(max_entries=4096, ttl=CACHE_TTL["posters"], name="tmdb_prefetch")
+
+
+def prefetch_poster(movie_id) -> None:
+    """Fetch a poster into prefetch_cache; safe to call from any thread."""
+    prefetch_cache.set(("poster", str(movie_id)), _request_poster(movie_id), ttl=CACHE_TTL["posters"])
+
+
+def prefetch_trailer(movie_id) -> None:
+    """Fetch a trailer URL into prefetch_cache; safe to call from any thread."""
+    prefetch_cache.set(("trailer", str(movie_id)), _request_trailer(movie_id), ttl=CACHE_TTL["trailers"])
+
+
+@instrument("tmdb.fetch_poster", cached=True)
 @st.cache_data(ttl=3600)
+@cache_miss
 def fetch_poster(movie_id: int) -> str:
     """Fetch movie poster URL from TMDB API."""
+    found, poster = prefetch_cache.get(("poster", str(movie_id)))
+    if found:
+        return poster
+    return _request_poster(movie_id)
+
+
+def _request_poster(movie_id) -> str:
     if TMDB_API_KEY == "demo_key":
         return "https://via.placeholder.com/300x450?text=Demo+Poster"
     
@@ -236,9 +295,18 @@ def fetch_poster(movie_id: int) -> str:
         return "https://via.placeholder.com/300x450?text=Network+Error"
 
 
+@instrument("tmdb.fetch_trailer", cached=True)
 @st.cache_data(ttl=1800)
+@cache_miss
 def fetch_trailer(movie_id: int) -> Optional[str]:
     """Fetch movie trailer URL from TMDB API."""
+    found, trailer = prefetch_cache.get(("trailer", str(movie_id)))
+    if found:
+        return trailer
+    return _request_trailer(movie_id)
+
+
+def _request_trailer(movie_id) -> Optional[str]:
     if TMDB_API_KEY == "demo_key" or not movie_id:
         return None
     
@@ -288,7 +356,9 @@ def fetch_trailer(movie_id: int) -> Optional[str]:
         return None
 
 
+@instrument("tmdb.fetch_movie_details", cached=True)
 @st.cache_data(ttl=1800)
+@cache_miss
 def fetch_movie_details(movie_id: int) -> Dict:
     """Fetch detailed movie information from TMDB API."""
     if TMDB_API_KEY == "demo_key":
@@ -319,7 +389,9 @@ def fetch_movie_details(movie_id: int) -> Dict:
         return {"rating": 0.0, "description": "No description available"}
 
 
+@instrument("tmdb.fetch_movie_metadata", cached=True)
 @st.cache_data(ttl=1800)
+@cache_miss
 def fetch_movie_metadata(movie_id: int) -> Dict:
     """Fetch movie metadata including genres and keywords."""
     if TMDB_API_KEY == "demo_key":
@@ -365,26 +437,66 @@ def fetch_movie_metadata(movie_id: int) -> Dict:
         }
 
 
+# TMDB search results keyed by normalized query, shared by every session
+search_cache = ResultCache(max_entries=2048, ttl=CACHE_TTL["search"], name="tmdb_search")
+_search_flights = SingleFlight()
+
+
+def normalize_search_query(query: str) -> str:
+    """Fold Unicode forms, case and whitespace so near-duplicate searches share a cache entry."""
+    return " ".join(unicodedata.normalize("NFKC", str(query)).casefold().split())
+
+
+@instrument("tmdb.search_movies")
 def search_movies(query: str, limit: int = 20) -> List[Dict]:
     """Search for movies by title."""
     if TMDB_API_KEY == "demo_key":
         return get_demo_movies(limit)
     
-    url = f"https://api.themoviedb.org/3/search/movie?api_key={TMDB_API_KEY}&query={query}&language=en-US&page=1"
+    query = normalize_search_query(query)
+    if not query:
+        return []
+    found, movies_list = search_cache.get(query)
+    if not found:
+        # Identical searches from concurrent sessions share one request
+        movies_list = _search_flights.do(query, lambda: _search_and_cache(query))
+    return movies_list[:limit]
+
+
+def _search_and_cache(query: str) -> List[Dict]:
+    # A flight that finished just before this one started may have filled the cache
+    found, movies_list = search_cache.get(query)
+    if found:
+        return movies_list
+    movies_list = _fetch_search_results(query)
+    if movies_list is None:
+        # Failed requests are not cached, so the next search retries
+        return []
+    ttl = CACHE_TTL["search"] if movies_list else CACHE_TTL["search_empty"]
+    search_cache.set(query, movies_list, ttl=ttl)
+    return movies_list
+
+
+@instrument("tmdb.search_request")
+def _fetch_search_results(query: str) -> Optional[List[Dict]]:
+    """Fetch the first page of TMDB search results, or None when the request fails."""
+    url = "https://api.themoviedb.org/3/search/movie"
+    params = {"api_key": TMDB_API_KEY, "query": query, "language": "en-US", "page": 1}
     
     try:
         session = create_session()
-        response = session.get(url, timeout=10)
+        # requests URL-encodes params, so queries like "Tom & Jerry" survive intact
+        response = session.get(url, params=params, timeout=10)
         
         if response.status_code != 200:
-            return []
+            return None
         
         data = response.json()
         if not isinstance(data, dict) or "results" not in data:
-            return []
+            return None
         
         movies_list = []
-        for movie in data.get("results", [])[:limit]:
+        for movie in data.get("results", []):
             movies_list.append({
                 "id": movie.get("id", 0),
                 "title": movie.get("title", "Unknown"),
@@ -401,4 +513,4 @@ def search_movies(query: str, limit: int = 20) -> List[Dict]:
         return movies_list
         
     except Exception:
-        return []
+        return None
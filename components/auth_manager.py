@@ -2,9 +2,14 @@ import json
 import os
 from components.user_management import get_user_by_username
 
+# Last auth state read from or written to .auth_state.json in this process
+_UNSET = object()
+_auth_state_cache = _UNSET
+
 
 def save_auth_state(username, user_id):
     """Save authentication state to a temporary file."""
+    global _auth_state_cache
     auth_data = {
         "username": username,
         "user_id": user_id,
@@ -13,23 +18,31 @@ def save_auth_state(username, user_id):
     try:
         with open(".auth_state.json", "w") as f:
             json.dump(auth_data, f)
+        _auth_state_cache = auth_data
     except Exception:
         pass
 
 
 def load_auth_state():
     """Load authentication state from file."""
+    global _auth_state_cache
+    if _auth_state_cache is not _UNSET:
+        return _auth_state_cache
+    auth_state = None
     try:
         if os.path.exists(".auth_state.json"):
             with open(".auth_state.json", "r") as f:
-                return json.load(f)
+                auth_state = json.load(f)
     except Exception:
         pass
-    return None
+    _auth_state_cache = auth_state
+    return auth_state
 
 
 def clear_auth_state():
     """Clear authentication state file."""
+    global _auth_state_cache
+    _auth_state_cache = None
     try:
         if os.path.exists(".auth_state.json"):
             os.remove(".auth_state.json")
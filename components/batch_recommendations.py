@@ -0,0 +1,137 @@
+"""
+Nightly batch job that precomputes every user's collaborative top-N.
+
+The job scores all users across a multiprocessing pool and writes
+precomputed_recommendations.pkl:
+
+    {"svd_model": <model file fingerprint>, "top_n": 50, "computed_at": ...,
+     "users": {user_id: {"fingerprint": ..., "items": [(movie_id, title, score), ...]}}}
+
+`collaborative_filtering` serves from this store, and `hybrid_recommendations`
+adds the stored picks to its candidate set; both score live for users missing
+from it, or who watched, rated or watchlisted something since the run. Each
+worker loads the model once in its initializer and users are independent, so
+throughput scales with the number of processes.
+
+    python -m components.batch_recommendations --processes 8
+    python -m components.batch_recommendations --publish v3
+
+A running app's registry watcher picks up either result: a published version
+through the manifest, and a store rewritten in place (no --publish) through
+its changed file, which ModelRegistry.reload() swaps in under the same version.
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import time
+
+import numpy as np
+
+from components.model_registry import get_model_registry, publish_artifacts, artifact_fingerprint
+from components.recommendations import RecommendationEngine, seen_items_fingerprint
+from components.seen_items import get_seen_index
+from components.user_management import get_all_users, normalize_user_id
+from config import INSTRUMENTATION_CONFIG
+
+OUTPUT_FILE = "precomputed_recommendations.pkl"
+DEFAULT_TOP_N = 50
+CHUNK_SIZE = 16
+
+_worker_engine = None
+
+
+def _pool_context():
+    """A start method that never forks this process.
+
+    The parent runs threads (the span-log writer, the registry watcher) that
+    may hold locks at fork time, and a forked child would inherit them held
+    along with a dead writer thread. forkserver children fork from a clean
+    single-threaded server instead; spawn is the portable fallback.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    # Imported once in the server (importing starts no threads), not once per worker
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def _init_worker():
+    """Load the artifacts once per worker (the catalog is memory-mapped, so pages are shared)."""
+    global _worker_engine
+    # Per-user spans would only be lost: the pool terminates workers with their log writer
+    INSTRUMENTATION_CONFIG["enabled"] = False
+    artifacts = get_model_registry().current()
+    _worker_engine = RecommendationEngine(
+        artifacts.get("movies"), svd_model=artifacts.get("svd_model")
+    )
+
+
+def _score_user(task):
+    user_id, seen_ids, top_n = task
+    exclude = np.isin(_worker_engine.movies["id"].to_numpy(), list(seen_ids))
+    items = _worker_engine.collaborative_scores(user_id, exclude, top_n)
+    entry = {
+        "fingerprint": seen_items_fingerprint(seen_ids),
+        "items": [(int(movie_id), title, float(score)) for movie_id, title, score in items],
+    }
+    return user_id, entry
+
+
+def precompute_recommendations(user_ids=None, top_n=DEFAULT_TOP_N, processes=None, output=OUTPUT_FILE):
+    """Score every user in a process pool and write the store; returns run stats."""
+    seen = get_seen_index()
+    if user_ids is None:
+        user_ids = {user["id"] for user in get_all_users()} | set(seen.user_ids())
+    user_ids = sorted(user_id for user_id in map(normalize_user_id, user_ids) if user_id is not None)
+    processes = processes or os.cpu_count() or 1
+
+    artifacts = get_model_registry().current()
+
+    tasks = [(user_id, seen.seen_ids(user_id), top_n) for user_id in user_ids]
+    start = time.perf_counter()
+    with _pool_context().Pool(processes, initializer=_init_worker) as pool:
+        users = dict(pool.imap_unordered(_score_user, tasks, chunksize=CHUNK_SIZE))
+    elapsed = time.perf_counter() - start
+
+    store = {
+        "svd_model": artifact_fingerprint(artifacts.path("svd_model")),
+        "top_n": top_n,
+        "computed_at": time.time(),
+        "users": users,
+    }
+    tmp_path = f"{output}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(store, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, output)
+
+    return {
+        "users": len(users),
+        "processes": processes,
+        "seconds": elapsed,
+        "users_per_second": len(users) / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute per-user collaborative recommendations.")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N)
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--publish", metavar="VERSION", help="publish the store as a new artifact version")
+    args = parser.parse_args()
+
+    stats = precompute_recommendations(top_n=args.top_n, processes=args.processes, output=args.output)
+    print(
+        f"Scored {stats['users']} users with {stats['processes']} processes in "
+        f"{stats['seconds']:.2f}s ({stats['users_per_second']:.1f} users/sec)"
+    )
+    if args.publish:
+        publish_artifacts(args.publish, {"precomputed_recommendations": args.output})
+        print(f"Published {args.publish}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Typed columnar copy of movies.csv for fast cold starts.
+
+`build_catalog()` converts movies.csv once into one .npy file per column,
+with string columns stored as a UTF-8 byte heap plus offsets (or, with
+--format parquet and pyarrow installed, a Parquet file). `load_catalog()`
+opens the result lazily: nothing is read until a column is requested, and
+NumPy columns are memory-mapped, so the movies frame built from them holds
+zero-copy views of its columns: numeric arrays directly, and string heaps as
+Arrow strings when pyarrow is installed (decoded to Python objects without
+it). load_movies leaves columns outside DECODED_COLUMNS, such as overview, in
+the catalog.
+Every file is written to a temporary name and swapped in with os.replace, so
+a running app never maps a half-written column.
+
+The build also stores the unique titles sorted by normalized form (the
+movie selector's autocomplete, bisected in place) and writes text_index.npz,
+the BM25 overview index the app memory-maps (see components/text_search.py);
+it is never built at runtime.
+
+    python -m components.catalog --csv movies.csv --out catalog --text-index text_index.npz
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from components.title_search import sorted_title_keys
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+CATALOG_DIR = "catalog"
+MANIFEST_FILE = "manifest.json"
+PARQUET_FILE = "movies.parquet"
+REQUIRED_COLUMNS = ["title", "genres", "overview"]
+AUTOCOMPLETE_COLUMNS = ("autocomplete_keys", "autocomplete_titles")
+# String columns the app reads across every row; the rest (e.g. overview) stay
+# in the mapped catalog and are decoded per displayed row
+DECODED_COLUMNS = ("title", "genres")
+
+
+def _read_movies_csv(csv_path):
+    """Parse movies.csv and pad the columns the app expects."""
+    movies = pd.read_csv(csv_path)
+    for col in REQUIRED_COLUMNS:
+        if col not in movies.columns:
+            movies[col] = ''
+    return movies
+
+
+def _save_array(path, array):
+    """np.save through a temporary file, so the swap into place is atomic."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def _write_string_column(out_dir, name, values):
+    """Store a string column as a UTF-8 heap, byte offsets and a null mask."""
+    nulls = pd.isna(values)
+    encoded = [b"" if null else str(v).encode("utf-8") for v, null in zip(values, nulls)]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    heap = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    _save_array(os.path.join(out_dir, f"{name}.heap.npy"), heap)
+    _save_array(os.path.join(out_dir, f"{name}.offsets.npy"), offsets)
+    _save_array(os.path.join(out_dir, f"{name}.nulls.npy"), np.asarray(nulls, dtype=bool))
+
+
+def build_catalog(csv_path="movies.csv", out_dir=CATALOG_DIR, fmt=None):
+    """Convert movies.csv into the columnar catalog and return the format used."""
+    # NumPy is the default: its columns map without copying, Parquet reads materialize them
+    fmt = fmt or "numpy"
+    if fmt == "parquet" and pq is None:
+        raise ImportError("pyarrow is required for the parquet catalog format")
+
+    movies = _read_movies_csv(csv_path)
+    os.makedirs(out_dir, exist_ok=True)
+    columns = {}
+
+    if fmt == "parquet":
+        path = os.path.join(out_dir, PARQUET_FILE)
+        movies.to_parquet(f"{path}.tmp", index=False)
+        os.replace(f"{path}.tmp", path)
+        columns = {col: str(movies[col].dtype) for col in movies.columns}
+    else:
+        for col in movies.columns:
+            series = movies[col]
+            if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                _save_array(os.path.join(out_dir, f"{col}.npy"), series.to_numpy())
+                columns[col] = str(series.dtype)
+            else:
+                _write_string_column(out_dir, col, series.to_numpy(dtype=object))
+                columns[col] = "string"
+
+    # Stored as string heaps whatever the format, so lookups can bisect them mapped
+    for name, values in zip(AUTOCOMPLETE_COLUMNS, sorted_title_keys(movies["title"].tolist())):
+        _write_string_column(out_dir, name, np.array(values, dtype=object))
+
+    manifest = {
+        "format": fmt,
+        "rows": len(movies),
+        "columns": columns,
+        "autocomplete": list(AUTOCOMPLETE_COLUMNS),
+        "source": os.path.abspath(csv_path),
+        "source_mtime": os.path.getmtime(csv_path),
+        "built_at": time.time(),
+    }
+    # Written last: readers only see the new build once every column is in place
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+    return fmt
+
+
+class StringColumn:
+    """Read-only view over a string heap; rows are decoded on access."""
+
+    def __init__(self, heap, offsets, nulls):
+        self.heap = heap
+        self.offsets = offsets
+        self.nulls = nulls
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if self.nulls[i]:
+            return None
+        return bytes(self.heap[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def to_numpy(self):
+        """Decode the whole column into an object array."""
+        data = self.heap.tobytes()
+        text = data.decode("utf-8")
+        offsets = self.offsets.tolist()
+        if len(text) == len(data):
+            # Pure ASCII heap: byte offsets are character offsets, slice the str directly
+            values = [text[start:end] for start, end in zip(offsets, offsets[1:])]
+        else:
+            values = [data[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+        column = np.array(values, dtype=object)
+        column[np.asarray(self.nulls)] = None
+        return column
+
+    def to_series(self):
+        """The column as a pandas Series, wrapping the mapped heap without copying when possible."""
+        if pa is not None:
+            try:
+                nulls = np.asarray(self.nulls)
+                validity = pa.py_buffer(np.packbits(~nulls, bitorder="little")) if nulls.any() else None
+                array = pa.LargeStringArray.from_buffers(
+                    len(self), pa.py_buffer(self.offsets), pa.py_buffer(self.heap), validity
+                )
+                # The same "str" dtype read_csv produces
+                return pd.Series(array, dtype=pd.StringDtype("pyarrow", na_value=np.nan), copy=False)
+            except (TypeError, ValueError):
+                # Older pandas without the NaN-semantics Arrow string dtype
+                pass
+        return pd.Series(self.to_numpy())
+
+
+class LazyCatalog:
+    """Lazily loaded, memory-mapped view of a built catalog directory."""
+
+    def __init__(self, path=CATALOG_DIR):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            self.manifest = json.load(f)
+        self._columns = {}
+
+    @property
+    def columns(self):
+        return list(self.manifest["columns"])
+
+    def __len__(self):
+        return self.manifest["rows"]
+
+    def is_string(self, name):
+        """Whether a column holds text rather than numbers, booleans or dates."""
+        kind = self.manifest["columns"][name]
+        try:
+            return np.dtype(kind).kind not in "biufcmM"
+        except TypeError:
+            # pandas-only dtype names such as "string"
+            return True
+
+    def column(self, name):
+        """Return one column, loading (or memory-mapping) it on first use."""
+        if name not in self._columns:
+            if name not in self.manifest["columns"]:
+                raise KeyError(name)
+            self._columns[name] = self._load_column(name)
+        return self._columns[name]
+
+    def _load_column(self, name):
+        if self.manifest["format"] == "parquet":
+            table = pq.read_table(
+                os.path.join(self.path, PARQUET_FILE), columns=[name], memory_map=True
+            )
+            return table.column(name).to_pandas()
+        if self.manifest["columns"][name] == "string":
+            return self._string_column(name)
+        return np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+
+    def value(self, name, row):
+        """One row of one column, decoding only that row of a string column."""
+        col = self.column(name)
+        value = col.iloc[row] if isinstance(col, pd.Series) else col[row]
+        return None if value is None or pd.isna(value) else value
+
+    def _string_column(self, name):
+        return StringColumn(
+            *(
+                np.load(os.path.join(self.path, f"{name}.{part}.npy"), mmap_mode="r")
+                for part in ("heap", "offsets", "nulls")
+            )
+        )
+
+    def autocomplete_columns(self):
+        """Memory-mapped (sorted keys, titles) for TitleAutocomplete, or None for older catalogs."""
+        if not self.manifest.get("autocomplete"):
+            return None
+        return tuple(self._string_column(name) for name in self.manifest["autocomplete"])
+
+    def to_frame(self, columns=None):
+        """Build a DataFrame of the requested columns (default: all).
+
+        NumPy columns are wrapped without copying, so they stay views of the
+        mapped files (string columns only when pyarrow is installed).
+        """
+        names = list(columns or self.columns)
+        missing = [name for name in names if name not in self._columns]
+        if self.manifest["format"] == "parquet" and missing:
+            # One read for all missing columns instead of one per column
+            table = pq.read_table(
+                os.path.join(self.path, PARQUET_FILE), columns=missing, memory_map=True
+            )
+            for name in missing:
+                self._columns[name] = table.column(name).to_pandas()
+        data = {}
+        for name in names:
+            col = self.column(name)
+            data[name] = col.to_series() if isinstance(col, StringColumn) else col
+        return pd.DataFrame(data, copy=False)
+
+
+def catalog_is_fresh(csv_path="movies.csv", path=CATALOG_DIR):
+    """Check that a built catalog exists and is not older than movies.csv."""
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        return os.path.getmtime(csv_path) <= manifest.get("source_mtime", 0)
+    except Exception:
+        return False
+
+
+def load_catalog(csv_path="movies.csv", path=CATALOG_DIR):
+    """Open the columnar catalog, or return None when it is missing or stale."""
+    if not catalog_is_fresh(csv_path, path):
+        return None
+    try:
+        return LazyCatalog(path)
+    except Exception as e:
+        print(f"Error opening catalog {path}: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the columnar movie catalog.")
+    parser.add_argument("--csv", default="movies.csv")
+    parser.add_argument("--out", default=CATALOG_DIR)
+    parser.add_argument("--format", choices=["parquet", "numpy"], default=None)
+    parser.add_argument("--text-index", default="text_index.npz", help="BM25 index output; empty to skip")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    fmt = build_catalog(args.csv, args.out, args.format)
+    print(f"Built {fmt} catalog in {args.out} ({time.perf_counter() - start:.2f}s)")
+    if args.text_index:
+        from components.text_search import BM25Index
+
+        start = time.perf_counter()
+        # Same row order as the catalog, so index rows are catalog rows
+        BM25Index.build(_read_movies_csv(args.csv)).save(args.text_index)
+        print(f"Built text index {args.text_index} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
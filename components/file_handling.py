@@ -3,8 +3,39 @@ import pickle
 import pandas as pd
 import os
 import csv
+import glob
+import threading
 from datetime import datetime
 import numpy as np
+from components.journal import (
+    append_journal_row,
+    read_journal_rows,
+    write_snapshot,
+    clear_journal,
+)
+from components.user_management import normalize_user_id
+from components.catalog import load_catalog, DECODED_COLUMNS
+from components.ann_index import IVFIndex
+from components.text_search import BM25Index
+from components.title_search import TitleAutocomplete
+from components.result_cache import invalidate_user_recommendations
+from components.seen_items import mark_seen
+from components.ratings_matrix import RatingsMatrix, get_ratings_matrix, record_rating, REVIEWS_FILE
+from components.profile_aggregates import record_review
+from components.instrumentation import instrument
+from components.metrics import ACTIVITY_WRITES, ACTIVITY_WRITE_SECONDS
+
+# All watchlists live in one store keyed by (user_id, movie_id):
+# watchlists.csv is the compacted snapshot and watchlists_log.csv the
+# append-only add/remove/clear journal replayed on top of it.
+WATCHLIST_FILE = "watchlists.csv"
+WATCHLIST_FIELDS = ["user_id", "movie_id", "title", "added_at"]
+WATCHLIST_LOG_FILE = "watchlists_log.csv"
+WATCHLIST_LOG_FIELDS = ["op"] + WATCHLIST_FIELDS
+WATCHLIST_LOG_COMPACT_THRESHOLD = 1000
+
+_watchlist_index = None
+_watchlist_lock = threading.RLock()
 
 
 # Top-level class for fallback predictor to avoid pickle issues
@@ -13,19 +44,17 @@ class FallbackPredictor:
         def __init__(self, est):
             self.est = est
 
-    def __init__(self, ratings_csv="user_reviews.csv", default=3.5):
+    def __init__(self, ratings_csv=REVIEWS_FILE, default=3.5):
         self.ratings_csv = ratings_csv
         self.default = default
         self.avg_ratings = {}
         try:
-            if os.path.exists(self.ratings_csv):
-                df = pd.read_csv(self.ratings_csv)
-                df = df.dropna(subset=["movie_id", "rating"])
-                df["movie_id"] = df["movie_id"].astype(int)
-                df["rating"] = pd.to_numeric(df["rating"], errors="coerce")
-                self.avg_ratings = (
-                    df.groupby("movie_id")["rating"].mean().to_dict()
-                )
+            # The app's own reviews file is already parsed into the shared matrix
+            if ratings_csv == REVIEWS_FILE:
+                ratings = get_ratings_matrix()
+            else:
+                ratings = RatingsMatrix.from_csv(ratings_csv)
+            self.avg_ratings = ratings.item_means()
         except Exception:
             self.avg_ratings = {}
 
@@ -38,48 +67,126 @@ class FallbackPredictor:
         return self.Pred(est)
 
 
-@st.cache_data
+@instrument("store.load_pickles")
 def load_pickles():
-    """Load movie data and models with improved error handling and fallbacks."""
-    # Load movies from CSV as fallback
-    movies = pd.DataFrame()
-    similarity = None
-    svd_model = None
+    """Return read-only shared references to the movie data and models."""
+    from components.model_registry import get_model_registry
+    
+    artifacts = get_model_registry().pinned()
+    movies = artifacts.get("movies")
+    if movies.empty:
+        return pd.DataFrame(), None, None
+    return movies, artifacts.get("similarity"), artifacts.get("svd_model")
+
 
-    # Try to load movies from CSV first (more reliable)
+@instrument("store.load_movies")
+def load_movies(catalog=None, include_text=False):
+    """Load the movie catalog, preferring the prebuilt columnar copy.
+    
+    From the columnar copy, numeric columns are views of the mapped files and
+    only the string columns in DECODED_COLUMNS are decoded; other text (e.g.
+    overview) stays in the catalog unless include_text is set, and pages read
+    it per displayed row.
+    """
     try:
-        if os.path.exists("movies.csv"):
-            movies = pd.read_csv("movies.csv")
-            # Ensure required columns exist
-            required_columns = ['title', 'genres', 'overview']
-            for col in required_columns:
-                if col not in movies.columns:
-                    movies[col] = ''
-        else:
-            return pd.DataFrame(), None, None
-    except Exception as e:
-        return pd.DataFrame(), None, None
+        if catalog is None:
+            catalog = load_catalog()
+        if catalog is not None:
+            columns = [
+                name for name in catalog.columns
+                if include_text or name in DECODED_COLUMNS or not catalog.is_string(name)
+            ]
+            return catalog.to_frame(columns)
+        if not os.path.exists("movies.csv"):
+            return pd.DataFrame()
+        movies = pd.read_csv("movies.csv")
+        # Ensure required columns exist
+        required_columns = ['title', 'genres', 'overview']
+        for col in required_columns:
+            if col not in movies.columns:
+                movies[col] = ''
+        return movies
+    except Exception:
+        return pd.DataFrame()
 
-    # Try to load similarity matrix
+
+@instrument("store.load_similarity")
+def load_similarity(movies, path="similarity.pkl"):
+    """Load the similarity matrix, or build a basic one for the catalog."""
+    if movies is None or movies.empty:
+        return None
     try:
-        if os.path.exists("similarity.pkl"):
-            similarity = pickle.load(open("similarity.pkl", "rb"))
-        else:
-            # Create a basic similarity matrix based on genres
-            similarity = create_basic_similarity_matrix(movies)
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        # Create a basic similarity matrix based on genres
+        return create_basic_similarity_matrix(movies)
+    except Exception:
+        return create_basic_similarity_matrix(movies)
+
+
+@instrument("store.load_svd_model")
+def load_svd_model(path="svd_model.pkl"):
+    """Load the SVD model, or fall back to average-rating predictions."""
+    try:
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        return create_fallback_predictor()
+    except Exception:
+        return create_fallback_predictor()
+
+
+@instrument("store.load_precomputed_recommendations")
+def load_precomputed_recommendations(path="precomputed_recommendations.pkl"):
+    """Load the batch-computed per-user recommendation store, if one was built."""
+    try:
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        return None
     except Exception as e:
-        similarity = create_basic_similarity_matrix(movies)
+        print(f"Error loading precomputed recommendations {path}: {e}")
+        return None
 
-    # Try to load SVD model
+
+@instrument("store.load_ann_index")
+def load_ann_index(path="ann_index.npz"):
+    """Load the item-embedding ANN index, if one was built."""
     try:
-        if os.path.exists("svd_model.pkl"):
-            svd_model = pickle.load(open("svd_model.pkl", "rb"))
-        else:
-            svd_model = create_fallback_predictor()
+        if path and os.path.exists(path):
+            return IVFIndex.load(path)
+        return None
     except Exception as e:
-        svd_model = create_fallback_predictor()
+        print(f"Error loading ANN index {path}: {e}")
+        return None
+
+
+@instrument("store.load_title_autocomplete")
+def load_title_autocomplete(movies, catalog=None):
+    """The catalog's prebuilt sorted titles, memory-mapped; sorted in memory for CSV-only catalogs."""
+    if movies is None or movies.empty:
+        return None
+    columns = catalog.autocomplete_columns() if catalog is not None and len(catalog) == len(movies) else None
+    if columns is None:
+        return TitleAutocomplete.build(movies["title"].tolist())
+    return TitleAutocomplete(*columns)
+
 
-    return movies, similarity, svd_model
+@instrument("store.load_text_index")
+def load_text_index(movies, path="text_index.npz"):
+    """Memory-map the offline BM25 overview index; None when it is missing or for another catalog."""
+    if movies is None or movies.empty or not path or not os.path.exists(path):
+        return None
+    try:
+        index = BM25Index.load(path)
+        if len(index) != len(movies):
+            print(f"Ignoring text index {path}: built for {len(index)} movies, catalog has {len(movies)}")
+            return None
+        return index
+    except Exception as e:
+        print(f"Error loading text index {path}: {e}")
+        return None
 
 
 def create_basic_similarity_matrix(movies):
@@ -107,6 +214,7 @@ def create_fallback_predictor():
     return FallbackPredictor()
 
 
+@instrument("store.save_user_activity")
 def save_user_activity(user_id, action, movie_title, movie_id, rating=None):
     """Save user activity with improved error handling."""
     try:
@@ -122,103 +230,246 @@ def save_user_activity(user_id, action, movie_title, movie_id, rating=None):
             columns=["user_id", "action", "title", "movie_id", "rating", "timestamp"],
         )
         
-        activity_data.to_csv(
-            "user_activity.csv",
-            mode="a",
-            index=False,
-            header=not file_exists,
-            quoting=csv.QUOTE_NONNUMERIC,
-        )
+        with ACTIVITY_WRITE_SECONDS.time(kind="activity"):
+            activity_data.to_csv(
+                "user_activity.csv",
+                mode="a",
+                index=False,
+                header=not file_exists,
+                quoting=csv.QUOTE_NONNUMERIC,
+            )
+        mark_seen(user_id, movie_id)
+        ACTIVITY_WRITES.inc(kind="activity", outcome="ok")
         return True
     except Exception as e:
+        ACTIVITY_WRITES.inc(kind="activity", outcome="error")
         st.error(f"❌ Error saving user activity: {e}")
         return False
 
 
+@instrument("store.save_user_review")
+def save_user_review(user_id, movie_id, movie_title, rating, review=""):
+    """Append a rating/review to user_reviews.csv and refresh that user's cached recommendations."""
+    try:
+        file_exists = os.path.exists("user_reviews.csv")
+        with ACTIVITY_WRITE_SECONDS.time(kind="review"):
+            with open("user_reviews.csv", "a", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                if not file_exists:
+                    writer.writerow(["user", "movie_id", "title", "rating", "review"])
+                writer.writerow([user_id, movie_id, movie_title, rating, review])
+        record_rating(user_id, movie_id, rating, movie_title)
+        record_review()
+        mark_seen(user_id, movie_id)
+        invalidate_user_recommendations(user_id)
+        ACTIVITY_WRITES.inc(kind="review", outcome="ok")
+        return True
+    except Exception as e:
+        ACTIVITY_WRITES.inc(kind="review", outcome="error")
+        st.error(f"❌ Error saving review: {e}")
+        return False
+
+
+def normalize_movie_id(movie_id):
+    """Normalize a movie id to int, or None when it is not numeric."""
+    try:
+        return int(float(movie_id))
+    except (TypeError, ValueError):
+        return None
+
+
+@instrument("store.load_watchlists")
+def _load_watchlist_index():
+    """Build the user_id -> {movie_id: entry} index from snapshot and log."""
+    index = {}
+    rows = read_journal_rows(WATCHLIST_FILE) + read_journal_rows(WATCHLIST_LOG_FILE)
+    log_ops = 0
+    
+    for row in rows:
+        op = row.get("op", "add")
+        log_ops += 1 if "op" in row else 0
+        user_id = normalize_user_id(row.get("user_id"))
+        if user_id is None:
+            continue
+        entries = index.setdefault(user_id, {})
+        if op == "clear":
+            entries.clear()
+            continue
+        movie_id = normalize_movie_id(row.get("movie_id"))
+        if movie_id is None:
+            continue
+        if op == "remove":
+            entries.pop(movie_id, None)
+        elif movie_id not in entries:
+            entries[movie_id] = {
+                "title": row.get("title", ""),
+                "movie_id": movie_id,
+                "added_at": row.get("added_at", ""),
+            }
+    
+    return {"entries": index, "log_ops": log_ops}
+
+
+def get_watchlist_index():
+    """Return the shared watchlist index, migrating legacy files on first use."""
+    global _watchlist_index
+    index = _watchlist_index
+    if index is None:
+        with _watchlist_lock:
+            if _watchlist_index is None:
+                _watchlist_index = _load_watchlist_index()
+                migrate_legacy_watchlists()
+            index = _watchlist_index
+    return index
+
+
+def _append_watchlist_op(op, user_id, movie_id="", title="", added_at=""):
+    """Journal one watchlist operation and compact once the log grows too long."""
+    append_journal_row(
+        WATCHLIST_LOG_FILE,
+        WATCHLIST_LOG_FIELDS,
+        {"op": op, "user_id": user_id, "movie_id": movie_id, "title": title, "added_at": added_at},
+    )
+    index = get_watchlist_index()
+    index["log_ops"] += 1
+
+
+def _maybe_compact_watchlists():
+    """Compact once the log has grown past WATCHLIST_LOG_COMPACT_THRESHOLD."""
+    if get_watchlist_index()["log_ops"] >= WATCHLIST_LOG_COMPACT_THRESHOLD:
+        compact_watchlists()
+
+
+@instrument("store.compact_watchlists")
+def compact_watchlists():
+    """Fold watchlists_log.csv into watchlists.csv and start a fresh log."""
+    try:
+        with _watchlist_lock:
+            index = get_watchlist_index()
+            rows = (
+                {"user_id": user_id, **entry}
+                for user_id, entries in index["entries"].items()
+                for entry in entries.values()
+            )
+            write_snapshot(WATCHLIST_FILE, WATCHLIST_FIELDS, rows)
+            clear_journal(WATCHLIST_LOG_FILE)
+            index["log_ops"] = 0
+        return True
+    except Exception as e:
+        st.error(f"❌ Error compacting watchlists: {e}")
+        return False
+
+
+@instrument("store.add_to_watchlist")
+def add_to_watchlist(user_id, movie_title, movie_id):
+    """Add a movie to the user's watchlist; returns False if it was already there."""
+    user_id = normalize_user_id(user_id)
+    movie_id = normalize_movie_id(movie_id)
+    if user_id is None or movie_id is None:
+        raise ValueError(f"Invalid watchlist key ({user_id}, {movie_id})")
+    
+    with _watchlist_lock:
+        entries = get_watchlist_index()["entries"].setdefault(user_id, {})
+        if movie_id in entries:
+            return False
+        added_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        _append_watchlist_op("add", user_id, movie_id, movie_title, added_at)
+        entries[movie_id] = {"title": movie_title, "movie_id": movie_id, "added_at": added_at}
+        _maybe_compact_watchlists()
+    mark_seen(user_id, movie_id)
+    return True
+
+
+def is_in_watchlist(user_id, movie_id):
+    """Check whether a movie is in the user's watchlist."""
+    entries = get_watchlist_index()["entries"].get(normalize_user_id(user_id), {})
+    return normalize_movie_id(movie_id) in entries
+
+
+@instrument("store.clear_watchlist")
+def clear_watchlist(user_id):
+    """Remove every movie from the user's watchlist."""
+    try:
+        user_id = normalize_user_id(user_id)
+        with _watchlist_lock:
+            entries = get_watchlist_index()["entries"].get(user_id)
+            if entries:
+                _append_watchlist_op("clear", user_id)
+                entries.clear()
+                _maybe_compact_watchlists()
+        return True
+    except Exception as e:
+        st.error(f"❌ Error clearing watchlist: {e}")
+        return False
+
+
+@instrument("store.migrate_legacy_watchlists")
+def migrate_legacy_watchlists():
+    """Import per-user watchlist_<user_id>.csv files into the shared store."""
+    migrated = 0
+    for filename in sorted(glob.glob("watchlist_*.csv")):
+        if "_corrupted_" in filename:
+            continue
+        user_id = normalize_user_id(filename[len("watchlist_"):-len(".csv")])
+        if user_id is None:
+            continue
+        try:
+            legacy_df = pd.read_csv(
+                filename,
+                names=["title", "movie_id"],
+                skiprows=1,
+                on_bad_lines="skip",
+                quoting=csv.QUOTE_NONNUMERIC,
+            )
+            legacy_df = legacy_df.dropna(subset=["title", "movie_id"])
+            for title, movie_id in zip(legacy_df["title"], legacy_df["movie_id"]):
+                if add_to_watchlist(user_id, title, movie_id):
+                    migrated += 1
+            os.replace(filename, f"{filename}.migrated")
+        except Exception as e:
+            print(f"Error migrating legacy watchlist {filename}: {e}")
+    return migrated
+
+
+@instrument("store.save_watchlist_to_csv")
 def save_watchlist_to_csv(user_id, movie_title, movie_id):
     """Save movie to user's watchlist with improved error handling."""
-    filename = f"watchlist_{user_id}.csv"
-    file_exists = os.path.exists(filename)
-    
     try:
-        # Ensure movie_id is integer
-        movie_id = int(movie_id)
-        user_id = str(user_id)
-        
-        # Check if movie already exists in watchlist
-        if file_exists:
-            existing_watchlist = load_watchlist_from_csv(user_id)
-            if any(item.get("movie_id") == movie_id for item in existing_watchlist):
-                st.info(f"🎬 '{movie_title}' is already in your watchlist!")
-                return True
-        
-        watchlist_data = pd.DataFrame(
-            [[movie_title, movie_id]], columns=["title", "movie_id"]
-        )
-        watchlist_data.to_csv(
-            filename,
-            mode="a",
-            index=False,
-            header=not file_exists,
-            quoting=csv.QUOTE_NONNUMERIC,
-        )
+        if not add_to_watchlist(user_id, movie_title, movie_id):
+            st.info(f"🎬 '{movie_title}' is already in your watchlist!")
         return True
     except Exception as e:
         st.error(f"❌ Error saving watchlist for user {user_id}: {e}")
         return False
 
 
+@instrument("store.load_watchlist_from_csv")
 def load_watchlist_from_csv(user_id):
-    """Load user's watchlist with improved error handling."""
-    filename = f"watchlist_{user_id}.csv"
-    
-    if not os.path.exists(filename):
-        return []
-    
+    """Load user's watchlist in the order movies were added."""
     try:
-        if os.path.getsize(filename) == 0:
-            return []
-            
-        watchlist_df = pd.read_csv(
-            filename,
-            names=["title", "movie_id"],
-            skiprows=1,
-            on_bad_lines="skip",
-            quoting=csv.QUOTE_NONNUMERIC,
-        )
-        
-        # Clean the data
-        watchlist_df = watchlist_df.dropna(subset=["title", "movie_id"])
-        watchlist_df["movie_id"] = pd.to_numeric(
-            watchlist_df["movie_id"], errors="coerce", downcast="integer"
-        )
-        watchlist_df = watchlist_df.dropna(subset=["movie_id"])
-        
-        return watchlist_df[["title", "movie_id"]].to_dict("records")
-        
+        entries = get_watchlist_index()["entries"].get(normalize_user_id(user_id), {})
+        return [
+            {"title": entry["title"], "movie_id": entry["movie_id"]}
+            for entry in entries.values()
+        ]
     except Exception as e:
         st.warning(f"⚠️ Error loading watchlist for user {user_id}: {e}")
-        try:
-            # Backup corrupted file
-            corrupted_filename = f"watchlist_{user_id}_corrupted_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            os.rename(filename, corrupted_filename)
-            st.info(f"📁 Corrupted watchlist file backed up as {corrupted_filename}")
-        except Exception as rename_e:
-            st.error(f"❌ Failed to backup corrupted watchlist file: {rename_e}")
         return []
 
 
+@instrument("store.remove_from_watchlist")
 def remove_from_watchlist(user_id, movie_id):
     """Remove a movie from user's watchlist."""
-    filename = f"watchlist_{user_id}.csv"
-    
-    if not os.path.exists(filename):
-        return False
-    
     try:
-        watchlist_df = pd.read_csv(filename)
-        watchlist_df = watchlist_df[watchlist_df["movie_id"] != int(movie_id)]
-        watchlist_df.to_csv(filename, index=False)
+        user_id = normalize_user_id(user_id)
+        movie_id = normalize_movie_id(movie_id)
+        with _watchlist_lock:
+            entries = get_watchlist_index()["entries"].get(user_id, {})
+            if movie_id not in entries:
+                return False
+            _append_watchlist_op("remove", user_id, movie_id)
+            del entries[movie_id]
+            _maybe_compact_watchlists()
         return True
     except Exception as e:
         st.error(f"❌ Error removing movie from watchlist: {e}")
@@ -0,0 +1,309 @@
+"""
+Timing spans for page renders, recommenders, TMDB calls and store operations.
+
+    with span("tmdb.search_movies") as s:
+        ...
+        s.tag(cache="hit")
+
+`instrument(name)` wraps a function in a span and `instrument_methods(prefix)`
+does the same for every method of a class. Spans nest per thread: each one
+records the trace id of the outermost span and the name of its parent, so a
+slow page render can be broken down into the calls it made.
+
+Cache tags: `cache_miss`, placed under st.cache_data, marks the call as a
+miss whenever the cached function body actually runs, and
+`instrument(name, cached=True)` tags the span cache=hit or cache=miss and
+counts the lookup in the CACHE_LOOKUPS metric. The metric is counted even
+when spans are disabled:
+
+    @instrument("tmdb.fetch_poster", cached=True)
+    @st.cache_data(ttl=3600)
+    @cache_miss
+    def fetch_poster(movie_id): ...
+
+ResultCache lookups tag the enclosing span the same way.
+
+Work handed to another thread joins the submitting thread's trace when it is
+wrapped with `bind_trace(fn)` before being submitted.
+
+Finished spans go to a bounded in-memory reservoir per span name (read by the
+admin page for p50/p95/p99) and, one JSON object per line, to
+instrumentation.log:
+
+    {"ts": 1760000000.1, "span": "page.discover", "ms": 812.4,
+     "trace": "9f2c0e1a7b3d", "parent": null, "tags": {}}
+
+Log lines are queued and written by a background thread, so a span never
+waits on the disk; the file is rotated to instrumentation.log.1 once it
+reaches `log_max_bytes`, and spans are dropped (and counted) rather than
+queued without bound when the writer falls behind.
+"""
+
+import contextlib
+import functools
+import inspect
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+
+import numpy as np
+
+from config import INSTRUMENTATION_CONFIG
+from components.metrics import CACHE_LOOKUPS
+
+
+class Span:
+    """One timed operation; tags are free-form key/value annotations."""
+
+    __slots__ = ("name", "tags", "parent", "trace", "duration")
+
+    def __init__(self, name, tags, parent=None, trace=None):
+        self.name = name
+        self.tags = tags
+        self.parent = parent
+        self.trace = trace
+        self.duration = None
+
+    def tag(self, **tags):
+        self.tags.update(tags)
+
+
+_local = threading.local()
+_lock = threading.Lock()
+_durations = {}  # span name -> deque of recent durations in ms
+_counters = {}  # span name -> {"count", "errors", "cache_hits", "cache_misses"}
+_log_queue = queue.Queue(maxsize=INSTRUMENTATION_CONFIG["log_queue_size"])
+_log_writer = None
+_log_writer_lock = threading.Lock()
+_log_dropped = 0
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def current_span():
+    """The innermost open span on this thread, or None."""
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def tag_current(**tags):
+    """Tag the innermost open span on this thread, if there is one."""
+    active = current_span()
+    if active is not None:
+        active.tag(**tags)
+
+
+@contextlib.contextmanager
+def span(name, **tags):
+    """Time the enclosed block as a span named `name`."""
+    if not INSTRUMENTATION_CONFIG["enabled"]:
+        yield Span(name, tags)
+        return
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    active = Span(
+        name,
+        tags,
+        parent.name if parent else None,
+        parent.trace if parent else uuid.uuid4().hex[:12],
+    )
+    stack.append(active)
+    start = time.perf_counter()
+    try:
+        yield active
+    except BaseException as e:
+        active.tags["exception"] = type(e).__name__
+        raise
+    finally:
+        active.duration = time.perf_counter() - start
+        stack.pop()
+        _record(active)
+
+
+@contextlib.contextmanager
+def continue_trace(parent):
+    """Open spans in this thread as children of `parent`, a span from another thread."""
+    if parent is None:
+        yield
+        return
+    stack = _stack()
+    stack.append(parent)
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+def bind_trace(fn):
+    """Wrap fn so that, run on a worker thread, its spans join the caller's current trace."""
+    parent = current_span()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with continue_trace(parent):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def instrument(name, cached=False):
+    """Decorator: run each call of the function inside a span."""
+    def decorator(fn):
+        if not cached:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with span(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+
+        @functools.wraps(fn)
+        def cached_wrapper(*args, **kwargs):
+            # Saved and restored so a cached function calling another keeps its own result
+            outer = getattr(_local, "cache_missed", False)
+            _local.cache_missed = False
+            try:
+                with span(name) as active:
+                    result = fn(*args, **kwargs)
+                    lookup = "miss" if _local.cache_missed else "hit"
+                    active.tag(cache=lookup)
+            finally:
+                _local.cache_missed = outer
+            CACHE_LOOKUPS.inc(cache=name, result=lookup)
+            return result
+        return cached_wrapper
+    return decorator
+
+
+def instrument_methods(prefix):
+    """Class decorator: instrument every method defined on the class as `prefix.method`."""
+    def decorator(cls):
+        for attr, value in list(vars(cls).items()):
+            if inspect.isfunction(value) and not attr.startswith("__"):
+                setattr(cls, attr, instrument(f"{prefix}.{attr}")(value))
+        return cls
+    return decorator
+
+
+def cache_miss(fn):
+    """Inner decorator for st.cache_data functions: the body only runs on a cache miss."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        _local.cache_missed = True
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def _record(finished):
+    ms = finished.duration * 1e3
+    cache = finished.tags.get("cache")
+    with _lock:
+        durations = _durations.get(finished.name)
+        if durations is None:
+            durations = _durations[finished.name] = deque(maxlen=INSTRUMENTATION_CONFIG["reservoir_size"])
+            _counters[finished.name] = {"count": 0, "errors": 0, "cache_hits": 0, "cache_misses": 0}
+        durations.append(ms)
+        counters = _counters[finished.name]
+        counters["count"] += 1
+        counters["errors"] += "exception" in finished.tags
+        counters["cache_hits"] += cache == "hit"
+        counters["cache_misses"] += cache == "miss"
+    if INSTRUMENTATION_CONFIG["log_file"]:
+        _enqueue_log((time.time(), finished.name, ms, finished.trace, finished.parent, dict(finished.tags)))
+
+
+def _enqueue_log(entry):
+    """Hand a finished span to the log writer thread; drop it if the queue is full."""
+    global _log_writer, _log_dropped
+    if _log_writer is None:
+        with _log_writer_lock:
+            if _log_writer is None:
+                _log_writer = threading.Thread(target=_drain_log, name="span-log-writer", daemon=True)
+                _log_writer.start()
+    try:
+        _log_queue.put_nowait(entry)
+    except queue.Full:
+        with _log_writer_lock:
+            _log_dropped += 1
+
+
+def _drain_log():
+    """Writer thread: serialize queued spans and append them, rotating the file by size."""
+    path = INSTRUMENTATION_CONFIG["log_file"]
+    max_bytes = INSTRUMENTATION_CONFIG["log_max_bytes"]
+    log_file = None
+    while True:
+        entries = [_log_queue.get()]
+        while len(entries) < 1024:
+            try:
+                entries.append(_log_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            if log_file is None:
+                log_file = open(path, "a", encoding="utf-8")
+            log_file.write("".join(
+                json.dumps({
+                    "ts": round(ts, 3),
+                    "span": name,
+                    "ms": round(ms, 3),
+                    "trace": trace,
+                    "parent": parent,
+                    "tags": tags,
+                }, default=str) + "\n"
+                for ts, name, ms, trace, parent, tags in entries
+            ))
+            log_file.flush()
+            if max_bytes and log_file.tell() >= max_bytes:
+                # Keep one previous file: the log is for recent latency, not an archive
+                log_file.close()
+                log_file = None
+                os.replace(path, f"{path}.1")
+        except Exception as e:
+            # Don't let a full disk or read-only directory break page renders
+            print(f"Error writing span log {path}: {e}")
+            if log_file is not None:
+                log_file.close()
+                log_file = None
+
+
+def get_span_stats():
+    """Per-span count, latency percentiles (ms) and cache hit rate, slowest total first."""
+    with _lock:
+        snapshot = {name: (np.array(durations), dict(_counters[name])) for name, durations in _durations.items()}
+    rows = []
+    for name, (durations, counters) in snapshot.items():
+        p50, p95, p99 = np.percentile(durations, [50, 95, 99])
+        lookups = counters["cache_hits"] + counters["cache_misses"]
+        rows.append({
+            "span": name,
+            "count": counters["count"],
+            "errors": counters["errors"],
+            "p50_ms": round(float(p50), 2),
+            "p95_ms": round(float(p95), 2),
+            "p99_ms": round(float(p99), 2),
+            "max_ms": round(float(durations.max()), 2),
+            "cache_hit_rate": round(counters["cache_hits"] / lookups, 3) if lookups else None,
+            # Estimated from the retained window when older samples were dropped
+            "total_ms": round(float(durations.mean()) * counters["count"], 1),
+        })
+    return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+
+def get_log_dropped():
+    """Spans left out of the log because the writer thread fell behind."""
+    return _log_dropped
+
+
+def reset_spans():
+    """Forget every recorded span (the log file is left alone)."""
+    with _lock:
+        _durations.clear()
+        _counters.clear()
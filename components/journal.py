@@ -0,0 +1,40 @@
+import csv
+import os
+
+
+def append_journal_row(path, fieldnames, row):
+    """Append one row to a CSV journal, writing the header for a new file."""
+    file_exists = os.path.exists(path) and os.path.getsize(path) > 0
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        if not file_exists:
+            writer.writeheader()
+        writer.writerow(row)
+
+
+def read_journal_rows(path):
+    """Read every row of a CSV journal as a list of dictionaries."""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+    except Exception as e:
+        print(f"Error reading journal {path}: {e}")
+        return []
+
+
+def write_snapshot(path, fieldnames, rows):
+    """Atomically replace a CSV file with the given rows."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp_path, path)
+
+
+def clear_journal(path):
+    """Remove a CSV journal once its rows are folded into the snapshot."""
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,280 @@
+"""
+Prometheus-style counters and histograms, served over HTTP from a sidecar thread.
+
+    curl http://127.0.0.1:9464/metrics
+
+Metrics are module-level and labelled; call sites update them directly:
+
+    TMDB_REQUESTS.inc(endpoint="/3/movie/{id}", status="200")
+    with RECOMMENDATION_SECONDS.time(algorithm="hybrid", cache="miss"):
+        ...
+
+Model artifact versions are not a label on the load-time histogram, which
+would grow a series per published version; moviemind_model_info carries the
+active version instead, as a single series set to 1. Cache hit/miss counts
+for the st.cache_data TMDB fetchers come from components.instrumentation but
+do not depend on INSTRUMENTATION_CONFIG["enabled"].
+
+The exporter speaks the Prometheus text exposition format (version 0.0.4)
+without depending on prometheus_client. start_metrics_server() is called by
+app.py on every script run and binds the port only once per process; when the
+port is taken (e.g. by a second Streamlit process) the app runs without it.
+"""
+
+import contextlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import METRICS_CONFIG
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label combination."""
+
+    type = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def collect(self):
+        with self._lock:
+            values = dict(self._values)
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Gauge:
+    """Current value per label combination."""
+
+    type = "gauge"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def replace(self, value, **labels):
+        """Set one label combination and drop every other, e.g. for an info metric."""
+        key = self._key(labels)
+        with self._lock:
+            self._values = {key: value}
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def collect(self):
+        with self._lock:
+            values = dict(self._values)
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observations per label combination."""
+
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets or METRICS_CONFIG["latency_buckets"])) + (float("inf"),)
+        self._values = {}  # label key -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextlib.contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the enclosed block in seconds, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels):
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[-1] if state else 0
+
+    def collect(self):
+        with self._lock:
+            values = {key: list(state) for key, state in self._values.items()}
+        lines = []
+        for key, state in sorted(values.items()):
+            for bound, bucket_count in zip(self.buckets, state):
+                labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return lines
+
+
+_metrics = []
+
+
+def _register(metric):
+    _metrics.append(metric)
+    return metric
+
+
+TMDB_REQUESTS = _register(Counter(
+    "moviemind_tmdb_requests_total",
+    "TMDB API requests by endpoint and HTTP status (\"error\" when no response).",
+    ("endpoint", "status"),
+))
+TMDB_REQUEST_SECONDS = _register(Histogram(
+    "moviemind_tmdb_request_seconds",
+    "TMDB API request latency, retries included.",
+    ("endpoint",),
+))
+CACHE_LOOKUPS = _register(Counter(
+    "moviemind_cache_lookups_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ("cache", "result"),
+))
+RECOMMENDATION_SECONDS = _register(Histogram(
+    "moviemind_recommendation_seconds",
+    "Recommendation latency by algorithm and result-cache outcome.",
+    ("algorithm", "cache"),
+))
+ACTIVITY_WRITES = _register(Counter(
+    "moviemind_activity_writes_total",
+    "User activity and review rows written, by kind and outcome.",
+    ("kind", "outcome"),
+))
+ACTIVITY_WRITE_SECONDS = _register(Histogram(
+    "moviemind_activity_write_seconds",
+    "Time to append one activity or review row.",
+    ("kind",),
+))
+MODEL_LOAD_SECONDS = _register(Histogram(
+    "moviemind_model_load_seconds",
+    "Model artifact load time by artifact.",
+    ("artifact",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+))
+MODEL_INFO = _register(Gauge(
+    "moviemind_model_info",
+    "The active model artifact version (always 1).",
+    ("version",),
+))
+
+
+def render_metrics():
+    """Return every registered metric in the Prometheus text format."""
+    lines = []
+    for metric in _metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would drown out the app's own output
+        pass
+
+
+_server = None
+_server_started = False
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(host=None, port=None):
+    """Serve /metrics from a daemon thread; safe to call on every script run."""
+    global _server, _server_started
+    if _server_started or not METRICS_CONFIG["enabled"]:
+        return _server
+    with _server_lock:
+        if _server_started:
+            return _server
+        _server_started = True
+        host = host or METRICS_CONFIG["host"]
+        port = METRICS_CONFIG["port"] if port is None else port
+        try:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            print(f"Error starting metrics server on {host}:{port}: {e}")
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
@@ -0,0 +1,483 @@
+"""
+Lazy, versioned model artifacts shared by every session.
+
+Artifacts are handed out by reference rather than through st.cache_data, which
+would pickle and copy them on every rerun; arrays are frozen read-only on load
+so an accidental in-place write raises instead of leaking into other sessions,
+and DataFrames rely on pandas Copy-on-Write (the default from pandas 3, turned
+on here for older versions), so frames and columns derived from a shared frame
+copy before they are written to.
+
+Artifacts are published into versioned directories under artifacts/ and the
+active version is named by artifacts/manifest.json:
+
+    {"version": "v2", "artifacts": {"similarity": "v2/similarity.pkl",
+                                    "svd_model": "v2/svd_model.pkl"}}
+
+A watcher thread polls the manifest, loads a new version in the background and
+swaps it in atomically. Script runs hold on to the ArtifactSet they started
+with, so in-flight renders finish on the old version; the registry keeps only a
+weak reference to retired versions, so their memory is released as soon as the
+last run using them finishes. Without a manifest the root-level files named in
+LEGACY_ARTIFACTS are used as version "legacy". The watcher also reloads any
+loaded artifact whose file was rewritten in place, keeping the version.
+
+Each ArtifactSet records which artifacts a loader read while it ran, so that
+whatever was built from a reloaded artifact (the title index from the catalog,
+say) is reloaded with it instead of being carried over stale.
+
+    python -m components.model_registry publish v2 --similarity sim.pkl --svd-model svd.pkl
+"""
+
+import argparse
+import contextvars
+import itertools
+import json
+import os
+import shutil
+import threading
+import time
+import weakref
+import numpy as np
+import pandas as pd
+from components.file_handling import (
+    normalize_movie_id,
+    load_movies,
+    load_similarity,
+    load_svd_model,
+    load_precomputed_recommendations,
+    load_ann_index,
+    load_text_index,
+    load_title_autocomplete,
+)
+from components.title_search import TitleSearchIndex
+from components.catalog import load_catalog
+from components.metrics import MODEL_INFO, MODEL_LOAD_SECONDS
+
+ARTIFACT_DIR = "artifacts"
+MANIFEST_FILE = "manifest.json"
+LEGACY_VERSION = "legacy"
+LEGACY_ARTIFACTS = {
+    "similarity": "similarity.pkl",
+    "svd_model": "svd_model.pkl",
+    "precomputed_recommendations": "precomputed_recommendations.pkl",
+    "ann_index": "ann_index.npz",
+    "text_index": "text_index.npz",
+}
+WATCH_INTERVAL_SECONDS = 5
+
+# Numbers every ArtifactSet, so a reload that keeps the version string is still told apart
+_generations = itertools.count(1)
+
+# The ArtifactSet pinned by the running script; see ModelRegistry.snapshot()
+_run_artifacts = contextvars.ContextVar("run_artifacts", default=None)
+
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+def artifact_fingerprint(path):
+    """Identify an artifact file by name, size and mtime (publishing preserves all three)."""
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return os.path.basename(path), stat.st_size, int(stat.st_mtime)
+
+
+def freeze_artifact(value):
+    """Mark arrays read-only so stray writes raise; DataFrames are covered by Copy-on-Write."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    return value
+
+
+class ArtifactSet:
+    """One version of the model artifacts; each artifact loads on first use."""
+
+    def __init__(self, version, files, loaders, inherited=None, dependencies=None):
+        self.version = version
+        self.generation = next(_generations)
+        self.files = files
+        self._loaders = loaders
+        self._values = dict(inherited or {})
+        self._locks = {name: threading.Lock() for name in loaders}
+        # Backing file of each loaded artifact as it was when loaded; see stale_names()
+        self._fingerprints = {name: artifact_fingerprint(self.path(name)) for name in self._values}
+        # Artifacts each loader read, {name: {input, ...}}; see dependents()
+        self._dependencies = {
+            name: set(inputs) for name, inputs in (dependencies or {}).items() if name in self._values
+        }
+        self._dependencies_lock = threading.Lock()
+        # Per-thread stack of the loaders currently running
+        self._local = threading.local()
+
+    def path(self, name):
+        """Return the file backing an artifact in this version, if any."""
+        return self.files.get(name)
+
+    def get(self, name):
+        """Return an artifact, loading it the first time it is requested."""
+        loading = self._local.__dict__.setdefault("loading", [])
+        if loading:
+            with self._dependencies_lock:
+                self._dependencies.setdefault(loading[-1], set()).add(name)
+        if name in self._values:
+            return self._values[name]
+        if name not in self._loaders:
+            raise KeyError(f"Unknown artifact '{name}'")
+        with self._locks[name]:
+            if name not in self._values:
+                # Taken before loading, so a rewrite during the load is still noticed
+                self._fingerprints[name] = artifact_fingerprint(self.path(name))
+                loading.append(name)
+                try:
+                    # Shared by every session by reference, never copied, so freeze it
+                    with MODEL_LOAD_SECONDS.time(artifact=name):
+                        self._values[name] = freeze_artifact(self._loaders[name](self))
+                finally:
+                    loading.pop()
+        return self._values[name]
+
+    def is_loaded(self, name):
+        """Check whether an artifact has already been loaded."""
+        return name in self._values
+
+    def loaded_names(self):
+        return list(self._values)
+
+    def loaded_values(self):
+        return list(self._values.values())
+
+    def dependencies(self):
+        """Copy of {artifact: artifacts its loader read}."""
+        with self._dependencies_lock:
+            return {name: set(inputs) for name, inputs in self._dependencies.items()}
+
+    def dependents(self, names):
+        """Artifacts built, directly or through others, from any of `names`."""
+        dependencies = self.dependencies()
+        affected = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for name, inputs in dependencies.items():
+                if name not in affected and inputs & affected:
+                    affected.add(name)
+                    changed = True
+        return affected - set(names)
+
+    def stale_names(self):
+        """Loaded artifacts whose backing file was rewritten since it was loaded, and those built from them."""
+        stale = [
+            name for name in list(self._values)
+            if self.path(name) and artifact_fingerprint(self.path(name)) != self._fingerprints.get(name)
+        ]
+        derived = self.dependents(stale)
+        return stale + [name for name in list(self._values) if name in derived]
+
+
+class ModelRegistry:
+    """Process-wide registry of lazily loaded, hot-swappable model artifacts."""
+
+    def __init__(self, artifact_dir=ARTIFACT_DIR):
+        self.artifact_dir = artifact_dir
+        self._loaders = {}
+        self._lock = threading.Lock()
+        self._current = None
+        self._manifest_mtime = None
+        self._retired = weakref.WeakValueDictionary()
+        self._warm_thread = None
+        self._watch_thread = None
+
+    def register(self, name, loader):
+        """Register a loader; it is called with the ArtifactSet being loaded."""
+        with self._lock:
+            self._loaders[name] = loader
+            self._current = None
+
+    def _manifest_path(self):
+        return os.path.join(self.artifact_dir, MANIFEST_FILE)
+
+    def _read_manifest(self):
+        """Return (version, {artifact: path}, manifest mtime) for the active version."""
+        path = self._manifest_path()
+        try:
+            mtime = os.path.getmtime(path)
+            with open(path) as f:
+                manifest = json.load(f)
+            files = {
+                name: os.path.join(self.artifact_dir, rel_path)
+                for name, rel_path in manifest.get("artifacts", {}).items()
+            }
+            return str(manifest["version"]), files, mtime
+        except FileNotFoundError:
+            return LEGACY_VERSION, dict(LEGACY_ARTIFACTS), None
+        except Exception as e:
+            print(f"Error reading artifact manifest {path}: {e}")
+            return None, None, None
+
+    def current(self):
+        """Return the active ArtifactSet; hold on to it for a whole script run."""
+        artifacts = self._current
+        if artifacts is None:
+            with self._lock:
+                if self._current is None:
+                    version, files, mtime = self._read_manifest()
+                    if version is None:
+                        version, files = LEGACY_VERSION, dict(LEGACY_ARTIFACTS)
+                    self._current = ArtifactSet(version, files, dict(self._loaders))
+                    self._manifest_mtime = mtime
+                    MODEL_INFO.replace(1, version=version)
+                artifacts = self._current
+        return artifacts
+
+    def snapshot(self):
+        """Pin the active ArtifactSet to this script run and return it.
+
+        Call once at the top of a run; helpers deeper in the run read the same
+        set back with pinned(), so a swap mid-run never mixes versions.
+        """
+        artifacts = self.current()
+        _run_artifacts.set(artifacts)
+        return artifacts
+
+    def pinned(self):
+        """The ArtifactSet this run pinned with snapshot(), else the active one."""
+        artifacts = _run_artifacts.get()
+        return artifacts if artifacts is not None else self.current()
+
+    def get(self, name):
+        """Return an artifact from the version pinned for this run."""
+        return self.pinned().get(name)
+
+    def is_loaded(self, name):
+        return self.pinned().is_loaded(name)
+
+    @property
+    def version(self):
+        return self.pinned().version
+
+    def reload(self, names=None):
+        """Swap in a fresh ArtifactSet and return it; runs that pinned the old one keep it.
+
+        With no names, the manifest is read again and every artifact loads
+        anew on first use. Otherwise the named artifacts, e.g. ones whose files
+        were rewritten in place, and everything built from them are dropped,
+        and the rest carry over.
+        """
+        if names is None:
+            with self._lock:
+                self._current = None
+            return self.current()
+        old = self.current()
+        dropped = set(names) | old.dependents(names)
+        inherited = {name: old.get(name) for name in old.loaded_names() if name not in dropped}
+        new = ArtifactSet(old.version, old.files, dict(self._loaders), inherited, old.dependencies())
+        with self._lock:
+            if self._current is old:
+                self._current = new
+            return self._current
+
+    def retired_versions(self):
+        """Versions that were swapped out but are still referenced by a run."""
+        return list(self._retired.keys())
+
+    def check_for_update(self):
+        """Load and swap in a newly published version; returns True on swap."""
+        old = self.current()
+        path = self._manifest_path()
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        if mtime == self._manifest_mtime:
+            # Same version, but a file may have been rewritten in place, e.g. the
+            # root-level store written by the batch job without --publish
+            stale = old.stale_names()
+            if stale:
+                self.reload(stale)
+                return True
+            return False
+        version, files, mtime = self._read_manifest()
+        if version is None or version == old.version:
+            self._manifest_mtime = mtime
+            return False
+
+        # Reuse artifacts whose backing file did not change. Ones without a file
+        # (the catalog, the movies frame) may differ in any version, so they
+        # reload, and so does everything built from a reloaded artifact.
+        dropped = set(old.stale_names()) | {
+            name for name in old.loaded_names()
+            if not old.path(name) or old.path(name) != files.get(name)
+        }
+        dropped |= old.dependents(dropped)
+        inherited = {name: old.get(name) for name in old.loaded_names() if name not in dropped}
+        new = ArtifactSet(version, files, dict(self._loaders), inherited, old.dependencies())
+        for name in old.loaded_names():
+            new.get(name)
+
+        with self._lock:
+            self._current = new
+            self._manifest_mtime = mtime
+            self._retired[old.version] = old
+            MODEL_INFO.replace(1, version=version)
+        return True
+
+    def warm(self, names=None):
+        """Load artifacts in a background thread; only one warm-up runs at a time."""
+        artifacts = self.current()
+        with self._lock:
+            if self._warm_thread is not None and self._warm_thread.is_alive():
+                return self._warm_thread
+            pending = [n for n in (names or list(self._loaders)) if not artifacts.is_loaded(n)]
+            if not pending:
+                return None
+            self._warm_thread = threading.Thread(
+                target=self._warm, args=(artifacts, pending), name="model-registry-warm", daemon=True
+            )
+            self._warm_thread.start()
+            return self._warm_thread
+
+    def _warm(self, artifacts, names):
+        for name in names:
+            try:
+                artifacts.get(name)
+            except Exception as e:
+                print(f"Error warming artifact '{name}': {e}")
+
+    def start_watcher(self, interval=WATCH_INTERVAL_SECONDS):
+        """Start the background thread that hot-reloads new artifact versions."""
+        with self._lock:
+            if self._watch_thread is not None and self._watch_thread.is_alive():
+                return self._watch_thread
+            self._watch_thread = threading.Thread(
+                target=self._watch, args=(interval,), name="model-registry-watch", daemon=True
+            )
+            self._watch_thread.start()
+            return self._watch_thread
+
+    def _watch(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.check_for_update()
+            except Exception as e:
+                print(f"Error reloading model artifacts: {e}")
+
+
+def publish_artifacts(version, sources, artifact_dir=ARTIFACT_DIR):
+    """Copy artifact files into artifacts/<version>/ and make it the active version."""
+    version_dir = os.path.join(artifact_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+    manifest_path = os.path.join(artifact_dir, MANIFEST_FILE)
+
+    # Artifacts not being republished keep pointing at their current files
+    artifacts = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            artifacts = json.load(f).get("artifacts", {})
+    else:
+        # First publish: carry the root-level legacy files over into the version
+        legacy = {name: src for name, src in LEGACY_ARTIFACTS.items() if os.path.exists(src)}
+        sources = {**legacy, **sources}
+    for name, src in sources.items():
+        filename = os.path.basename(src)
+        shutil.copy2(src, os.path.join(version_dir, filename))
+        artifacts[name] = os.path.join(version, filename)
+
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"version": version, "artifacts": artifacts, "published_at": time.time()}, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return manifest_path
+
+
+def _load_similarity(artifacts):
+    """Load the similarity matrix, unless an ANN index stands in for it."""
+    path = artifacts.path("similarity")
+    if artifacts.get("ann_index") is not None and not (path and os.path.exists(path)):
+        # Don't build an n x n matrix when item embeddings can answer neighbour queries
+        return None
+    return load_similarity(artifacts.get("movies"), path)
+
+
+def _load_movie_rows(artifacts):
+    """Catalog row of each movie id (first occurrence), for per-row catalog reads."""
+    movies = artifacts.get("movies")
+    rows = {}
+    if "id" in movies:
+        for row, movie_id in enumerate(movies["id"].tolist()):
+            movie_id = normalize_movie_id(movie_id)
+            if movie_id is not None:
+                rows.setdefault(movie_id, row)
+    return rows
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    """Return the shared registry with the default movie/model loaders."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                registry = ModelRegistry()
+                registry.register("catalog", lambda artifacts: load_catalog())
+                registry.register("movies", lambda artifacts: load_movies(artifacts.get("catalog")))
+                registry.register("movie_rows", _load_movie_rows)
+                registry.register("similarity", _load_similarity)
+                registry.register(
+                    "svd_model",
+                    lambda artifacts: load_svd_model(artifacts.path("svd_model")),
+                )
+                registry.register(
+                    "ann_index",
+                    lambda artifacts: load_ann_index(artifacts.path("ann_index")),
+                )
+                registry.register(
+                    "title_index",
+                    lambda artifacts: TitleSearchIndex(artifacts.get("movies")["title"].tolist()),
+                )
+                registry.register(
+                    "title_autocomplete",
+                    lambda artifacts: load_title_autocomplete(artifacts.get("movies"), artifacts.get("catalog")),
+                )
+                registry.register(
+                    "text_index",
+                    lambda artifacts: load_text_index(artifacts.get("movies"), artifacts.path("text_index")),
+                )
+                registry.register(
+                    "precomputed_recommendations",
+                    lambda artifacts: load_precomputed_recommendations(
+                        artifacts.path("precomputed_recommendations")
+                    ),
+                )
+                _registry = registry
+    return _registry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish a new model artifact version.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    publish = subparsers.add_parser("publish")
+    publish.add_argument("version")
+    publish.add_argument("--similarity")
+    publish.add_argument("--svd-model")
+    publish.add_argument("--precomputed-recommendations")
+    publish.add_argument("--ann-index")
+    publish.add_argument("--text-index")
+    publish.add_argument("--artifact-dir", default=ARTIFACT_DIR)
+    args = parser.parse_args()
+
+    sources = {
+        "similarity": args.similarity,
+        "svd_model": args.svd_model,
+        "precomputed_recommendations": args.precomputed_recommendations,
+        "ann_index": args.ann_index,
+        "text_index": args.text_index,
+    }
+    sources = {name: src for name, src in sources.items() if src}
+    print(f"Published {args.version}: {publish_artifacts(args.version, sources, args.artifact_dir)}")
+
+
+if __name__ == "__main__":
+    main()
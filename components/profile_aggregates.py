@@ -0,0 +1,199 @@
+"""
+Per-user rating aggregates maintained as reviews are written.
+
+Each user keeps a count, a rating sum, a rating histogram, a bounded top-5
+heap by rating and a bounded ring of the 5 most recent reviews, so building
+a profile is a constant-time read. user_reviews.csv is append-only and has
+no timestamp column, so "recent" means latest in file order.
+
+The aggregates track the byte offset of user_reviews.csv they have consumed
+and only ever parse the bytes appended since. They are snapshotted to
+profile_aggregates.pkl every PROFILE_SNAPSHOT_INTERVAL reviews; after a
+restart the snapshot is loaded and only the tail of the file is replayed. A
+reviews file shorter than the snapshot offset (rewritten or truncated)
+triggers a full rebuild.
+"""
+
+import csv
+import heapq
+import io
+import os
+import pickle
+import threading
+from collections import deque
+
+from components.user_management import normalize_user_id
+
+REVIEWS_FILE = "user_reviews.csv"
+SNAPSHOT_FILE = "profile_aggregates.pkl"
+PROFILE_SNAPSHOT_INTERVAL = 500
+TOP_N = 5
+RECENT_N = 5
+
+
+def _rating_key(rating):
+    return int(rating) if float(rating).is_integer() else rating
+
+
+class UserAggregate:
+    """Running rating statistics for one user."""
+
+    __slots__ = ("count", "total", "histogram", "top", "recent")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.histogram = {}
+        self.top = []  # min-heap of (rating, -seq, title)
+        self.recent = deque(maxlen=RECENT_N)
+
+    def add(self, title, rating, seq):
+        self.count += 1
+        self.total += rating
+        key = _rating_key(rating)
+        self.histogram[key] = self.histogram.get(key, 0) + 1
+        # On equal ratings the earlier review wins, like DataFrame.nlargest
+        entry = (rating, -seq, title)
+        if len(self.top) < TOP_N:
+            heapq.heappush(self.top, entry)
+        elif entry > self.top[0]:
+            heapq.heapreplace(self.top, entry)
+        self.recent.append(title)
+
+    def to_profile(self):
+        return {
+            "total_reviews": self.count,
+            "average_rating": self.total / self.count,
+            "top_rated_movies": [title for _, _, title in sorted(self.top, reverse=True)],
+            "most_recent_movies": list(reversed(self.recent)),
+            "rating_distribution": dict(self.histogram),
+        }
+
+
+class ProfileAggregates:
+    """Aggregates for every user plus the reviews-file offset they cover."""
+
+    def __init__(self, path=REVIEWS_FILE, snapshot_path=SNAPSHOT_FILE):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.users = {}
+        self.offset = 0
+        self.seq = 0
+        self._unsnapshotted = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=REVIEWS_FILE, snapshot_path=SNAPSHOT_FILE):
+        """Restore from the snapshot when it is usable, then replay the file tail."""
+        aggregates = cls(path, snapshot_path)
+        try:
+            if snapshot_path and os.path.exists(snapshot_path):
+                with open(snapshot_path, "rb") as f:
+                    state = pickle.load(f)
+                if state["offset"] <= _file_size(path):
+                    aggregates.users = state["users"]
+                    aggregates.offset = state["offset"]
+                    aggregates.seq = state["seq"]
+        except Exception as e:
+            print(f"Error loading profile snapshot {snapshot_path}: {e}")
+        aggregates.catch_up()
+        return aggregates
+
+    def catch_up(self):
+        """Fold in reviews appended since the last call; returns how many were read."""
+        with self._lock:
+            size = _file_size(self.path)
+            if size < self.offset:
+                # The file was rewritten or truncated: start over
+                self.users, self.offset, self.seq = {}, 0, 0
+            if size == self.offset:
+                return 0
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read(size - self.offset)
+            # Leave a partially written last line for the next call
+            end = data.rfind(b"\n") + 1
+            if end == 0:
+                return 0
+            rows = csv.reader(io.StringIO(data[:end].decode("utf-8", errors="replace")))
+            if self.offset == 0:
+                next(rows, None)  # header
+            added = 0
+            for row in rows:
+                added += self._apply(row)
+            self.offset += end
+            self._unsnapshotted += added
+            if self._unsnapshotted >= PROFILE_SNAPSHOT_INTERVAL:
+                self._save_snapshot()
+            return added
+
+    def _apply(self, row):
+        try:
+            user_id = int(float(row[0]))
+            rating = float(row[3])
+        except (IndexError, ValueError, OverflowError):
+            return 0
+        if rating != rating:
+            return 0
+        self.seq += 1
+        aggregate = self.users.get(user_id)
+        if aggregate is None:
+            aggregate = self.users[user_id] = UserAggregate()
+        aggregate.add(row[2], rating, self.seq)
+        return 1
+
+    def _save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        try:
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(
+                    {"offset": self.offset, "seq": self.seq, "users": self.users},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, self.snapshot_path)
+            self._unsnapshotted = 0
+        except Exception as e:
+            print(f"Error saving profile snapshot {self.snapshot_path}: {e}")
+
+    def save_snapshot(self):
+        with self._lock:
+            self._save_snapshot()
+
+    def profile(self, user_id):
+        """Return the user's profile dict, or {} when they have no reviews."""
+        self.catch_up()
+        with self._lock:
+            aggregate = self.users.get(normalize_user_id(user_id))
+            return aggregate.to_profile() if aggregate else {}
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+_profile_aggregates = None
+_profile_aggregates_lock = threading.Lock()
+
+
+def get_profile_aggregates():
+    """Return the shared aggregates, restoring them from the snapshot on first use."""
+    global _profile_aggregates
+    if _profile_aggregates is None:
+        with _profile_aggregates_lock:
+            if _profile_aggregates is None:
+                _profile_aggregates = ProfileAggregates.load()
+    return _profile_aggregates
+
+
+def record_review():
+    """Fold a review that was just appended to user_reviews.csv into the aggregates."""
+    aggregates = _profile_aggregates
+    # Not built yet: loading replays the file, which already holds this review
+    if aggregates is not None:
+        aggregates.catch_up()
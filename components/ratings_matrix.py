@@ -0,0 +1,170 @@
+"""
+In-memory users x movies ratings matrix shared by every session.
+
+user_reviews.csv is parsed once into a SciPy CSR matrix, one row per user and
+one column per movie; a movie rated more than once keeps its latest rating.
+`record_rating()` adds new ratings to a small pending overlay that lookups
+merge in, and folds it into the CSR once it grows past
+RATINGS_COMPACT_THRESHOLD, so per-request cost depends on the user's own
+ratings rather than on the total number of reviews.
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from components.user_management import normalize_user_id
+
+REVIEWS_FILE = "user_reviews.csv"
+RATINGS_COMPACT_THRESHOLD = 1000
+
+
+def _build_csr(user_ids, movie_ids, ratings):
+    """Index triples (last one wins per user/movie) into id arrays and a CSR matrix."""
+    triples = pd.DataFrame({"user_id": user_ids, "movie_id": movie_ids, "rating": ratings})
+    triples = triples.drop_duplicates(["user_id", "movie_id"], keep="last")
+    rows, users = pd.factorize(triples["user_id"], sort=True)
+    cols, movies = pd.factorize(triples["movie_id"], sort=True)
+    matrix = sparse.csr_matrix(
+        (triples["rating"].to_numpy(dtype=np.float32), (rows, cols)),
+        shape=(len(users), len(movies)),
+    )
+    return np.asarray(users, dtype=np.int64), np.asarray(movies, dtype=np.int64), matrix
+
+
+class RatingsMatrix:
+    """CSR ratings plus a pending overlay of ratings recorded since the last compaction."""
+
+    def __init__(self, user_ids, movie_ids, matrix, titles=None):
+        self._set_base(user_ids, movie_ids, matrix)
+        self.titles = titles or {}
+        self._pending = {}
+        self._pending_count = 0
+        self._lock = threading.Lock()
+
+    def _set_base(self, user_ids, movie_ids, matrix):
+        self.user_ids = user_ids
+        self.movie_ids = movie_ids
+        self.matrix = matrix
+        self._user_rows = {int(user_id): row for row, user_id in enumerate(user_ids)}
+
+    @classmethod
+    def from_csv(cls, path=REVIEWS_FILE):
+        """Parse a reviews CSV; missing or unreadable files give an empty matrix."""
+        empty = np.array([], dtype=np.int64)
+        if not os.path.exists(path):
+            return cls(empty, empty, sparse.csr_matrix((0, 0), dtype=np.float32))
+        try:
+            df = pd.read_csv(path, on_bad_lines="skip")
+            # Vectorized normalize_user_id: "2", 2.0 and 2 are the same user
+            df["user_id"] = np.trunc(pd.to_numeric(df["user"], errors="coerce"))
+            df["movie_id"] = pd.to_numeric(df["movie_id"], errors="coerce")
+            df["rating"] = pd.to_numeric(df["rating"], errors="coerce")
+            df = df.dropna(subset=["user_id", "movie_id", "rating"])
+            df["movie_id"] = df["movie_id"].astype(np.int64)
+            titles = {}
+            if "title" in df.columns:
+                latest = df.drop_duplicates("movie_id", keep="last")
+                titles = dict(zip(latest["movie_id"].tolist(), latest["title"].tolist()))
+            return cls(*_build_csr(df["user_id"].astype(np.int64), df["movie_id"], df["rating"]), titles)
+        except Exception as e:
+            print(f"Error loading ratings from {path}: {e}")
+            return cls(empty, empty, sparse.csr_matrix((0, 0), dtype=np.float32))
+
+    def user_ratings(self, user_id):
+        """Return {movie_id: rating} for one user."""
+        user_id = normalize_user_id(user_id)
+        with self._lock:
+            ratings = {}
+            row = self._user_rows.get(user_id)
+            if row is not None:
+                start, end = self.matrix.indptr[row], self.matrix.indptr[row + 1]
+                ratings = dict(zip(
+                    self.movie_ids[self.matrix.indices[start:end]].tolist(),
+                    self.matrix.data[start:end].tolist(),
+                ))
+            ratings.update(self._pending.get(user_id, {}))
+            return ratings
+
+    def all_user_ids(self):
+        with self._lock:
+            return sorted(set(self._user_rows) | set(self._pending))
+
+    def add(self, user_id, movie_id, rating, title=None):
+        """Record one rating, replacing any earlier rating of the same movie."""
+        user_id = normalize_user_id(user_id)
+        with self._lock:
+            self._pending.setdefault(user_id, {})[int(movie_id)] = float(rating)
+            self._pending_count += 1
+            if title:
+                self.titles[int(movie_id)] = title
+            if self._pending_count >= RATINGS_COMPACT_THRESHOLD:
+                self._compact()
+
+    def _compact(self):
+        """Fold the pending overlay into the CSR matrix."""
+        if not self._pending:
+            return
+        coo = self.matrix.tocoo()
+        pending = [
+            (user_id, movie_id, rating)
+            for user_id, movies in self._pending.items()
+            for movie_id, rating in movies.items()
+        ]
+        users, movies, ratings = (np.array(column) for column in zip(*pending))
+        self._set_base(*_build_csr(
+            np.concatenate([self.user_ids[coo.row], users]),
+            np.concatenate([self.movie_ids[coo.col], movies]),
+            np.concatenate([coo.data, ratings]),
+        ))
+        self._pending = {}
+        self._pending_count = 0
+
+    def item_means(self):
+        """Return {movie_id: mean rating} over every user who rated it."""
+        with self._lock:
+            self._compact()
+            sums = np.asarray(self.matrix.sum(axis=0)).ravel()
+            counts = self.matrix.getnnz(axis=0)
+            rated = counts > 0
+            return dict(zip(self.movie_ids[rated].tolist(), (sums[rated] / counts[rated]).tolist()))
+
+
+_ratings_matrix = None
+_ratings_matrix_lock = threading.RLock()
+
+
+def get_ratings_matrix():
+    """Return the shared ratings matrix, building it from user_reviews.csv on first use."""
+    global _ratings_matrix
+    if _ratings_matrix is None:
+        with _ratings_matrix_lock:
+            if _ratings_matrix is None:
+                _ratings_matrix = RatingsMatrix.from_csv()
+    return _ratings_matrix
+
+
+def record_rating(user_id, movie_id, rating, title=None):
+    """Apply a rating that was just appended to user_reviews.csv."""
+    try:
+        movie_id = int(float(movie_id))
+        rating = float(rating)
+    except (TypeError, ValueError):
+        return
+    if normalize_user_id(user_id) is None:
+        return
+    with _ratings_matrix_lock:
+        matrix = _ratings_matrix
+    # Not built yet: the build reads the file, which already holds this rating
+    if matrix is not None:
+        matrix.add(user_id, movie_id, rating, title)
+
+
+def invalidate_ratings_matrix():
+    """Drop the shared matrix so it is rebuilt from user_reviews.csv on next use."""
+    global _ratings_matrix
+    with _ratings_matrix_lock:
+        _ratings_matrix = None
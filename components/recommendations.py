@@ -1,7 +1,9 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
-import os
+import hashlib
+import threading
+import weakref
 from typing import List, Tuple, Optional, Dict, Any
 from .api_calls import (
     fetch_movie_metadata,
@@ -10,13 +12,136 @@ from .api_calls import (
     fetch_genres,
     fetch_movies_by_genre,
 )
+from .result_cache import FallbackResult, cached_recommendation
+from .instrumentation import instrument_methods
+from .metrics import RECOMMENDATION_SECONDS
+from .ann_index import normalize_rows, top_k
+from .title_search import TitleSearchIndex, TitleAutocomplete
+from config import RECOMMENDATION_CONFIG
+from .user_management import normalize_user_id
+from .file_handling import normalize_movie_id
+from .seen_items import get_seen_index, get_seen_mask
+from .ratings_matrix import get_ratings_matrix
+from .profile_aggregates import get_profile_aggregates
 
 
+def seen_items_fingerprint(movie_ids) -> str:
+    """Stable digest of a user's seen movie ids, used to spot stale precomputed lists."""
+    joined = ",".join(str(movie_id) for movie_id in sorted(int(m) for m in movie_ids))
+    return hashlib.md5(joined.encode()).hexdigest()
+
+
+def get_precomputed_recommendations() -> Dict[int, Dict[str, Any]]:
+    """Per-user collaborative lists from the nightly batch, if they match the live model."""
+    from .model_registry import get_model_registry, artifact_fingerprint
+    
+    artifacts = get_model_registry().pinned()
+    store = artifacts.get("precomputed_recommendations")
+    if not store or store.get("svd_model") != artifact_fingerprint(artifacts.path("svd_model")):
+        return {}
+    return store.get("users", {})
+
+
+def get_ann_index():
+    """The published item-embedding ANN index, or None when there is none."""
+    from .model_registry import get_model_registry
+    
+    return get_model_registry().pinned().get("ann_index")
+
+
+# Indexes over frames that are not the pinned catalog, dropped when the frame is collected
+_frame_indexes = {}
+_frame_indexes_lock = threading.Lock()
+
+
+def _catalog_index(movies: pd.DataFrame, name: str, build):
+    """The pinned version's `name` artifact when `movies` is its catalog, else one built once per frame."""
+    from .model_registry import get_model_registry
+    
+    artifacts = get_model_registry().pinned()
+    if artifacts.get("movies") is movies:
+        return artifacts.get(name)
+    key = (id(movies), name)
+    with _frame_indexes_lock:
+        entry = _frame_indexes.get(key)
+        if entry is not None and entry[0]() is movies:
+            return entry[1]
+    index = build(movies)
+    ref = weakref.ref(movies, lambda _: _frame_indexes.pop(key, None))
+    with _frame_indexes_lock:
+        _frame_indexes[key] = (ref, index)
+    return index
+
+
+def search_titles(query: str, movies: pd.DataFrame, limit: int = 50) -> pd.DataFrame:
+    """Movies whose titles match the query (prefix or fuzzy), best match first."""
+    index = _catalog_index(movies, "title_index", lambda frame: TitleSearchIndex(frame["title"].tolist()))
+    return movies.iloc[index.search(query, limit)]
+
+
+def autocomplete_titles(query: str, movies: pd.DataFrame, limit: int = 20) -> List[str]:
+    """Up to `limit` titles for the movie selector: prefix matches, else fuzzy ones."""
+    if not query or not query.strip():
+        # Nothing typed yet: offer the head of the catalog without scanning all of it
+        return movies["title"].head(limit * 2).dropna().drop_duplicates().head(limit).tolist()
+    completer = _catalog_index(
+        movies, "title_autocomplete", lambda frame: TitleAutocomplete.build(frame["title"].tolist())
+    )
+    titles = completer.complete(query, limit)
+    if not titles:
+        # Typo in the first letters: fall back to the trigram title search
+        titles = search_titles(query, movies, limit)["title"].drop_duplicates().tolist()
+    return titles
+
+
+def get_movie_overview(movie_id: int, default: str = "No description available") -> str:
+    """Overview of a pinned-catalog movie by id, decoded from the mapped catalog on demand."""
+    from .model_registry import get_model_registry
+    
+    artifacts = get_model_registry().pinned()
+    catalog = artifacts.get("catalog")
+    if catalog is None or "overview" not in catalog.columns:
+        return default
+    row = artifacts.get("movie_rows").get(normalize_movie_id(movie_id))
+    if row is None:
+        return default
+    return catalog.value("overview", row) or default
+
+
+def get_movie_ids(titles: List[str]) -> Dict[str, int]:
+    """Catalog movie ids for the given titles, first match per title."""
+    from .model_registry import get_model_registry
+    
+    movies = get_model_registry().pinned().get("movies")
+    if movies is None or movies.empty or not titles:
+        return {}
+    matches = movies.loc[movies["title"].isin(titles), ["title", "id"]].drop_duplicates("title")
+    return dict(zip(matches["title"], matches["id"].astype(int)))
+
+
+def search_overviews(query: str, movies: pd.DataFrame, limit: int = 12) -> pd.DataFrame:
+    """Movies whose overview or genres match the query's keywords, ranked by BM25.
+    
+    Empty when the catalog has no offline text index; the caller falls back to TMDB.
+    """
+    # Never built online: only the pinned catalog's memory-mapped index is searched
+    index = _catalog_index(movies, "text_index", lambda frame: None)
+    if index is None:
+        return movies.iloc[:0]
+    rows, _ = index.search(query, limit)
+    return movies.iloc[rows]
+
+
+@instrument_methods("engine")
 class RecommendationEngine:
-    def __init__(self, movies: pd.DataFrame, similarity: np.ndarray = None, svd_model = None):
+    def __init__(self, movies: pd.DataFrame, similarity: np.ndarray = None, svd_model = None,
+                 precomputed: Optional[Dict[int, Dict[str, Any]]] = None, ann_index=None):
         self.movies = movies
         self.similarity = similarity
         self.svd_model = svd_model
+        self.precomputed = precomputed or {}
+        # An index built for a different catalog would map rows to the wrong movies
+        self.ann_index = ann_index if ann_index is not None and len(ann_index) == len(movies) else None
         self.mood_genres = {
             "happy": [35, 10751, 16, 10402],
             "sad": [18, 10749, 10402, 99],
@@ -32,6 +157,7 @@ class RecommendationEngine:
         validations = {
             "movies": not self.movies.empty,
             "similarity": self.similarity is not None,
+            "neighbours": self.similarity is not None or self.ann_index is not None,
             "svd_model": self.svd_model is not None
         }
         return all(validations.get(data, True) for data in required_data)
@@ -40,38 +166,35 @@ class RecommendationEngine:
         indices = self.movies[self.movies["title"].str.lower() == movie_title.lower()].index
         return indices[0] if len(indices) > 0 else None
 
-    def _get_user_rated_movies(self, user_id: int) -> set:
+    def _seen_mask(self, user_id: Optional[int]) -> np.ndarray:
+        """Writable copy of the user's seen-items mask over catalog rows."""
+        if user_id is None:
+            return np.zeros(len(self.movies), dtype=bool)
+        return np.array(get_seen_mask(user_id, self.movies), dtype=bool)
+
+    def _get_user_ratings(self, user_id: int) -> Dict[int, float]:
         try:
-            if not os.path.exists("user_reviews.csv"):
-                return set()
-            
-            reviews_df = pd.read_csv("user_reviews.csv")
-            user_reviews = reviews_df[reviews_df["user"].astype(str) == str(user_id)]
-            return set(user_reviews["movie_id"].astype(int))
+            return get_ratings_matrix().user_ratings(user_id)
         except Exception:
-            return set()
+            return {}
 
-    def content_based_similarity(self, movie_title: str, num_recommendations: int = 5) -> Tuple[List[str], List[str]]:
-        if not self._validate_data(["movies", "similarity"]):
+    def content_based_similarity(self, movie_title: str, num_recommendations: int = 5,
+                                 user_id: Optional[int] = None) -> Tuple[List[str], List[str]]:
+        if not self._validate_data(["movies", "neighbours"]):
             return self._fallback_recommendations()
         
         try:
             index = self._get_movie_index(movie_title)
-            if index is None or index >= len(self.similarity):
+            if index is None or index >= self._neighbour_rows():
                 st.error(f"Movie '{movie_title}' not found")
                 return self._fallback_recommendations()
             
-            similarity_scores = list(enumerate(self.similarity[index]))
-            similarity_scores = sorted(similarity_scores, key=lambda x: x[1], reverse=True)
-            
-            recommendations = []
-            posters = []
+            exclude = self._seen_mask(user_id)
+            exclude[index] = True
+            top, _ = self._neighbours(np.array([index]), np.ones(1), num_recommendations, exclude)
             
-            for idx, score in similarity_scores[1:num_recommendations + 1]:
-                if idx < len(self.movies):
-                    movie = self.movies.iloc[idx]
-                    recommendations.append(movie.get('title', 'Unknown'))
-                    posters.append(fetch_poster(movie.get('id', 0)))
+            recommendations = self.movies["title"].to_numpy()[top].tolist()
+            posters = [fetch_poster(movie_id) for movie_id in self.movies["id"].to_numpy()[top]]
             
             return recommendations, posters
             
@@ -79,6 +202,28 @@ class RecommendationEngine:
             st.error(f"Content-based recommendation error: {e}")
             return self._fallback_recommendations()
 
+    def _neighbour_rows(self) -> int:
+        """Number of catalog rows covered by the ANN index or similarity matrix."""
+        if self.ann_index is not None:
+            return len(self.ann_index)
+        return min(len(self.similarity), len(self.movies))
+
+    def _neighbours(self, seed_rows: np.ndarray, weights: np.ndarray, limit: int,
+                    exclude: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Top `limit` catalog rows by weighted similarity to the seed rows, best first.
+        
+        Uses the ANN index over item embeddings when one is loaded, else the
+        similarity matrix. `exclude` is a boolean mask over catalog rows.
+        """
+        if self.ann_index is not None:
+            query = normalize_rows((weights @ self.ann_index.vectors[seed_rows])[np.newaxis])[0]
+            return self.ann_index.search(query, limit, exclude=exclude)
+        
+        scores = weights @ np.asarray(self.similarity[seed_rows], dtype=np.float64)
+        scores = scores[:self._neighbour_rows()]
+        rows = np.flatnonzero(~exclude[:len(scores)])
+        return top_k(rows, scores[rows], limit)
+
     def content_based_tmdb(self, movie_title: str, num_recommendations: int = 5) -> Tuple[List[str], List[str]]:
         if not self._validate_data(["movies"]):
             return self._fallback_recommendations()
@@ -123,20 +268,10 @@ class RecommendationEngine:
             return self._fallback_recommendations()
         
         try:
-            rated_movies = self._get_user_rated_movies(user_id)
-            predictions = []
-            
-            for _, movie in self.movies.iterrows():
-                movie_id = movie["id"]
-                if movie_id not in rated_movies:
-                    try:
-                        prediction = self.svd_model.predict(user_id, movie_id)
-                        predictions.append((movie_id, movie["title"], prediction.est))
-                    except Exception:
-                        continue
-
-            predictions.sort(key=lambda x: x[2], reverse=True)
-            top_predictions = predictions[:num_recommendations]
+            seen_ids = get_seen_index().seen_ids(user_id)
+            top_predictions = self._get_precomputed_predictions(user_id, seen_ids, num_recommendations)
+            if top_predictions is None:
+                top_predictions = self.collaborative_scores(user_id, self._seen_mask(user_id), num_recommendations)
             
             names = [title for _, title, _ in top_predictions]
             posters = [fetch_poster(movie_id) for movie_id, _, _ in top_predictions]
@@ -147,38 +282,110 @@ class RecommendationEngine:
             st.error(f"Collaborative filtering error: {e}")
             return self._fallback_recommendations()
 
-    def hybrid_recommendations(self, movie_title: str, user_id: int, 
-                              content_weight: float = 0.6, collab_weight: float = 0.4) -> Tuple[List[str], List[str]]:
-        if not self._validate_data(["movies"]):
+    def collaborative_scores(self, user_id: int, exclude: np.ndarray, limit: int) -> List[Tuple[int, str, float]]:
+        predictions = []
+        rows = np.flatnonzero(~exclude)
+        
+        for movie_id, title in zip(self.movies["id"].to_numpy()[rows], self.movies["title"].to_numpy()[rows]):
+            try:
+                prediction = self.svd_model.predict(user_id, movie_id)
+                predictions.append((movie_id, title, prediction.est))
+            except Exception:
+                continue
+
+        predictions.sort(key=lambda x: x[2], reverse=True)
+        return predictions[:limit]
+
+    def _get_precomputed_predictions(self, user_id: int, seen_ids: frozenset, limit: int) -> Optional[List[Tuple[int, str, float]]]:
+        entry = self.precomputed.get(normalize_user_id(user_id))
+        if entry is None or len(entry["items"]) < limit:
+            return None
+        # The user saw more movies since the batch run: score live instead
+        if entry["fingerprint"] != seen_items_fingerprint(seen_ids):
+            return None
+        return entry["items"][:limit]
+
+    def multi_seed_recommendations(self, user_id: int, num_recommendations: int = 5,
+                                   max_seeds: int = None) -> Tuple[List[str], List[str]]:
+        """Recommend from the user's top-rated movies in one pass over their similarity rows."""
+        if not self._validate_data(["movies", "neighbours"]):
             return self._fallback_recommendations()
         
+        if max_seeds is None:
+            max_seeds = RECOMMENDATION_CONFIG["personalized_seeds"]
+        
         try:
-            content_names, content_posters = self.content_based_similarity(movie_title)
-            collab_names, collab_posters = self.collaborative_filtering(user_id)
-            
-            hybrid_movies = {}
-            
-            for i, name in enumerate(content_names):
-                score = content_weight * (len(content_names) - i) / len(content_names)
-                hybrid_movies[name] = {
-                    'score': score, 
-                    'poster': content_posters[i]
-                }
-            
-            for i, name in enumerate(collab_names):
-                score = collab_weight * (len(collab_names) - i) / len(collab_names)
-                if name in hybrid_movies:
-                    hybrid_movies[name]['score'] += score
-                else:
-                    hybrid_movies[name] = {
-                        'score': score, 
-                        'poster': collab_posters[i]
-                    }
+            ratings = self._get_user_ratings(user_id)
+            if not ratings:
+                return [], []
+            
+            movie_ids = self.movies["id"].to_numpy()
+            rated = np.isin(movie_ids, list(ratings))
+            rated_rows = np.flatnonzero(rated[:self._neighbour_rows()])
+            if len(rated_rows) == 0:
+                return [], []
             
-            sorted_movies = sorted(hybrid_movies.items(), key=lambda x: x[1]['score'], reverse=True)[:5]
+            weights = np.array([ratings[int(movie_id)] for movie_id in movie_ids[rated_rows]])
+            order = np.argsort(-weights, kind="stable")[:max_seeds]
             
-            names = [movie[0] for movie in sorted_movies]
-            posters = [movie[1]['poster'] for movie in sorted_movies]
+            # Rank by the rating-weighted sum of the seeds' similarities
+            exclude = rated | self._seen_mask(user_id)
+            top, _ = self._neighbours(rated_rows[order], weights[order], num_recommendations, exclude)
+            if len(top) == 0:
+                return [], []
+            
+            names = self.movies["title"].to_numpy()[top].tolist()
+            posters = [fetch_poster(movie_id) for movie_id in movie_ids[top]]
+            
+            return names, posters
+            
+        except Exception as e:
+            st.error(f"Personalized recommendation error: {e}")
+            return self._fallback_recommendations()
+
+    def hybrid_recommendations(self, movie_title: str, user_id: int,
+                              content_weight: float = None, collab_weight: float = None,
+                              num_recommendations: int = 5) -> Tuple[List[str], List[str]]:
+        if not self._validate_data(["movies", "neighbours"]):
+            return self._fallback_recommendations()
+        
+        if content_weight is None:
+            content_weight = RECOMMENDATION_CONFIG["content_weight"]
+        if collab_weight is None:
+            collab_weight = RECOMMENDATION_CONFIG["collaborative_weight"]
+        
+        try:
+            index = self._get_movie_index(movie_title)
+            if index is None or index >= self._neighbour_rows():
+                st.error(f"Movie '{movie_title}' not found")
+                return self._fallback_recommendations()
+            
+            exclude = self._seen_mask(user_id)
+            exclude[index] = True
+            candidates, _ = self._neighbours(
+                np.array([index]), np.ones(1), RECOMMENDATION_CONFIG["hybrid_candidates"], exclude
+            )
+            # The user's precomputed collaborative picks compete even when they are not neighbours
+            precomputed = self._get_precomputed_predictions(
+                user_id, get_seen_index().seen_ids(user_id), num_recommendations
+            )
+            if precomputed:
+                picks = np.flatnonzero(self.movies["id"].isin([movie_id for movie_id, _, _ in precomputed]).to_numpy())
+                candidates = np.union1d(candidates, picks[(picks != index) & (picks < self._neighbour_rows())])
+            if len(candidates) == 0:
+                return self._fallback_recommendations()
+            
+            content_scores = self._similarity_scores(index, candidates)
+            blended = content_weight * _min_max_normalize(content_scores)
+            if self.svd_model is not None:
+                collab_scores = self._predict_ratings(user_id, candidates)
+                blended += collab_weight * _min_max_normalize(collab_scores)
+            
+            top = candidates[np.argsort(-blended, kind="stable")[:num_recommendations]]
+            movie_ids = self.movies["id"].to_numpy()[top]
+            
+            names = self.movies["title"].to_numpy()[top].tolist()
+            posters = [fetch_poster(movie_id) for movie_id in movie_ids]
             
             return names, posters
             
@@ -186,6 +393,22 @@ class RecommendationEngine:
             st.error(f"Hybrid recommendation error: {e}")
             return self._fallback_recommendations()
 
+    def _similarity_scores(self, index: int, rows: np.ndarray) -> np.ndarray:
+        """Similarity of one movie to each of the given catalog rows."""
+        if self.ann_index is not None:
+            return self.ann_index.vectors[rows] @ self.ann_index.vectors[index]
+        return np.asarray(self.similarity[index], dtype=np.float64)[rows]
+
+    def _predict_ratings(self, user_id: int, positions: np.ndarray) -> np.ndarray:
+        """CF rating estimates for the given catalog rows; NaN where the model fails."""
+        estimates = np.full(len(positions), np.nan)
+        for i, movie_id in enumerate(self.movies["id"].to_numpy()[positions]):
+            try:
+                estimates[i] = self.svd_model.predict(user_id, movie_id).est
+            except Exception:
+                continue
+        return estimates
+
     def mood_based_recommendations(self, mood_answers: Dict[str, Any]) -> Tuple[List[Dict], List[str]]:
         try:
             primary_mood = mood_answers.get("mood", "thoughtful")
@@ -299,7 +522,7 @@ class RecommendationEngine:
                         "release_date": "2020-01-01",
                         "genres": []
                     })
-                return fallback_movies, fallback_posters
+                return FallbackResult((fallback_movies, fallback_posters))
             
         except Exception as e:
             fallback_names, fallback_posters = self._fallback_recommendations()
@@ -316,7 +539,7 @@ class RecommendationEngine:
                     "release_date": "2020-01-01",
                     "genres": []
                 })
-            return fallback_movies, fallback_posters
+            return FallbackResult((fallback_movies, fallback_posters))
 
     def genre_based_recommendations(self, genre_id: int, limit: int = 5) -> Tuple[List[str], List[str]]:
         try:
@@ -335,26 +558,7 @@ class RecommendationEngine:
 
     def get_user_profile(self, user_id: int) -> Dict[str, Any]:
         try:
-            if not os.path.exists("user_reviews.csv"):
-                return {}
-            
-            reviews_df = pd.read_csv("user_reviews.csv")
-            user_reviews = reviews_df[reviews_df["user"].astype(str) == str(user_id)]
-            
-            if user_reviews.empty:
-                return {}
-            
-            profile = {
-                "total_reviews": len(user_reviews),
-                "average_rating": user_reviews["rating"].mean(),
-                "top_rated_movies": user_reviews.nlargest(5, "rating")["title"].tolist(),
-                "most_recent_movies": user_reviews.nlargest(5, "timestamp")["title"].tolist() 
-                if "timestamp" in user_reviews.columns else [],
-                "rating_distribution": user_reviews["rating"].value_counts().to_dict()
-            }
-            
-            return profile
-            
+            return get_profile_aggregates().profile(user_id)
         except Exception:
             return {}
 
@@ -366,33 +570,92 @@ class RecommendationEngine:
         return intersection / union if union > 0 else 0.0
 
     def _fallback_recommendations(self) -> Tuple[List[str], List[str]]:
+        """Popular movies, flagged as a FallbackResult so they are never result-cached."""
         try:
             popular_movies = fetch_popular_movies(limit=5)
             if popular_movies:
                 names = [movie["title"] for movie in popular_movies]
                 posters = [movie["poster"] for movie in popular_movies]
-                return names, posters
-            return [], []
+                return FallbackResult((names, posters))
+            return FallbackResult(([], []))
         except Exception:
-            return [], []
+            return FallbackResult(([], []))
+
+
+def _min_max_normalize(scores: np.ndarray) -> np.ndarray:
+    """Scale scores to [0, 1]; missing or constant scores carry no signal and map to 0."""
+    scores = np.asarray(scores, dtype=np.float64)
+    finite = np.isfinite(scores)
+    if not finite.any():
+        return np.zeros_like(scores)
+    low, high = scores[finite].min(), scores[finite].max()
+    if high <= low:
+        return np.zeros_like(scores)
+    return np.where(finite, (scores - low) / (high - low), 0.0)
+
 
+def _normalize_title(movie_title) -> str:
+    return str(movie_title).strip().casefold()
 
-def recommend_content_based(movie_title: str, movies: pd.DataFrame, similarity: np.ndarray) -> Tuple[List[str], List[str]]:
-    engine = RecommendationEngine(movies, similarity)
-    return engine.content_based_similarity(movie_title)
+
+def _normalize_mood_answers(mood_answers: dict) -> tuple:
+    def normalize(value):
+        if isinstance(value, (list, tuple, set)):
+            return tuple(sorted(normalize(v) for v in value))
+        return value.strip().casefold() if isinstance(value, str) else value
+    return tuple(sorted((key, normalize(value)) for key, value in mood_answers.items()))
+
+
+def _content_based_user(movie_title, movies=None, similarity=None, user_id=None):
+    return normalize_user_id(user_id)
+
+
+@cached_recommendation(
+    "content_based",
+    lambda movie_title, *args, **kwargs: (_normalize_title(movie_title), _content_based_user(movie_title, *args, **kwargs)),
+    user_fn=_content_based_user,
+)
+def recommend_content_based(movie_title: str, movies: pd.DataFrame, similarity: np.ndarray,
+                            user_id: int = None) -> Tuple[List[str], List[str]]:
+    engine = RecommendationEngine(movies, similarity, ann_index=get_ann_index())
+    return engine.content_based_similarity(movie_title, user_id=user_id)
 
 def recommend_content_based_tmdb(movie_title: str, movies: pd.DataFrame, num_recommendations: int = 5) -> Tuple[List[str], List[str]]:
-    engine = RecommendationEngine(movies)
-    return engine.content_based_tmdb(movie_title, num_recommendations)
+    # Not result-cached: the TMDB metadata behind it is cached by st.cache_data
+    with RECOMMENDATION_SECONDS.time(algorithm="content_tmdb", cache="none"):
+        engine = RecommendationEngine(movies)
+        return engine.content_based_tmdb(movie_title, num_recommendations)
 
+@cached_recommendation(
+    "collaborative",
+    lambda user_id, *args, **kwargs: normalize_user_id(user_id),
+    user_fn=lambda user_id, *args, **kwargs: normalize_user_id(user_id),
+)
 def recommend_collaborative(user_id: int, movies: pd.DataFrame, svd_model) -> Tuple[List[str], List[str]]:
-    engine = RecommendationEngine(movies, svd_model=svd_model)
+    engine = RecommendationEngine(movies, svd_model=svd_model, precomputed=get_precomputed_recommendations())
     return engine.collaborative_filtering(user_id)
 
+@cached_recommendation(
+    "hybrid",
+    lambda movie_title, user_id, *args, **kwargs: (_normalize_title(movie_title), normalize_user_id(user_id)),
+    user_fn=lambda movie_title, user_id, *args, **kwargs: normalize_user_id(user_id),
+)
 def recommend_hybrid(movie_title: str, user_id: int, movies: pd.DataFrame, similarity: np.ndarray, svd_model) -> Tuple[List[str], List[str]]:
-    engine = RecommendationEngine(movies, similarity, svd_model)
+    engine = RecommendationEngine(
+        movies, similarity, svd_model, precomputed=get_precomputed_recommendations(), ann_index=get_ann_index()
+    )
     return engine.hybrid_recommendations(movie_title, user_id)
 
+@cached_recommendation(
+    "personalized",
+    lambda user_id, *args, **kwargs: normalize_user_id(user_id),
+    user_fn=lambda user_id, *args, **kwargs: normalize_user_id(user_id),
+)
+def recommend_personalized(user_id: int, movies: pd.DataFrame, similarity: np.ndarray) -> Tuple[List[str], List[str]]:
+    engine = RecommendationEngine(movies, similarity, ann_index=get_ann_index())
+    return engine.multi_seed_recommendations(user_id)
+
+@cached_recommendation("mood", lambda mood_answers: _normalize_mood_answers(mood_answers))
 def recommend_by_mood(mood_answers: dict) -> Tuple[List[Dict], List[str]]:
     engine = RecommendationEngine(pd.DataFrame())
     return engine.mood_based_recommendations(mood_answers)
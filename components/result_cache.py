@@ -0,0 +1,193 @@
+import copy
+import functools
+import numbers
+import threading
+import time
+from collections import OrderedDict
+from config import CACHE_TTL
+from components.user_management import normalize_user_id
+from components.instrumentation import span, tag_current
+from components.metrics import CACHE_LOOKUPS, RECOMMENDATION_SECONDS
+
+
+class ResultCache:
+    """Thread-safe LRU cache with per-entry TTL, per-user invalidation and hit counters."""
+
+    def __init__(self, max_entries=1024, ttl=CACHE_TTL["recommendations"], name="results"):
+        self.name = name  # the cache label on exported metrics
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """Return (found, value); expired entries count as misses."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                tag_current(cache="miss")
+                CACHE_LOOKUPS.inc(cache=self.name, result="miss")
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            tag_current(cache="hit")
+            CACHE_LOOKUPS.inc(cache=self.name, result="hit")
+            return True, copy.deepcopy(entry[1])
+
+    def set(self, key, value, user_id=None, ttl=None):
+        """Store a value, tagging it with the user it belongs to, if any."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+            self._entries[key] = (expires_at, copy.deepcopy(value), user_id)
+            if user_id is not None:
+                self._keys_by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, _, user_id = self._entries.pop(key)
+        if user_id is not None:
+            keys = self._keys_by_user.get(user_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_user[user_id]
+
+    def invalidate_user(self, user_id):
+        """Drop every entry computed for one user."""
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def stats(self):
+        """Return hit/miss counters and the current hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution of the work."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Run fn() unless a call for key is in flight; then wait for and share its result."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event(), "value": None, "error": None}
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return copy.deepcopy(call["value"])
+        try:
+            call["value"] = fn()
+            return call["value"]
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+
+
+class FallbackResult(tuple):
+    """A recommender's (items, posters) pair that is the popular-movies fallback, not a real result."""
+
+    __slots__ = ()
+
+
+# Shared by every session; results are keyed by algorithm, normalized inputs and
+# the pinned model artifact set (version and generation).
+recommendation_cache = ResultCache(name="recommendations")
+
+
+def _artifact_key(args, kwargs):
+    """(version, generation) of the pinned ArtifactSet, or None if an argument isn't one of its artifacts.
+
+    Frames, matrices and models passed in are matched by identity: a result
+    computed from any other catalog or similarity matrix must not be cached
+    under the pinned set's key. The generation changes on every swap,
+    including in-place reloads that keep the version string.
+    """
+    from components.model_registry import get_model_registry
+    artifacts = get_model_registry().pinned()
+    loaded = {id(value) for value in artifacts.loaded_values()}
+    for value in (*args, *kwargs.values()):
+        if value is None or isinstance(value, (str, numbers.Number, dict, list, tuple)):
+            continue
+        if id(value) not in loaded:
+            return None
+    return artifacts.version, artifacts.generation
+
+
+def cached_recommendation(algorithm, key_fn, user_fn=None):
+    """Cache a recommender's non-empty results keyed by (algorithm, key_fn(...), artifact set).
+
+    Calls whose frames or models are not artifacts of the pinned set run
+    uncached; see _artifact_key().
+
+    FallbackResult values are returned but not cached, so the next call
+    retries the real recommender instead of serving popular movies for the TTL.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            with span(f"recommend.{algorithm}"):
+                artifact_key = _artifact_key(args, kwargs)
+                if artifact_key is None:
+                    with RECOMMENDATION_SECONDS.time(algorithm=algorithm, cache="none"):
+                        return fn(*args, **kwargs)
+                key = (algorithm, key_fn(*args, **kwargs), artifact_key)
+                found, value = recommendation_cache.get(key)
+                if found:
+                    RECOMMENDATION_SECONDS.observe(time.perf_counter() - start, algorithm=algorithm, cache="hit")
+                    return value
+                value = fn(*args, **kwargs)
+                if value and value[0] and not isinstance(value, FallbackResult):
+                    user_id = user_fn(*args, **kwargs) if user_fn else None
+                    recommendation_cache.set(key, value, user_id=user_id)
+                RECOMMENDATION_SECONDS.observe(time.perf_counter() - start, algorithm=algorithm, cache="miss")
+                return value
+        return wrapper
+    return decorator
+
+
+def invalidate_user_recommendations(user_id):
+    """Forget cached recommendations for a user, e.g. after they rate a movie."""
+    recommendation_cache.invalidate_user(normalize_user_id(user_id))
+
+
+def get_recommendation_cache_stats():
+    return recommendation_cache.stats()
@@ -0,0 +1,161 @@
+"""
+Per-user "already seen" movies, as boolean masks over catalog rows.
+
+A movie counts as seen once the user watched, rated or watchlisted it. The
+id sets are built once from user_activity.csv, the ratings matrix and the
+watchlist store, then kept current by `mark_seen()` on every write. Masks
+are materialized lazily per user against the catalog they are requested for
+and are read-only; writes swap in an updated copy so a recommender that is
+still holding the old mask never sees it change underneath it. A mask costs
+one byte per catalog row, so only the MAX_CACHED_MASKS most recently used
+are kept; the id sets stay resident and an evicted mask is rebuilt from them.
+"""
+
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from components.user_management import normalize_user_id
+from components.result_cache import invalidate_user_recommendations
+from components.ratings_matrix import get_ratings_matrix
+
+ACTIVITY_FILE = "user_activity.csv"
+MAX_CACHED_MASKS = 256
+
+
+def _read_pairs(path, user_column):
+    """Yield (user_id, movie_id) pairs from a CSV log, skipping malformed rows."""
+    if not os.path.exists(path):
+        return
+    try:
+        df = pd.read_csv(path, usecols=[user_column, "movie_id"], on_bad_lines="skip")
+    except Exception as e:
+        print(f"Error reading {path}: {e}")
+        return
+    movie_ids = pd.to_numeric(df["movie_id"], errors="coerce")
+    for user, movie_id in zip(df[user_column], movie_ids):
+        user_id = normalize_user_id(user)
+        if user_id is not None and not pd.isna(movie_id):
+            yield user_id, int(movie_id)
+
+
+class SeenItemsIndex:
+    """user_id -> seen movie ids, with an LRU of read-only row masks for one catalog."""
+
+    def __init__(self, seen=None, max_masks=MAX_CACHED_MASKS):
+        self._seen = seen or {}
+        self._masks = OrderedDict()
+        self._max_masks = max_masks
+        # Weak, so a retired artifact version's catalog can still be collected
+        self._catalog_ref = None
+        self._catalog_ids = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_files(cls):
+        """Build the index from the activity log, reviews and watchlists."""
+        from components.file_handling import get_watchlist_index
+
+        seen = {}
+        for user_id, movie_id in _read_pairs(ACTIVITY_FILE, "user_id"):
+            seen.setdefault(user_id, set()).add(movie_id)
+        ratings = get_ratings_matrix()
+        for user_id in ratings.all_user_ids():
+            seen.setdefault(user_id, set()).update(ratings.user_ratings(user_id))
+        for user_id, entries in get_watchlist_index()["entries"].items():
+            seen.setdefault(user_id, set()).update(entries)
+        return cls(seen)
+
+    def user_ids(self):
+        with self._lock:
+            return list(self._seen)
+
+    def seen_ids(self, user_id):
+        with self._lock:
+            return frozenset(self._seen.get(normalize_user_id(user_id), ()))
+
+    def mask(self, user_id, movies):
+        """Boolean mask over the rows of `movies`, True where the user has seen the movie."""
+        user_id = normalize_user_id(user_id)
+        with self._lock:
+            if self._catalog_ref is None or self._catalog_ref() is not movies:
+                # A different catalog (e.g. after a model reload): row positions changed
+                self._catalog_ref = weakref.ref(movies)
+                # A copy, as a view would keep the catalog's column memory alive
+                self._catalog_ids = (
+                    movies["id"].to_numpy(copy=True) if "id" in movies.columns else np.array([])
+                )
+                self._masks.clear()
+            mask = self._masks.get(user_id)
+            if mask is not None:
+                self._masks.move_to_end(user_id)
+                return mask
+            mask = np.isin(self._catalog_ids, list(self._seen.get(user_id, ())))
+            mask.flags.writeable = False
+            self._masks[user_id] = mask
+            while len(self._masks) > self._max_masks:
+                self._masks.popitem(last=False)
+            return mask
+
+    def add(self, user_id, movie_id):
+        """Record one seen movie; returns False if it was already recorded."""
+        user_id = normalize_user_id(user_id)
+        with self._lock:
+            seen = self._seen.setdefault(user_id, set())
+            if movie_id in seen:
+                return False
+            seen.add(movie_id)
+            mask = self._masks.get(user_id)
+            if mask is not None:
+                # Copy-on-write so callers holding the old mask keep a stable view
+                mask = mask | (self._catalog_ids == movie_id)
+                mask.flags.writeable = False
+                self._masks[user_id] = mask
+            return True
+
+
+_seen_index = None
+_seen_index_lock = threading.RLock()
+
+
+def get_seen_index():
+    """Return the shared seen-items index, building it on first use."""
+    global _seen_index
+    if _seen_index is None:
+        with _seen_index_lock:
+            if _seen_index is None:
+                _seen_index = SeenItemsIndex.from_files()
+    return _seen_index
+
+
+def get_seen_mask(user_id, movies):
+    """Read-only mask over `movies` rows of what the user has already seen."""
+    if user_id is None or movies is None or movies.empty:
+        return np.zeros(0 if movies is None else len(movies), dtype=bool)
+    return get_seen_index().mask(user_id, movies)
+
+
+def mark_seen(user_id, movie_id):
+    """Record that a user watched, rated or watchlisted a movie."""
+    try:
+        movie_id = int(float(movie_id))
+    except (TypeError, ValueError):
+        return
+    if normalize_user_id(user_id) is None:
+        return
+    with _seen_index_lock:
+        index = _seen_index
+    # Not built yet: the build reads the files, which already hold this write
+    if index is None or index.add(user_id, movie_id):
+        invalidate_user_recommendations(user_id)
+
+
+def invalidate_seen_items():
+    """Drop the shared index so it is rebuilt from the files on next use."""
+    global _seen_index
+    with _seen_index_lock:
+        _seen_index = None
@@ -0,0 +1,235 @@
+"""
+BM25 keyword search over movie overviews and genres.
+
+The index is built offline into text_index.npz and memory-mapped at load
+time, so starting the app does not read the postings into memory, and the
+pages of the file the OS caches are shared between processes. Each term's
+posting list is a run of doc-id gaps encoded as LEB128 varints (7 bits per
+byte, high bit set on every byte but a value's last), with a parallel uint8
+array of term frequencies. A query decodes only its own terms' lists, with
+vectorized NumPy, and scores them with Okapi BM25:
+
+    idf(t) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_len / avg_doc_len))
+
+Row positions match the movies DataFrame the index was built from.
+
+    python -m components.text_search build --out text_index.npz
+    python -m components.text_search query "heist crew"
+"""
+
+import argparse
+import time
+import zipfile
+
+import numpy as np
+
+from components.ann_index import top_k
+from components.title_search import normalize_text
+
+TEXT_INDEX_FILE = "text_index.npz"
+BM25_K1 = 1.2
+BM25_B = 0.75
+DEFAULT_LIMIT = 10
+MAX_TERM_FREQUENCY = 255  # term frequencies are stored as uint8
+
+
+def _varint_widths(values):
+    widths = np.ones(len(values), dtype=np.int64)
+    for shift in (7, 14, 21, 28, 35):
+        widths += values >= (1 << shift)
+    return widths
+
+
+def encode_varints(values):
+    """LEB128-encode non-negative integers into one uint8 array."""
+    values = np.asarray(values, dtype=np.uint64)
+    widths = _varint_widths(values)
+    owner = np.repeat(np.arange(len(values)), widths)
+    position = np.arange(len(owner)) - np.repeat(np.cumsum(widths) - widths, widths)
+    out = ((values[owner] >> (7 * position).astype(np.uint64)) & np.uint64(0x7F)).astype(np.uint8)
+    out[position < widths[owner] - 1] |= 0x80
+    return out
+
+
+def decode_varints(data):
+    """Decode a uint8 array of LEB128 varints back into int64 values."""
+    data = np.asarray(data, dtype=np.uint8)
+    if not len(data):
+        return np.array([], dtype=np.int64)
+    ends = np.flatnonzero(data < 0x80)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    position = np.arange(len(data)) - np.repeat(starts, ends - starts + 1)
+    parts = (data & 0x7F).astype(np.int64) << (7 * position)
+    return np.add.reduceat(parts, starts)
+
+
+def tokenize(text):
+    return normalize_text(text).split()
+
+
+def _document_text(movies):
+    return (movies["overview"].fillna("").astype(str) + " " + movies["genres"].fillna("").astype(str)).tolist()
+
+
+class BM25Index:
+    """Compressed inverted index over one catalog's overview and genres text."""
+
+    def __init__(self, terms, term_starts, byte_offsets, postings, frequencies, doc_lengths):
+        self.terms = terms  # sorted, so a term is found by binary search
+        self.term_starts = term_starts  # term i's postings are entries [start_i, start_i+1)
+        self.byte_offsets = byte_offsets  # ... stored in bytes [offset_i, offset_i+1)
+        self.postings = postings
+        self.frequencies = frequencies
+        self.doc_lengths = doc_lengths
+        self.avg_doc_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    @classmethod
+    def build(cls, movies):
+        """Index the overview and genres of every movie."""
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        vectorizer = CountVectorizer(tokenizer=tokenize, lowercase=False, token_pattern=None, stop_words="english")
+        try:
+            counts = vectorizer.fit_transform(_document_text(movies))
+        except ValueError:
+            # Nothing but stop words (or no text at all)
+            counts = None
+        if counts is None:
+            empty = np.array([], dtype=np.uint8)
+            offsets = np.zeros(1, dtype=np.int64)
+            return cls(np.array([], dtype=str), offsets, offsets, empty, empty,
+                       np.zeros(len(movies), dtype=np.int32))
+        # CSC columns are the posting lists, doc ids ascending within each
+        by_term = counts.tocsc()
+        by_term.sort_indices()
+        term_starts = by_term.indptr.astype(np.int64)
+        docs = by_term.indices.astype(np.int64)
+        gaps = np.diff(docs, prepend=0)
+        # Each list starts from its first doc id rather than a gap
+        firsts = term_starts[:-1][np.diff(term_starts) > 0]
+        gaps[firsts] = docs[firsts]
+        byte_offsets = np.concatenate(([0], np.cumsum(_varint_widths(gaps))))[term_starts]
+        return cls(
+            vectorizer.get_feature_names_out().astype(str),
+            term_starts,
+            byte_offsets,
+            encode_varints(gaps),
+            np.minimum(by_term.data, MAX_TERM_FREQUENCY).astype(np.uint8),
+            np.asarray(counts.sum(axis=1)).ravel().astype(np.int32),
+        )
+
+    def save(self, path=TEXT_INDEX_FILE):
+        # Uncompressed, so each member can be memory-mapped in place by load()
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                terms=self.terms,
+                term_starts=self.term_starts,
+                byte_offsets=self.byte_offsets,
+                postings=self.postings,
+                frequencies=self.frequencies,
+                doc_lengths=self.doc_lengths,
+            )
+
+    @classmethod
+    def load(cls, path=TEXT_INDEX_FILE):
+        arrays = _mmap_npz(path)
+        return cls(
+            arrays["terms"],
+            arrays["term_starts"],
+            arrays["byte_offsets"],
+            arrays["postings"],
+            arrays["frequencies"],
+            arrays["doc_lengths"],
+        )
+
+    def postings_for(self, term):
+        """Return (doc ids, term frequencies) for one term; empty arrays if unknown."""
+        column = int(np.searchsorted(self.terms, term))
+        if column >= len(self.terms) or self.terms[column] != term:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.uint8)
+        docs = np.cumsum(decode_varints(self.postings[self.byte_offsets[column]:self.byte_offsets[column + 1]]))
+        return docs, self.frequencies[self.term_starts[column]:self.term_starts[column + 1]]
+
+    def search(self, query, limit=DEFAULT_LIMIT, exclude=None):
+        """Return up to `limit` (row positions, BM25 scores), best first."""
+        scores = np.zeros(len(self), dtype=np.float32)
+        matched = False
+        for term in set(tokenize(query)):
+            docs, tf = self.postings_for(term)
+            if not len(docs):
+                continue
+            matched = True
+            idf = np.log1p((len(self) - len(docs) + 0.5) / (len(docs) + 0.5))
+            tf = tf.astype(np.float32)
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[docs] / self.avg_doc_length)
+            scores[docs] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        if not matched:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        rows = np.flatnonzero(scores > 0)
+        if exclude is not None:
+            rows = rows[~exclude[rows]]
+        return top_k(rows, scores[rows], limit)
+
+
+def _mmap_npz(path):
+    """Memory-map every array in an uncompressed .npz file."""
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path} member {info.filename} is compressed and cannot be mapped")
+            # Skip the zip local file header to reach the .npy bytes
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = np.frombuffer(f.read(4), dtype="<u2")
+            f.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if not int(np.prod(shape)):
+                arrays[name] = np.zeros(shape, dtype=dtype)
+                continue
+            arrays[name] = np.memmap(
+                path, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                order="F" if fortran_order else "C",
+            )
+    return arrays
+
+
+def main():
+    from components.file_handling import load_movies
+
+    parser = argparse.ArgumentParser(description="Build or query the BM25 overview index.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build")
+    build.add_argument("--out", default=TEXT_INDEX_FILE)
+    query = subparsers.add_parser("query")
+    query.add_argument("terms", nargs="+")
+    query.add_argument("--index", default=TEXT_INDEX_FILE)
+    args = parser.parse_args()
+
+    movies = load_movies(include_text=True)
+    if args.command == "build":
+        start = time.perf_counter()
+        index = BM25Index.build(movies)
+        index.save(args.out)
+        print(
+            f"Indexed {len(index)} movies, {len(index.terms)} terms, "
+            f"{len(index.postings) / 1e6:.1f} MB of postings in {args.out} "
+            f"({time.perf_counter() - start:.2f}s)"
+        )
+    else:
+        index = BM25Index.load(args.index)
+        rows, scores = index.search(" ".join(args.terms))
+        for row, score in zip(rows, scores):
+            print(f"{score:6.2f}  {movies['title'].iloc[row]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+In-memory title search: prefix lookup plus a typo-tolerant trigram index.
+
+Titles are normalized (Unicode folded, accents stripped, casefolded,
+punctuation collapsed to single spaces). Two structures are built over them:
+
+- a sorted array of every word-start suffix of every title; binary search
+  finds exact-title, title-prefix and word-prefix matches, like a prefix
+  trie but without a node per character;
+- a trigram inverted index (a sparse titles x trigrams matrix whose CSC
+  columns are the posting lists); titles sharing enough trigrams with the
+  query match even when the query is misspelled.
+
+Results are ranked exact > title prefix > word prefix > fuzzy (by trigram
+Dice similarity), shorter titles first within a tier. Row positions match
+the movies DataFrame the index was built from.
+
+TitleAutocomplete is the lighter structure behind the movie selector: the
+catalog's unique titles sorted by normalized form, so the titles starting
+with what the user typed are a contiguous slice found by binary search.
+
+    python -m components.title_search "godfahter"
+"""
+
+import bisect
+import itertools
+import sys
+import unicodedata
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+DEFAULT_LIMIT = 10
+MAX_PREFIX_CANDIDATES = 200
+# Trigrams shared by more titles than this carry little signal ("the", " a ")
+MAX_POSTINGS_FRACTION = 0.05
+MIN_FUZZY_SIMILARITY = 0.35
+
+
+_ASCII_PUNCTUATION = str.maketrans({chr(i): " " for i in range(128) if not chr(i).isalnum()})
+
+
+def normalize_text(text):
+    """Fold case, accents and punctuation so "Amélie!" and "amelie" compare equal."""
+    text = str(text)
+    if text.isascii():
+        # Fast path for the common case: nothing to decompose
+        return " ".join(text.lower().translate(_ASCII_PUNCTUATION).split())
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    return " ".join("".join(ch if ch.isalnum() else " " for ch in text).split())
+
+
+def _trigrams(normalized):
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleSearchIndex:
+    """Prefix and trigram indexes over one catalog's titles."""
+
+    def __init__(self, titles):
+        self.titles = [normalize_text(title) if isinstance(title, str) else "" for title in titles]
+        self.lengths = np.array([len(title) for title in self.titles], dtype=np.int32)
+
+        # Word-start suffixes, sorted, for exact/prefix lookups
+        suffixes = []
+        for row, title in enumerate(self.titles):
+            start = 0
+            for word in title.split(" "):
+                if word:
+                    suffixes.append((title[start:], start == 0, row))
+                start += len(word) + 1
+        suffixes.sort()
+        self.suffix_keys = [key for key, _, _ in suffixes]
+        self.suffix_is_title_start = np.array([is_start for _, is_start, _ in suffixes], dtype=bool)
+        self.suffix_rows = np.array([row for _, _, row in suffixes], dtype=np.int32)
+
+        # Trigram postings: CSC column j lists the rows containing trigram j
+        grams = [_trigrams(title) if title else () for title in self.titles]
+        self.gram_counts = np.fromiter((len(g) for g in grams), dtype=np.int32, count=len(grams))
+        columns, vocabulary = pd.factorize(pd.Series(list(itertools.chain.from_iterable(grams)), dtype=object))
+        self.vocabulary = dict(zip(vocabulary, range(len(vocabulary))))
+        rows = np.repeat(np.arange(len(self.titles), dtype=np.int32), self.gram_counts)
+        self.postings = sparse.csc_matrix(
+            (np.ones(len(columns), dtype=np.bool_), (rows, columns)),
+            shape=(len(self.titles), len(self.vocabulary)),
+        )
+
+    def __len__(self):
+        return len(self.titles)
+
+    def _prefix_matches(self, query):
+        """Rows whose title, or one of its words, starts with the query."""
+        lo = bisect.bisect_left(self.suffix_keys, query)
+        hi = lo
+        while (
+            hi < len(self.suffix_keys)
+            and hi - lo < MAX_PREFIX_CANDIDATES
+            and self.suffix_keys[hi].startswith(query)
+        ):
+            hi += 1
+        return self.suffix_rows[lo:hi], self.suffix_is_title_start[lo:hi]
+
+    def _fuzzy_matches(self, query):
+        """Rows sharing enough trigrams with the query, with their Dice similarity."""
+        grams = [g for g in _trigrams(query) if g in self.vocabulary]
+        if not grams:
+            return np.array([], dtype=np.int32), np.array([])
+        columns = [self.vocabulary[g] for g in grams]
+        sizes = np.diff(self.postings.indptr)[columns]
+        cap = max(MAX_POSTINGS_FRACTION * len(self), sizes.min())
+        selected = [col for col, size in zip(columns, sizes) if size <= cap]
+        candidates = np.concatenate(
+            [self.postings.indices[self.postings.indptr[c]:self.postings.indptr[c + 1]] for c in selected]
+        )
+        rows, shared = np.unique(candidates, return_counts=True)
+        # Dice coefficient over trigram sets; skipped common trigrams count as shared
+        shared = shared + (len(grams) - len(selected))
+        similarity = 2 * shared / (len(_trigrams(query)) + self.gram_counts[rows])
+        keep = similarity >= MIN_FUZZY_SIMILARITY
+        return rows[keep], similarity[keep]
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """Return up to `limit` row positions, best match first."""
+        query = normalize_text(query)
+        if not query:
+            return []
+        # tier: 0 exact, 1 title prefix, 2 word prefix, 3 fuzzy
+        best = {}
+        rows, is_title_start = self._prefix_matches(query)
+        for row, title_start in zip(rows.tolist(), is_title_start.tolist()):
+            tier = (0 if self.titles[row] == query else 1) if title_start else 2
+            best[row] = min(best.get(row, (tier, 0.0)), (tier, 0.0))
+        if len(best) < limit:
+            rows, similarity = self._fuzzy_matches(query)
+            for row, score in zip(rows.tolist(), similarity.tolist()):
+                best.setdefault(row, (3, -score))
+        ranked = sorted(best, key=lambda row: (*best[row], self.lengths[row], row))
+        return ranked[:limit]
+
+
+def sorted_title_keys(titles):
+    """(normalized keys, titles) of the unique titles, sorted by key."""
+    unique = {title for title in titles if isinstance(title, str) and title}
+    pairs = sorted((normalize_text(title), title) for title in unique)
+    return [key for key, _ in pairs], [title for _, title in pairs]
+
+
+class TitleAutocomplete:
+    """Sorted unique titles for typeahead: a prefix is one binary search away.
+
+    The catalog build writes the sorted keys and titles (see
+    components/catalog.py); wrapping those memory-mapped columns, a lookup
+    decodes only the ~log2(n) keys it probes.
+    """
+
+    def __init__(self, keys, titles):
+        self.keys = keys
+        self.titles = titles
+
+    @classmethod
+    def build(cls, titles):
+        """Sort a catalog's titles in memory, for catalogs without a built copy."""
+        keys, titles = sorted_title_keys(titles)
+        # Object arrays: fixed-width unicode would pad every title to the longest one
+        return cls(np.array(keys, dtype=object), np.array(titles, dtype=object))
+
+    def __len__(self):
+        return len(self.titles)
+
+    def complete(self, prefix, limit=DEFAULT_LIMIT):
+        """Return up to `limit` titles whose normalized form starts with the prefix."""
+        prefix = normalize_text(prefix)
+        if not prefix:
+            return []
+        lo = bisect.bisect_left(self.keys, prefix)
+        # Every string with the prefix sorts before prefix + the highest code point
+        hi = bisect.bisect_left(self.keys, prefix + "\U0010ffff", lo)
+        return [self.titles[i] for i in range(lo, min(hi, lo + limit))]
+
+
+def main():
+    from components.file_handling import load_movies
+
+    query = " ".join(sys.argv[1:])
+    index = TitleSearchIndex(load_movies()["title"].tolist())
+    for row in index.search(query):
+        print(row, index.titles[row])
+
+
+if __name__ == "__main__":
+    main()
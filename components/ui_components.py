@@ -1,11 +1,22 @@
 
 import streamlit as st
+import contextlib
+import functools
+import hashlib
+import html
+import re
+import string
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from config import UI_CONFIG, INSTRUMENTATION_CONFIG
+from components.instrumentation import bind_trace
 
+LOADING_DESCRIPTION = "Loading..."
+PLACEHOLDER_POSTER = "https://via.placeholder.com/300x450?text=No+Poster"
 
-def custom_css():
-    """Apply modern, responsive CSS styling."""
-    st.markdown(
-        """
+APP_CSS = """
     <style>
     /* Global Styles */
     * {
@@ -473,9 +484,35 @@ def custom_css():
         border: 1px solid rgba(78, 205, 196, 0.3);
     }
     </style>
-    """,
-        unsafe_allow_html=True,
-    )
+    """
+
+# Card markup, compiled once; values are HTML-escaped before substitution
+CARD_TEMPLATE = string.Template(
+    """
+    <div class="movie-card fade-in">
+        <img src="$poster_url" alt="$title" onerror="this.src='$placeholder'">
+        <h3>$title</h3>
+        <p class="movie-rating">⭐ $rating/10</p>
+        <p>$description</p>
+    </div>
+    """
+)
+
+
+def _minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};,])\s*|(:)\s+", r"\1\2", css).strip()
+
+
+# Streamlit drops any element a rerun does not emit again, so the stylesheet is
+# sent on every rerun; minifying it is what keeps that cheap
+APP_STYLESHEET = _minify_css(APP_CSS)
+
+
+def custom_css():
+    """Apply modern, responsive CSS styling."""
+    st.markdown(APP_STYLESHEET, unsafe_allow_html=True)
 
 
 def navigation_bar():
@@ -491,7 +528,8 @@ def navigation_bar():
     )
     
     # Navigation buttons with unique keys
-    col1, col2, col3, col4, col5, col6 = st.columns(6)
+    is_admin = st.session_state.current_username in INSTRUMENTATION_CONFIG["admin_users"]
+    col1, col2, col3, col4, col5, col6, *admin_col = st.columns(7 if is_admin else 6)
     
     with col1:
         if st.button("Home", key="nav_home_main", help="Go to home page"):
@@ -542,34 +580,167 @@ def navigation_bar():
                 st.session_state.page = "signin"
                 st.rerun()
     
+    if is_admin:
+        with admin_col[0]:
+            if st.button("Admin", key="nav_admin_main", help="Latency and cache statistics"):
+                st.session_state.page = "admin"
+                st.rerun()
+    
     st.markdown("</div></div></div>", unsafe_allow_html=True)
 
 
+# Cards deferred by the enclosing card_batch() block, per script thread
+_card_batch = threading.local()
+
+
+@contextlib.contextmanager
+def card_batch(fetch_details=False):
+    """Defer create_movie_card calls in the block, then hydrate and render them together.
+
+    Each deferred card reserves its place with st.empty(). When the block
+    exits, the posters and trailers the cards are missing are fetched in one
+    concurrent batch and every card is filled in, instead of each card
+    blocking the script run on its own fetches. With fetch_details, cards still
+    showing the "Loading..." description also get their TMDB details, one
+    request per card, so it is off by default.
+    """
+    if getattr(_card_batch, "cards", None) is not None:
+        # Nested batch: the outer one renders these cards
+        yield
+        return
+    _card_batch.cards = []
+    try:
+        yield
+    except BaseException:
+        # e.g. st.rerun(): the cards will never be shown
+        _card_batch.cards = None
+        raise
+    cards, _card_batch.cards = _card_batch.cards, None
+    for placeholder, movie, show_actions, card_type in hydrate_cards(cards, fetch_details):
+        with placeholder.container():
+            create_movie_card(movie, show_actions, card_type)
+
+
+def hydrate_cards(cards, fetch_details=False):
+    """Fill in missing posters and trailers (and details, if asked) for (placeholder, movie, ...) cards concurrently."""
+    from components.api_calls import fetch_poster, fetch_movie_details, fetch_trailer
+    
+    posters, details, trailers = set(), set(), set()
+    for _, movie, show_actions, _ in cards:
+        movie_id = movie.get("id")
+        if not movie_id:
+            continue
+        if not movie.get("poster"):
+            posters.add(movie_id)
+        if fetch_details and movie.get("description", LOADING_DESCRIPTION) == LOADING_DESCRIPTION:
+            details.add(movie_id)
+        if show_actions and "trailer" not in movie:
+            trailers.add(movie_id)
+    
+    results = {}
+    if posters or details or trailers:
+        workers = min(UI_CONFIG["card_fetch_workers"], len(posters) + len(details) + len(trailers))
+        # Workers run inside this script run (the pool is joined below), so they get
+        # its context: the fetchers' st.cache_data and st.warning/st.error need it
+        with ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="card-fetch",
+            initializer=add_script_run_ctx,
+            initargs=(None, get_script_run_ctx()),
+        ) as pool:
+            futures = {}
+            for kind, fetch, ids in (
+                ("poster", fetch_poster, posters),
+                ("details", fetch_movie_details, details),
+                ("trailer", fetch_trailer, trailers),
+            ):
+                for movie_id in ids:
+                    futures[(kind, movie_id)] = pool.submit(bind_trace(fetch), movie_id)
+            for key, future in futures.items():
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    print(f"Error fetching {key[0]} for movie {key[1]}: {e}")
+    
+    hydrated = []
+    for placeholder, movie, show_actions, card_type in cards:
+        movie = dict(movie)
+        movie_id = movie.get("id")
+        if ("poster", movie_id) in results:
+            movie["poster"] = results[("poster", movie_id)]
+        details = results.get(("details", movie_id))
+        if details:
+            movie["rating"] = details.get("rating", movie.get("rating", 0.0))
+            movie["description"] = details.get("description") or "No description available"
+        if ("trailer", movie_id) in results:
+            movie["trailer"] = results[("trailer", movie_id)]
+        hydrated.append((placeholder, movie, show_actions, card_type))
+    return hydrated
+
+
+@functools.lru_cache(maxsize=4096)
+def _card_key(card_type, movie_id, title):
+    return hashlib.md5(f"{card_type}_{movie_id}_{title}".encode()).hexdigest()[:8]
+
+
+# Rendered markup per card slot, (card_type, movie_id) -> (fields, html); reruns redraw the same slots
+MAX_CACHED_CARDS = 1024
+_card_html = OrderedDict()
+_card_html_lock = threading.Lock()
+
+
+def render_card_html(movie_id, card_type, title, poster_url, rating, description):
+    """Card markup for one card slot, reused while the slot shows the same movie data."""
+    # Truncate description for better display
+    if len(description) > 150:
+        description = description[:150] + "..."
+    key = (card_type, movie_id)
+    fields = (title, poster_url, rating, description)
+    with _card_html_lock:
+        cached = _card_html.get(key)
+        if cached is not None and cached[0] == fields:
+            _card_html.move_to_end(key)
+            return cached[1]
+    card_html = CARD_TEMPLATE.substitute(
+        poster_url=html.escape(poster_url),
+        placeholder=PLACEHOLDER_POSTER,
+        title=html.escape(str(title)),
+        rating=f"{rating:.1f}",
+        description=html.escape(description),
+    )
+    with _card_html_lock:
+        _card_html[key] = (fields, card_html)
+        _card_html.move_to_end(key)
+        while len(_card_html) > MAX_CACHED_CARDS:
+            _card_html.popitem(last=False)
+    return card_html
+
+
+def clear_card_html():
+    """Forget every rendered card (used by the UI benchmark)."""
+    with _card_html_lock:
+        _card_html.clear()
+
+
 def create_movie_card(movie, show_actions=True, card_type="default"):
     """Create a responsive movie card with actions."""
+    cards = getattr(_card_batch, "cards", None)
+    if cards is not None:
+        # Inside card_batch(): keep the slot now, render once details are fetched
+        cards.append((st.empty(), movie, show_actions, card_type))
+        return
+    
     title = movie.get('title', 'Unknown Title')
-    poster_url = movie.get('poster', 'https://via.placeholder.com/300x450?text=No+Poster')
+    poster_url = movie.get('poster') or PLACEHOLDER_POSTER
     rating = movie.get('rating', 0.0)
-    description = movie.get('description', 'No description available')
+    description = movie.get('description')
+    if not isinstance(description, str):
+        description = 'No description available'
     movie_id = movie.get('id', 0)
     
-    # Generate stable unique key for this card instance
-    import hashlib
-    key_string = f"{card_type}_{movie_id}_{title}"
-    unique_key = hashlib.md5(key_string.encode()).hexdigest()[:8]
-    
-    # Truncate description for better display
-    if len(description) > 150:
-        description = description[:150] + "..."
-    
-    card_html = f"""
-    <div class="movie-card fade-in">
-        <img src="{poster_url}" alt="{title}" onerror="this.src='https://via.placeholder.com/300x450?text=No+Poster'">
-        <h3>{title}</h3>
-        <p class="movie-rating">⭐ {rating:.1f}/10</p>
-        <p>{description}</p>
-    </div>
-    """
+    # Stable unique key for this card instance
+    unique_key = _card_key(card_type, movie_id, title)
+    card_html = render_card_html(movie_id, card_type, title, poster_url, rating, description)
     
     st.markdown(card_html, unsafe_allow_html=True)
     
@@ -611,8 +782,11 @@ def create_movie_card(movie, show_actions=True, card_type="default"):
         
         with col3:
             try:
-                from components.api_calls import fetch_trailer
-                trailer_url = fetch_trailer(movie_id)
+                if "trailer" in movie:
+                    trailer_url = movie["trailer"]
+                else:
+                    from components.api_calls import fetch_trailer
+                    trailer_url = fetch_trailer(movie_id)
                 if trailer_url:
                     # Create a styled link button that opens in new tab
                     st.markdown(
@@ -637,6 +811,87 @@ def create_movie_card(movie, show_actions=True, card_type="default"):
                 st.button("🎥 Trailer", key=f"trailer_{unique_key}", help="Error loading trailer", disabled=True)
 
 
+# Grid pages being prefetched right now, so reruns don't start duplicate threads
+_prefetching = set()
+_prefetching_lock = threading.Lock()
+
+
+def paginated_grid(items, key, render_item, prefetch=None, page_size=None):
+    """Render one page of a list or DataFrame with Previous/Next navigation.
+
+    Only the visible page is rendered, via render_item(item, position), inside
+    card_batch() so the page's cards fetch their details together. The
+    cursor (offset of the first visible item) lives in st.session_state, and
+    prefetch(item), when given, warms the caches for the next page's items in
+    a background thread while the user looks at this one; it must not call
+    Streamlit (use api_calls.prefetch_poster/prefetch_trailer).
+    """
+    page_size = page_size or UI_CONFIG["grid_page_size"]
+    total = len(items)
+    cursor_key = f"grid_cursor_{key}"
+    cursor = st.session_state.get(cursor_key, 0)
+    if cursor >= total or cursor % page_size:
+        # The list shrank or changed under the cursor: start over
+        cursor = 0
+    st.session_state[cursor_key] = cursor
+    
+    with card_batch():
+        for offset, item in enumerate(_page_items(items, cursor, cursor + page_size)):
+            render_item(item, cursor + offset)
+    
+    next_cursor = cursor + page_size
+    if prefetch and next_cursor < total:
+        _prefetch_in_background(
+            (key, next_cursor, total), prefetch, _page_items(items, next_cursor, next_cursor + page_size)
+        )
+    
+    if total > page_size:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("◀ Previous", key=f"grid_prev_{key}", disabled=cursor == 0, use_container_width=True):
+                st.session_state[cursor_key] = max(0, cursor - page_size)
+                st.rerun()
+        with col2:
+            st.markdown(
+                f'<p style="text-align: center; color: rgba(255,255,255,0.8);">'
+                f'Showing {cursor + 1}–{min(next_cursor, total)} of {total}</p>',
+                unsafe_allow_html=True
+            )
+        with col3:
+            if st.button("Next ▶", key=f"grid_next_{key}", disabled=next_cursor >= total,
+                         use_container_width=True):
+                st.session_state[cursor_key] = next_cursor
+                st.rerun()
+
+
+def _page_items(items, start, stop):
+    """Slice a list, or a DataFrame into row namedtuples, without touching other rows."""
+    if hasattr(items, "iloc"):
+        return list(items.iloc[start:stop].itertuples())
+    return list(items[start:stop])
+
+
+def _prefetch_in_background(job_key, prefetch, items):
+    with _prefetching_lock:
+        if job_key in _prefetching:
+            return
+        _prefetching.add(job_key)
+    
+    def run():
+        try:
+            for item in items:
+                try:
+                    prefetch(item)
+                except Exception as e:
+                    print(f"Error prefetching grid item: {e}")
+        finally:
+            with _prefetching_lock:
+                _prefetching.discard(job_key)
+    
+    # No script context is attached: the thread may outlive this run
+    threading.Thread(target=run, name="grid-prefetch", daemon=True).start()
+
+
 def create_rating_section(movie):
     """Create a rating and review section for a movie."""
     movie_id = movie.get('id', 0)
@@ -676,9 +931,7 @@ def create_rating_section(movie):
         with col1:
             if st.button("Submit Rating", key=f"submit_rating_{unique_key}"):
                 if st.session_state.current_user:
-                    from components.file_handling import save_user_activity
-                    import os
-                    import csv
+                    from components.file_handling import save_user_activity, save_user_review
                     
                     save_user_activity(
                         st.session_state.current_user,
@@ -689,18 +942,13 @@ def create_rating_section(movie):
                     )
                     
                     # Save review to CSV
-                    file_exists = os.path.exists("user_reviews.csv")
-                    with open("user_reviews.csv", "a", newline="", encoding="utf-8") as f:
-                        writer = csv.writer(f)
-                        if not file_exists:
-                            writer.writerow(["user", "movie_id", "title", "rating", "review"])
-                        writer.writerow([
-                            st.session_state.current_user,
-                            movie_id,
-                            title,
-                            rating,
-                            review
-                        ])
+                    save_user_review(
+                        st.session_state.current_user,
+                        movie_id,
+                        title,
+                        rating,
+                        review
+                    )
                     
                     st.success(f"✅ Rated '{title}' with {rating} stars!")
                     st.session_state[f"show_rating_{movie_id}"] = False
@@ -1,23 +1,87 @@
 import pandas as pd
 import os
 import csv
+import threading
 from datetime import datetime
+from components.journal import (
+    append_journal_row,
+    read_journal_rows,
+    write_snapshot,
+    clear_journal,
+)
+
+USER_FIELDS = ["id", "username", "password", "email", "created_at"]
+
+# users.csv is the compacted snapshot; registrations, updates and deletes are
+# appended to users_log.csv and folded back into the snapshot by compact_users().
+USERS_LOG_FILE = "users_log.csv"
+USERS_LOG_FIELDS = ["op"] + USER_FIELDS
+USERS_LOG_COMPACT_THRESHOLD = 1000
+
+# Process-wide lookup indexes over users.csv + users_log.csv, shared by every
+# session. Built lazily on first lookup and kept current by the writers below;
+# lookups hand out copies so callers can never edit the shared records.
+_user_index = None
+_user_index_lock = threading.RLock()
 
 
 def load_users():
     """Load users from CSV file with improved error handling."""
+    return _load_users_and_log()[0]
+
+
+def _load_users_and_log():
+    """Return (users, number of journaled ops), reading users_log.csv once."""
+    ops = read_journal_rows(USERS_LOG_FILE)
+    if not os.path.exists("users.csv"):
+        # Create default users file if it doesn't exist
+        create_default_users()
+    users = []
     if os.path.exists("users.csv"):
         try:
-            df = pd.read_csv("users.csv")
+            # Read as text, like the journal, so both kinds of row come back typed the same
+            df = pd.read_csv("users.csv", dtype=object, keep_default_na=False)
+            df = df.reindex(columns=USER_FIELDS, fill_value="")
+            ids = pd.to_numeric(df["id"], errors="coerce").astype("Int64").astype(object)
+            df["id"] = ids.where(ids.notna(), None)
             # Convert to list of dictionaries for easier handling
-            return df.to_dict('records')
+            users = df.to_dict('records')
         except Exception as e:
             print(f"Error loading users: {e}")
-            return []
-    else:
-        # Create default users file if it doesn't exist
-        create_default_users()
-        return []
+            return [], len(ops)
+    return _replay_user_log(users, ops), len(ops)
+
+
+def _normalize_user(user):
+    """A user record with an int id (None if missing) and every other field as text."""
+    normalized = {
+        field: "" if user.get(field) is None or pd.isna(user.get(field)) else str(user.get(field))
+        for field in USER_FIELDS
+    }
+    normalized["id"] = normalize_user_id(user.get("id"))
+    return normalized
+
+
+def _replay_user_log(users, ops):
+    """Apply journaled put/delete operations on top of the snapshot users."""
+    if not ops:
+        return users
+    
+    merged = {}
+    for pos, user in enumerate(users):
+        user_id = normalize_user_id(user.get("id"))
+        merged[user_id if user_id is not None else ("row", pos)] = user
+    
+    for op in ops:
+        user_id = normalize_user_id(op.get("id"))
+        if user_id is None:
+            continue
+        if op.get("op") == "delete":
+            merged.pop(user_id, None)
+        else:
+            merged[user_id] = _normalize_user(op)
+    
+    return list(merged.values())
 
 
 def create_default_users():
@@ -29,31 +93,138 @@ def create_default_users():
     
     try:
         with open("users.csv", "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=["id", "username", "password", "email", "created_at"])
+            writer = csv.DictWriter(f, fieldnames=USER_FIELDS)
             writer.writeheader()
             writer.writerows(default_users)
     except Exception as e:
         print(f"Error creating default users: {e}")
 
 
+def normalize_user_id(user_id):
+    """Normalize a user id to int so "2", 2.0 and 2 map to the same user."""
+    try:
+        if user_id is None or pd.isna(user_id):
+            return None
+        return int(float(user_id))
+    except (TypeError, ValueError):
+        return None
+
+
+def _build_user_index(users, log_ops):
+    """Build username->user and id->user hash indexes from a list of users.
+    
+    Snapshot rows without an id can't be looked up by id; they are kept in
+    "unkeyed" so get_all_users() and compaction still see them.
+    """
+    by_username = {}
+    by_id = {}
+    unkeyed = []
+    for user in users:
+        username = user.get("username")
+        if isinstance(username, str) and username:
+            by_username[username] = user
+        user_id = normalize_user_id(user.get("id"))
+        if user_id is not None:
+            by_id[user_id] = user
+        else:
+            unkeyed.append(user)
+    return {
+        "by_username": by_username,
+        "by_id": by_id,
+        "unkeyed": unkeyed,
+        "log_ops": log_ops,
+    }
+
+
+def get_user_index():
+    """Return the shared user indexes, loading users.csv only on first use."""
+    global _user_index
+    index = _user_index
+    if index is None:
+        with _user_index_lock:
+            if _user_index is None:
+                _user_index = _build_user_index(*_load_users_and_log())
+            index = _user_index
+    return index
+
+
+def invalidate_user_index():
+    """Drop the shared user indexes so the next lookup reloads users.csv."""
+    global _user_index
+    with _user_index_lock:
+        _user_index = None
+
+
+def _copy_user(user):
+    return dict(user) if user is not None else None
+
+
+def get_all_users():
+    """Get all users from the shared index."""
+    with _user_index_lock:
+        index = get_user_index()
+        return [dict(user) for user in list(index["by_id"].values()) + index["unkeyed"]]
+
+
+def get_user_by_username(username):
+    """Get user data by username."""
+    return _copy_user(get_user_index()["by_username"].get(username))
+
+
+def get_user_by_id(user_id):
+    """Get user data by id."""
+    return _copy_user(get_user_index()["by_id"].get(normalize_user_id(user_id)))
+
+
+def next_user_id():
+    """Return the next free user id."""
+    by_id = get_user_index()["by_id"]
+    return max(by_id) + 1 if by_id else 1
+
+
+def _append_user_op(op, user):
+    """Journal one user operation; the caller updates the index afterwards."""
+    append_journal_row(USERS_LOG_FILE, USERS_LOG_FIELDS, {"op": op, **user})
+    get_user_index()["log_ops"] += 1
+
+
+def _maybe_compact_users():
+    """Compact once the log has grown past USERS_LOG_COMPACT_THRESHOLD."""
+    if get_user_index()["log_ops"] >= USERS_LOG_COMPACT_THRESHOLD:
+        compact_users()
+
+
+def compact_users():
+    """Fold users_log.csv into users.csv and start a fresh log."""
+    try:
+        with _user_index_lock:
+            index = get_user_index()
+            write_snapshot("users.csv", USER_FIELDS, list(index["by_id"].values()) + index["unkeyed"])
+            clear_journal(USERS_LOG_FILE)
+            index["log_ops"] = 0
+        return True
+    except Exception as e:
+        print(f"Error compacting users: {e}")
+        return False
+
+
 def save_user(user_data):
     """Save a new user to the CSV file."""
     try:
-        # Load existing users
-        users = load_users()
-        
-        # Check if username already exists
-        if any(user.get("username") == user_data.get("username") for user in users):
-            return False
-        
-        # Add new user
-        users.append(user_data)
-        
-        # Save back to CSV
-        with open("users.csv", "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=["id", "username", "password", "email", "created_at"])
-            writer.writeheader()
-            writer.writerows(users)
+        with _user_index_lock:
+            index = get_user_index()
+            username = user_data.get("username")
+            user_id = normalize_user_id(user_data.get("id"))
+            
+            # Check if username or id already exists
+            if username in index["by_username"] or user_id is None or user_id in index["by_id"]:
+                return False
+            
+            user = _normalize_user({**user_data, "id": user_id})
+            _append_user_op("put", user)
+            index["by_username"][username] = user
+            index["by_id"][user_id] = user
+            _maybe_compact_users()
         
         return True
     except Exception as e:
@@ -61,31 +232,31 @@ def save_user(user_data):
         return False
 
 
-def get_user_by_username(username):
-    """Get user data by username."""
-    users = load_users()
-    for user in users:
-        if user.get("username") == username:
-            return user
-    return None
-
-
 def update_user_profile(user_id, profile_data):
     """Update user profile information."""
     try:
-        users = load_users()
-        
-        # Find and update user
-        for user in users:
-            if user.get("id") == user_id:
-                user.update(profile_data)
-                break
-        
-        # Save back to CSV
-        with open("users.csv", "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=["id", "username", "password", "email", "created_at"])
-            writer.writeheader()
-            writer.writerows(users)
+        with _user_index_lock:
+            index = get_user_index()
+            user_id = normalize_user_id(user_id)
+            user = index["by_id"].get(user_id)
+            if user is None:
+                return False
+            
+            updated = dict(user)
+            updated.update({k: v for k, v in profile_data.items() if k in USER_FIELDS})
+            updated = _normalize_user({**updated, "id": user_id})
+            
+            # Renaming onto another user's username is not allowed
+            owner = index["by_username"].get(updated["username"])
+            if owner is not None and owner is not user:
+                return False
+            
+            _append_user_op("put", updated)
+            if index["by_username"].get(user.get("username")) is user:
+                del index["by_username"][user.get("username")]
+            index["by_username"][updated["username"]] = updated
+            index["by_id"][user_id] = updated
+            _maybe_compact_users()
         
         return True
     except Exception as e:
@@ -96,16 +267,18 @@ def update_user_profile(user_id, profile_data):
 def delete_user(user_id):
     """Delete a user from the system."""
     try:
-        users = load_users()
-        
-        # Remove user
-        users = [user for user in users if user.get("id") != user_id]
-        
-        # Save back to CSV
-        with open("users.csv", "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=["id", "username", "password", "email", "created_at"])
-            writer.writeheader()
-            writer.writerows(users)
+        with _user_index_lock:
+            index = get_user_index()
+            user_id = normalize_user_id(user_id)
+            user = index["by_id"].get(user_id)
+            if user is None:
+                return True
+            
+            _append_user_op("delete", {"id": user_id})
+            del index["by_id"][user_id]
+            if index["by_username"].get(user.get("username")) is user:
+                del index["by_username"][user.get("username")]
+            _maybe_compact_users()
         
         return True
     except Exception as e:
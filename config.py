@@ -23,6 +23,9 @@ CACHE_TTL = {
     "movie_details": 1800,   # 30 minutes
     "posters": 3600,         # 1 hour
     "trailers": 1800,        # 30 minutes
+    "recommendations": 900,  # 15 minutes
+    "search": 1800,          # 30 minutes
+    "search_empty": 60,      # 1 minute, so newly added titles show up soon
 }
 
 # UI Configuration
@@ -44,7 +47,9 @@ UI_CONFIG = {
         "desktop": 3,
         "tablet": 2,
         "mobile": 1
-    }
+    },
+    "grid_page_size": 6,
+    "card_fetch_workers": 8
 }
 
 # Recommendation Configuration
@@ -53,9 +58,30 @@ RECOMMENDATION_CONFIG = {
     "max_limit": 20,
     "content_weight": 0.6,
     "collaborative_weight": 0.4,
+    "hybrid_candidates": 100,
+    "personalized_seeds": 5,
+    "ann_nprobe": 8,
     "similarity_threshold": 0.1
 }
 
+# Instrumentation Configuration
+INSTRUMENTATION_CONFIG = {
+    "enabled": True,
+    "log_file": "instrumentation.log",  # JSON lines, one per span; empty to disable
+    "log_max_bytes": 10 * 1024 * 1024,  # rotated to <log_file>.1 past this size
+    "log_queue_size": 10000,            # spans waiting for the writer thread; extras are dropped
+    "reservoir_size": 2048,             # recent durations kept per span for percentiles
+    "admin_users": ["admin"]            # usernames that can open the admin page
+}
+
+# Prometheus metrics endpoint (http://<host>:<port>/metrics)
+METRICS_CONFIG = {
+    "enabled": os.getenv("METRICS_ENABLED", "1") != "0",
+    "host": os.getenv("METRICS_HOST", "127.0.0.1"),
+    "port": int(os.getenv("METRICS_PORT", "9464")),
+    "latency_buckets": [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]  # seconds
+}
+
 # Mood-Genre Mappings
 MOOD_GENRE_MAPPINGS = {
     "happy": [35, 10751, 16],      # Comedy, Family, Animation
@@ -185,6 +211,8 @@ def get_config() -> Dict[str, Any]:
         "cache": CACHE_TTL,
         "ui": UI_CONFIG,
         "recommendations": RECOMMENDATION_CONFIG,
+        "instrumentation": INSTRUMENTATION_CONFIG,
+        "metrics": METRICS_CONFIG,
         "mood_genres": MOOD_GENRE_MAPPINGS,
         "files": DATA_FILES,
         "default_users": DEFAULT_USERS,
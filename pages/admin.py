@@ -0,0 +1,55 @@
+import streamlit as st
+import pandas as pd
+from components.api_calls import prefetch_cache, search_cache
+from components.instrumentation import get_log_dropped, get_span_stats, reset_spans
+from components.result_cache import get_recommendation_cache_stats
+from components.ui_components import show_status_message
+from config import INSTRUMENTATION_CONFIG
+
+
+def render_admin_page(**kwargs):
+    """Renders span latency percentiles and cache statistics for admins."""
+    st.markdown(
+        """
+        <div style="text-align: center; padding: 2rem 0;">
+            <h1>📈 Performance</h1>
+            <p style="font-size: 1.2rem; color: rgba(255,255,255,0.8); margin-bottom: 2rem;">
+                Where page renders, recommenders and TMDB calls spend their time
+            </p>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    if st.session_state.current_username not in INSTRUMENTATION_CONFIG["admin_users"]:
+        show_status_message("⚠️ This page is only available to administrators.", "warning")
+        return
+
+    if not INSTRUMENTATION_CONFIG["enabled"]:
+        show_status_message("ℹ️ Instrumentation is disabled in config.py.", "info")
+
+    st.markdown("### ⏱️ Spans")
+    stats = get_span_stats()
+    if stats:
+        st.dataframe(pd.DataFrame(stats), use_container_width=True, hide_index=True)
+    else:
+        st.info("No spans recorded yet.")
+
+    st.markdown("### 🗃️ Caches")
+    caches = pd.DataFrame(
+        [
+            {"cache": "recommendations", **get_recommendation_cache_stats()},
+            {"cache": "tmdb search", **search_cache.stats()},
+            {"cache": "tmdb prefetch", **prefetch_cache.stats()},
+        ]
+    )
+    st.dataframe(caches, use_container_width=True, hide_index=True)
+
+    if INSTRUMENTATION_CONFIG["log_file"]:
+        st.caption(f"Every span is also appended to {INSTRUMENTATION_CONFIG['log_file']} as JSON lines.")
+        if get_log_dropped():
+            st.caption(f"{get_log_dropped():,} spans were dropped from the log while the writer was behind.")
+
+    if st.button("Reset span statistics", key="admin_reset_spans"):
+        reset_spans()
+        st.rerun()
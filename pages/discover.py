@@ -2,22 +2,31 @@ import streamlit as st
 from components.api_calls import (
     fetch_genres,
     fetch_movies_by_genre,
-    fetch_trailer,
     fetch_movie_details,
-    fetch_poster,
     fetch_popular_movies,
+    prefetch_poster,
+    prefetch_trailer,
     search_movies,
 )
 from components.recommendations import (
     recommend_content_based,
     recommend_collaborative,
     recommend_hybrid,
+    recommend_personalized,
+    search_titles,
+    search_overviews,
+    autocomplete_titles,
+    get_movie_overview,
+    get_movie_ids,
 )
 from components.file_handling import save_user_activity, save_watchlist_to_csv
-from components.ui_components import create_movie_card, show_status_message, create_loading_spinner
-import pandas as pd
-import os
-import csv
+from components.ui_components import (
+    create_movie_card,
+    show_status_message,
+    create_loading_spinner,
+    paginated_grid,
+    card_batch,
+)
 
 
 def render_discover_page(movies, similarity, svd_model, **kwargs):
@@ -81,13 +90,20 @@ def render_ai_recommendations(movies, similarity, svd_model):
         unsafe_allow_html=True
     )
     
-    # Movie selection
-    movie_list = movies["title"].dropna().unique()
+    # Movie selection: only the top matches for what was typed go to the browser
+    title_query = st.text_input(
+        "🎥 Type a movie title:",
+        placeholder="Start typing, e.g. The Godfather...",
+        key="ai_movie_query"
+    )
+    movie_list = autocomplete_titles(title_query, movies)
     selected_movie = st.selectbox(
-        "🎥 Select a movie for recommendations:",
+        "🎬 Select a movie for recommendations:",
         movie_list,
         help="Choose a movie you like to get similar recommendations"
     )
+    if title_query and not movie_list:
+        st.info(f"ℹ️ No movies in our database start with '{title_query}'.")
     
     # Recommendation buttons
     st.markdown("### 🚀 Get Recommendations")
@@ -100,17 +116,17 @@ def render_ai_recommendations(movies, similarity, svd_model):
             help="Find movies similar in content (genres, themes, etc.)",
             use_container_width=True
         ):
-            if selected_movie in movie_list:
+            if selected_movie:
                 with st.spinner("🎬 Finding content-based recommendations..."):
                     recommended_names, recommended_posters = recommend_content_based(
-                        selected_movie, movies, similarity
+                        selected_movie, movies, similarity, user_id=st.session_state.current_user
                     )
                     if recommended_names:
                         display_recommendations(recommended_names, recommended_posters, "Content-Based")
                     else:
                         show_status_message("❌ Could not generate content-based recommendations.", "error")
             else:
-                show_status_message(f"❌ Movie '{selected_movie}' not found in database.", "error")
+                show_status_message("❌ Please select a movie first.", "error")
         
         if st.button(
             "👥 Collaborative", 
@@ -134,14 +150,17 @@ def render_ai_recommendations(movies, similarity, svd_model):
             use_container_width=True
         ):
             user_id = st.session_state.current_user if st.session_state.current_user else 1
-            with st.spinner("🔄 Finding hybrid recommendations..."):
-                recommended_names, recommended_posters = recommend_hybrid(
-                    selected_movie, user_id, movies, similarity, svd_model
-                )
-                if recommended_names:
-                    display_recommendations(recommended_names, recommended_posters, "Hybrid")
-                else:
-                    show_status_message("❌ Could not generate hybrid recommendations.", "error")
+            if not selected_movie:
+                show_status_message("❌ Please select a movie first.", "error")
+            else:
+                with st.spinner("🔄 Finding hybrid recommendations..."):
+                    recommended_names, recommended_posters = recommend_hybrid(
+                        selected_movie, user_id, movies, similarity, svd_model
+                    )
+                    if recommended_names:
+                        display_recommendations(recommended_names, recommended_posters, "Hybrid")
+                    else:
+                        show_status_message("❌ Could not generate hybrid recommendations.", "error")
         
         if st.button(
             "⭐ Personalized", 
@@ -180,26 +199,33 @@ def render_search_browse(movies, similarity):
     
     if search_query:
         with st.spinner(f"🔍 Searching for '{search_query}'..."):
-            # Search in local database
-            filtered_movies = movies[
-                movies["title"].str.contains(search_query, case=False, na=False)
-            ]
+            # Search in local database: titles first, then plot keywords
+            filtered_movies = search_titles(search_query, movies)
+            plot_matches = search_overviews(search_query, movies)
+            plot_matches = plot_matches[~plot_matches.index.isin(filtered_movies.index)]
             
-            if not filtered_movies.empty:
-                st.success(f"✅ Found {len(filtered_movies)} movies matching '{search_query}'")
+            if not filtered_movies.empty or not plot_matches.empty:
+                if not filtered_movies.empty:
+                    st.success(f"✅ Found {len(filtered_movies)} movies matching '{search_query}'")
+                    
+                    # Display search results
+                    st.markdown("### 📋 Search Results")
+                    display_movie_grid(filtered_movies, "search")
                 
-                # Display search results
-                st.markdown("### 📋 Search Results")
-                display_movie_grid(filtered_movies.head(6), "search")
+                if not plot_matches.empty:
+                    st.markdown("### 📝 Plot & Genre Matches")
+                    display_movie_grid(plot_matches, "plot_search")
                 
                 # Show recommendations based on first result
-                if len(filtered_movies) > 0:
-                    first_title = filtered_movies.head(1)["title"].iloc[0]
-                    st.markdown("### 🎯 Similar Movies")
-                    with st.spinner("Finding similar movies..."):
-                        names, posters = recommend_content_based(first_title, movies, similarity)
-                        if names:
-                            display_recommendations(names, posters, "Similar to your search")
+                best_match = filtered_movies if not filtered_movies.empty else plot_matches
+                first_title = best_match.head(1)["title"].iloc[0]
+                st.markdown("### 🎯 Similar Movies")
+                with st.spinner("Finding similar movies..."):
+                    names, posters = recommend_content_based(
+                        first_title, movies, similarity, user_id=st.session_state.current_user
+                    )
+                    if names:
+                        display_recommendations(names, posters, "Similar to your search")
             else:
                 st.warning(f"⚠️ No movies found matching '{search_query}'")
                 
@@ -207,7 +233,7 @@ def render_search_browse(movies, similarity):
                 st.markdown("### 🌐 Searching online...")
                 with st.spinner("Searching online databases..."):
                     try:
-                        api_results = search_movies(search_query, 6)
+                        api_results = search_movies(search_query)
                         if api_results:
                             st.success(f"✅ Found {len(api_results)} movies online")
                             display_api_movies(api_results, "online_search")
@@ -335,59 +361,65 @@ def display_recommendations(names, posters, recommendation_type):
         show_status_message("⚠️ No recommendations found.", "warning")
         return
     
-    # Create movie objects for display
+    # Create movie objects for display; ids let card_batch() fetch their trailers
+    movie_ids = get_movie_ids(names)
     movies_to_display = []
     for name, poster in zip(names, posters):
         movies_to_display.append({
+            "id": movie_ids.get(name, 0),
             "title": name,
             "poster": poster,
-            "rating": 0.0,  # Will be fetched by card component
-            "description": "Loading..."  # Will be fetched by card component
+            "rating": 0.0,
+            "description": "Loading..."
         })
     
     # Display in responsive grid
     st.markdown('<div class="movie-grid">', unsafe_allow_html=True)
     
-    for idx, movie in enumerate(movies_to_display):
-        with st.container():
-            create_movie_card(movie, show_actions=True, card_type=f"rec_{recommendation_type.lower()}_{idx}")
-            st.markdown("---")
+    with card_batch():
+        for idx, movie in enumerate(movies_to_display):
+            with st.container():
+                create_movie_card(movie, show_actions=True, card_type=f"rec_{recommendation_type.lower()}_{idx}")
+                st.markdown("---")
     
     st.markdown('</div>', unsafe_allow_html=True)
 
 
 def display_movie_grid(movies_df, context):
-    """Display movies from DataFrame in responsive grid."""
-    
-    st.markdown('<div class="movie-grid">', unsafe_allow_html=True)
+    """Display movies from DataFrame in a paginated responsive grid."""
     
-    for idx, movie in enumerate(movies_df.itertuples()):
+    def render(movie, idx):
         with st.container():
             # Create movie object
             movie_obj = {
                 "id": movie.id,
                 "title": movie.title,
-                "poster": fetch_poster(movie.id),
+                "poster": None,  # fetched with the rest of the page by card_batch()
                 "rating": getattr(movie, 'vote_average', 0.0),
-                "description": getattr(movie, 'overview', 'No description available')
+                # Catalog-backed frames leave overviews mapped: decode just this row
+                "description": movie.overview if hasattr(movie, 'overview') else get_movie_overview(movie.id)
             }
             
             create_movie_card(movie_obj, show_actions=True, card_type=f"grid_{context}_{idx}")
             st.markdown("---")
     
+    def prefetch(movie):
+        prefetch_poster(movie.id)
+        prefetch_trailer(movie.id)
+    
+    st.markdown('<div class="movie-grid">', unsafe_allow_html=True)
+    paginated_grid(movies_df, f"movies_{context}", render, prefetch=prefetch)
     st.markdown('</div>', unsafe_allow_html=True)
 
 
 def display_api_movies(movies_list, context):
-    """Display movies from API results in responsive grid."""
+    """Display movies from API results in a paginated responsive grid."""
     
     if not movies_list:
         show_status_message("⚠️ No movies to display.", "warning")
         return
     
-    st.markdown('<div class="movie-grid">', unsafe_allow_html=True)
-    
-    for idx, movie in enumerate(movies_list):
+    def render(movie, idx):
         with st.container():
             # Create movie object
             movie_obj = {
@@ -401,6 +433,12 @@ def display_api_movies(movies_list, context):
             create_movie_card(movie_obj, show_actions=True, card_type=f"api_{context}_{idx}")
             st.markdown("---")
     
+    def prefetch(movie):
+        if movie.get("id"):
+            prefetch_trailer(movie["id"])
+    
+    st.markdown('<div class="movie-grid">', unsafe_allow_html=True)
+    paginated_grid(movies_list, f"api_{context}", render, prefetch=prefetch)
     st.markdown('</div>', unsafe_allow_html=True)
 
 
@@ -408,50 +446,13 @@ def get_personalized_recommendations(movies, similarity):
     """Get personalized recommendations based on user ratings."""
     
     try:
-        top_rated = []
-        csv_path = "user_reviews.csv"
-        
-        if os.path.exists(csv_path):
-            reviews_df = pd.read_csv(csv_path, header=0)
-            reviews_df["user"] = reviews_df["user"].astype(str)
-            uid = str(st.session_state.current_user)
-            
-            user_reviews = reviews_df[reviews_df["user"] == uid]
-            if not user_reviews.empty:
-                top_rated = (
-                    user_reviews.sort_values("rating", ascending=False)
-                    .head(5)["title"]
-                    .tolist()
-                )
-        
-        if not top_rated:
-            show_status_message(
-                "⚠️ No ratings found. Showing popular movies instead.",
-                "warning"
-            )
-            popular = fetch_popular_movies(5)
-            if popular:
-                names = [m["title"] for m in popular]
-                posters = [m["poster"] for m in popular]
-                display_recommendations(names, posters, "Popular Movies")
-            return
-        
-        # Get recommendations based on top rated movies
-        personalized_names = []
-        personalized_posters = []
+        names, posters = recommend_personalized(st.session_state.current_user, movies, similarity)
         
-        for title in top_rated:
-            names, posters = recommend_content_based(title, movies, similarity)
-            for n, p in zip(names, posters):
-                if n not in personalized_names:
-                    personalized_names.append(n)
-                    personalized_posters.append(p)
-        
-        if personalized_names:
-            display_recommendations(personalized_names, personalized_posters, "Personalized")
+        if names:
+            display_recommendations(names, posters, "Personalized")
         else:
             show_status_message(
-                "⚠️ No personalized recommendations found. Showing popular movies instead.",
+                "⚠️ No ratings found. Showing popular movies instead.",
                 "warning"
             )
             popular = fetch_popular_movies(5)
@@ -1,6 +1,6 @@
 import streamlit as st
-from components.api_calls import fetch_poster, fetch_movie_details
-from components.ui_components import create_movie_card, show_status_message
+from components.api_calls import fetch_movie_details, prefetch_poster
+from components.ui_components import create_movie_card, show_status_message, paginated_grid
 import pandas as pd
 import os
 from datetime import datetime
@@ -167,15 +167,13 @@ def render_history_page(**kwargs):
             unsafe_allow_html=True
         )
         
-        st.markdown('<div class="movie-grid">', unsafe_allow_html=True)
-        
-        for idx, row in filtered_activity.iterrows():
+        def render(row, idx):
             with st.container():
-                action = row["action"]
-                title = row["title"]
-                movie_id = row["movie_id"]
-                rating = row["rating"] if pd.notna(row["rating"]) else None
-                timestamp = row["timestamp"]
+                action = row.action
+                title = row.title
+                movie_id = row.movie_id
+                rating = row.rating if pd.notna(row.rating) else None
+                timestamp = row.timestamp
                 
                 # Format timestamp
                 try:
@@ -188,7 +186,7 @@ def render_history_page(**kwargs):
                 movie = {
                     "id": movie_id,
                     "title": title,
-                    "poster": fetch_poster(movie_id),
+                    "poster": None,  # Fetched with the rest of the page by card_batch()
                     "rating": rating if rating else 0.0,
                     "description": f"Action: {action.title()} • {formatted_time}"
                 }
@@ -223,6 +221,14 @@ def render_history_page(**kwargs):
                 
                 st.markdown("---")
         
+        st.markdown('<div class="movie-grid">', unsafe_allow_html=True)
+        # Only the visible page of the history is rendered (and fetches posters)
+        paginated_grid(
+            filtered_activity[["action", "title", "movie_id", "rating", "timestamp"]],
+            "history",
+            render,
+            prefetch=lambda row: prefetch_poster(row.movie_id),
+        )
         st.markdown('</div>', unsafe_allow_html=True)
         
         # Export history
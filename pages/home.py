@@ -1,6 +1,12 @@
 import streamlit as st
 from components.api_calls import fetch_popular_movies
-from components.ui_components import create_movie_card, create_rating_section, show_status_message, create_loading_spinner
+from components.ui_components import (
+    create_movie_card,
+    create_rating_section,
+    show_status_message,
+    create_loading_spinner,
+    card_batch,
+)
 
 
 def render_home_page(**kwargs):
@@ -64,10 +70,11 @@ def render_home_page(**kwargs):
         # Display popular movies in responsive grid
         st.markdown('<div class="movie-grid">', unsafe_allow_html=True)
         
-        for idx, movie in enumerate(popular_movies):
-            with st.container():
-                create_movie_card(movie, show_actions=True, card_type=f"home_popular_{idx}")
-                st.markdown("---")
+        with card_batch():
+            for idx, movie in enumerate(popular_movies):
+                with st.container():
+                    create_movie_card(movie, show_actions=True, card_type=f"home_popular_{idx}")
+                    st.markdown("---")
         
         st.markdown('</div>', unsafe_allow_html=True)
         
@@ -91,12 +98,13 @@ def render_home_page(**kwargs):
                 
                 st.markdown('<div class="movie-grid">', unsafe_allow_html=True)
                 
-                for movie in more_movies[6:]:
-                    with st.container():
-                        create_movie_card(movie, show_actions=True)
-                        if st.session_state.current_user:
-                            create_rating_section(movie)
-                        st.markdown("---")
+                with card_batch():
+                    for movie in more_movies[6:]:
+                        with st.container():
+                            create_movie_card(movie, show_actions=True)
+                            if st.session_state.current_user:
+                                create_rating_section(movie)
+                            st.markdown("---")
                 
                 st.markdown('</div>', unsafe_allow_html=True)
     else:
@@ -2,7 +2,7 @@ import streamlit as st
 from components.api_calls import fetch_genres, fetch_trailer
 from components.recommendations import recommend_by_mood
 from components.file_handling import save_user_activity, save_watchlist_to_csv
-from components.ui_components import create_movie_card, show_status_message
+from components.ui_components import create_movie_card, show_status_message, card_batch
 import os
 import csv
 
@@ -155,10 +155,11 @@ def render_mood_page(**kwargs):
         # Display movies in grid
         st.markdown('<div class="movie-grid">', unsafe_allow_html=True)
         
-        for idx, movie in enumerate(st.session_state.mood_recommendations):
-            with st.container():
-                create_movie_card(movie, show_actions=True, card_type=f"mood_{idx}")
-                st.markdown("---")
+        with card_batch():
+            for idx, movie in enumerate(st.session_state.mood_recommendations):
+                with st.container():
+                    create_movie_card(movie, show_actions=True, card_type=f"mood_{idx}")
+                    st.markdown("---")
         
         st.markdown('</div>', unsafe_allow_html=True)
         
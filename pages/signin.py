@@ -1,5 +1,5 @@
 import streamlit as st
-from components.user_management import load_users, save_user
+from components.user_management import get_user_by_username, next_user_id, save_user
 from components.ui_components import show_status_message
 
 
@@ -71,26 +71,21 @@ def render_signin_tab():
         if not username or not password:
             show_status_message("⚠️ Please enter both username and password.", "warning")
         else:
-            users = load_users()
-            user_found = False
+            user = get_user_by_username(username)
             
-            for user in users:
-                if user.get("username") == username and user.get("password") == password:
-                    st.session_state.current_user = user.get("id")
-                    st.session_state.current_username = username
-                    st.session_state.authenticated = True
-                    
-                    # Save authentication state to file
-                    from components.auth_manager import save_auth_state
-                    save_auth_state(username, user.get("id"))
-                    
-                    st.session_state.page = "home"
-                    show_status_message(f"✅ Welcome back, {username}!", "success")
-                    st.rerun()
-                    user_found = True
-                    break
-            
-            if not user_found:
+            if user and user.get("password") == password:
+                st.session_state.current_user = user.get("id")
+                st.session_state.current_username = username
+                st.session_state.authenticated = True
+                
+                # Save authentication state to file
+                from components.auth_manager import save_auth_state
+                save_auth_state(username, user.get("id"))
+                
+                st.session_state.page = "home"
+                show_status_message(f"✅ Welcome back, {username}!", "success")
+                st.rerun()
+            else:
                 show_status_message("❌ Invalid username or password. Please try again.", "error")
     
     st.markdown("</div>", unsafe_allow_html=True)
@@ -152,14 +147,11 @@ def render_signup_tab():
             show_status_message("⚠️ Password must be at least 4 characters long.", "warning")
         else:
             # Check if username already exists
-            users = load_users()
-            username_exists = any(user.get("username") == new_username for user in users)
-            
-            if username_exists:
+            if get_user_by_username(new_username) is not None:
                 show_status_message("❌ Username already exists. Please choose a different one.", "error")
             else:
                 # Create new user
-                new_user_id = len(users) + 1
+                new_user_id = next_user_id()
                 new_user = {
                     "id": new_user_id,
                     "username": new_username,
@@ -1,13 +1,13 @@
 import streamlit as st
-from components.api_calls import fetch_poster, fetch_trailer, fetch_movie_details
-from components.file_handling import save_user_activity, remove_from_watchlist
-from components.ui_components import create_movie_card, show_status_message
+from components.api_calls import fetch_movie_details, prefetch_poster, prefetch_trailer
+from components.file_handling import save_user_activity, remove_from_watchlist, clear_watchlist
+from components.ui_components import create_movie_card, show_status_message, paginated_grid
 import pandas as pd
 import os
 import csv
 
 
-def render_watchlist_page(movies, **kwargs):
+def render_watchlist_page(**kwargs):
     """Renders the user's watchlist page."""
     st.markdown(
         """
@@ -95,9 +95,7 @@ def render_watchlist_page(movies, **kwargs):
         unsafe_allow_html=True
     )
     
-    st.markdown('<div class="movie-grid">', unsafe_allow_html=True)
-    
-    for idx, item in enumerate(watchlist):
+    def render(item, idx):
         with st.container():
             # Get movie details
             movie_title = item["title"]
@@ -107,9 +105,9 @@ def render_watchlist_page(movies, **kwargs):
             movie = {
                 "id": movie_id,
                 "title": movie_title,
-                "poster": fetch_poster(movie_id),
-                "rating": 0.0,  # Will be fetched by the card component
-                "description": "Loading..."  # Will be fetched by the card component
+                "poster": None,  # Fetched with the rest of the page by card_batch()
+                "rating": 0.0,
+                "description": "Loading..."
             }
             
             # Create the movie card
@@ -131,6 +129,12 @@ def render_watchlist_page(movies, **kwargs):
             
             st.markdown("---")
     
+    def prefetch(item):
+        prefetch_poster(item["movie_id"])
+        prefetch_trailer(item["movie_id"])
+    
+    st.markdown('<div class="movie-grid">', unsafe_allow_html=True)
+    paginated_grid(watchlist, "watchlist", render, prefetch=prefetch)
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Watchlist management options
@@ -162,10 +166,7 @@ def render_watchlist_page(movies, **kwargs):
     with col3:
         if st.button("🗑️ Clear All", help="Remove all movies from your watchlist"):
             if st.button("⚠️ Confirm Clear All", key="confirm_clear"):
-                # Clear watchlist file
-                filename = f"watchlist_{st.session_state.current_user}.csv"
-                if os.path.exists(filename):
-                    os.remove(filename)
+                clear_watchlist(st.session_state.current_user)
                 show_status_message("✅ Watchlist cleared successfully", "success")
                 st.rerun()
     